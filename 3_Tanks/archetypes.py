@@ -0,0 +1,134 @@
+# REJESTR TYPÓW CZOŁGÓW (ARCHETYPÓW) - parametry czołgów i fale ataku z pliku danych (tanks.json)
+# Każdy typ z pliku staje się podklasą Tank, a jego parametry (speed, shoot_delay, max_health, color)
+# są polami klasy, nie obiektu - nowy czołg ustawia tylko pozycję i zdrowie.
+# Losowanie typu czołgu z wagami kosztuje O(1) niezależnie od liczby typów: tablica aliasów (metoda
+# Vose'a) jest liczona raz, a jedno losowanie to jedna liczba z generatora i jedno porównanie.
+
+# Importowanie niezbędnych bibliotek
+import json  # Format pliku z typami czołgów i falami
+
+FIELDS = ("speed", "shoot_delay", "health", "color")  # Wymagane parametry typu czołgu
+
+
+# KLASA TABLICY ALIASÓW - losowanie z wagami w czasie O(1)
+class AliasTable:
+    def __init__(self, items, weights):
+        """Buduje tablicę aliasów (metoda Vose'a)
+        Args:
+            items (list): Losowane elementy
+            weights (list): Nieujemne wagi elementów (nie muszą się sumować do 1)
+        """
+        if not items or len(items) != len(weights):
+            raise ValueError("Tablica losowania potrzebuje elementów i tylu samo wag")
+        total = sum(weights)
+        if total <= 0 or min(weights) < 0:
+            raise ValueError(f"Niepoprawne wagi losowania: {weights}")
+
+        n = len(items)
+        scaled = [weight * n / total for weight in weights]
+        self.items = list(items)
+        self.prob = [1.0] * n      # Szansa, że w kolumnie i wypada element i (a nie jego alias)
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less], self.alias[less] = scaled[less], more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+    def sample(self, rng):
+        """Losuje element - jedna liczba z generatora wybiera kolumnę i rozstrzyga element albo alias
+        Args:
+            rng (random.Random): Generator liczb losowych
+        """
+        u = rng.random() * len(self.items)
+        i = int(u)
+        return self.items[i] if u - i < self.prob[i] else self.items[self.alias[i]]
+
+
+# KLASA FALI - grupa czołgów pojawiająca się w określonym kroku gry
+class Wave:
+    def __init__(self, tick, count, table, every=None):
+        """Konstruktor fali
+        Args:
+            tick (int): Krok gry (od początku gry), w którym pojawia się fala
+            count (int): Liczba czołgów fali
+            table (AliasTable): Losowanie typów czołgów fali
+            every (int): Co ile kroków fala się powtarza (None - tylko raz)
+        """
+        self.tick = tick
+        self.count = count
+        self.table = table
+        self.every = every
+
+    def due(self, tick):
+        """Czy fala pojawia się w kroku tick (liczonym od początku gry)"""
+        if self.every is None:
+            return tick == self.tick
+        return tick >= self.tick and (tick - self.tick) % self.every == 0
+
+
+# KLASA REJESTRU TYPÓW CZOŁGÓW
+class ArchetypeRegistry:
+    def __init__(self, base, archetypes, waves=None):
+        """Tworzy klasy czołgów z opisu typów
+        Args:
+            base (type): Klasa bazowa (Tank) - typy są jej podklasami
+            archetypes (dict): Nazwa -> parametry typu (speed, shoot_delay, health, color, opcjonalnie weight)
+            waves (dict): Nazwa zestawu fal -> lista fal (tick, count, opcjonalnie every i weights)
+        """
+        self.classes = {}  # Nazwa -> klasa czołgu (w kolejności z pliku)
+        weights = []
+        for name, spec in archetypes.items():
+            missing = [field for field in FIELDS if field not in spec]
+            if missing:
+                raise ValueError(f"Typ czołgu {name}: brak parametrów {', '.join(missing)}")
+            self.classes[name] = type(name, (base,), {
+                "__slots__": (),
+                "__module__": base.__module__,
+                "speed": spec["speed"],
+                "shoot_delay": spec["shoot_delay"],
+                "max_health": spec["health"],
+                "color": tuple(spec["color"]),
+            })
+            weights.append(spec.get("weight", 1))
+        self.table = AliasTable(list(self.classes.values()), weights)  # Domyślne losowanie typów
+
+        self.waves = {}  # Nazwa zestawu -> lista fal
+        for name, waves_spec in (waves or {}).items():
+            self.waves[name] = [Wave(spec["tick"], spec["count"], self.spawn_table(spec.get("weights")),
+                                     spec.get("every")) for spec in waves_spec]
+
+    @classmethod
+    def load(cls, path, base):
+        """Wczytuje rejestr z pliku JSON z kluczami "archetypes" i (opcjonalnie) "waves"
+        Args:
+            path (str): Ścieżka pliku
+            base (type): Klasa bazowa czołgów
+        Returns:
+            ArchetypeRegistry: Rejestr typów
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(base, data["archetypes"], data.get("waves"))
+
+    def __getitem__(self, name):
+        return self.classes[name]
+
+    def __iter__(self):
+        return iter(self.classes.values())
+
+    def spawn_table(self, weights=None):
+        """Zwraca tablicę losowania typów
+        Args:
+            weights (dict): Nazwa typu -> waga (None - domyślne wagi z pliku; brakujące typy mają wagę 0)
+        Returns:
+            AliasTable: Tablica losowania klas czołgów
+        """
+        if weights is None:
+            return self.table
+        unknown = set(weights) - set(self.classes)
+        if unknown:
+            raise ValueError(f"Nieznane typy czołgów: {', '.join(sorted(unknown))}")
+        return AliasTable(list(self.classes.values()), [weights.get(name, 0) for name in self.classes])
@@ -0,0 +1,151 @@
+# PULA POCISKÓW - wszystkie pociski w tablicach numpy (struktura tablic zamiast listy obiektów)
+# Pocisk to jeden indeks w tablicach x, y, vx, vy, owner, alive. Żywe pociski zajmują początek tablic
+# (indeksy 0..count-1) w kolejności wystrzelenia, a wolne miejsca za nimi są używane przez kolejne strzały.
+# Ruch, usuwanie pocisków spoza ekranu i zagęszczanie tablic to po jednej operacji wektorowej na klatkę.
+
+# Importowanie niezbędnych bibliotek
+import numpy as np
+import pygame  # Prostokąty pocisków do dokładnego sprawdzania kolizji
+
+BULLET_SPEED = 5    # Prędkość pocisku (pikseli na klatkę)
+BULLET_RADIUS = 3   # Pocisk to kwadrat 6x6 wyśrodkowany na pozycji
+
+# Właściciel pocisku
+PLAYER = 0
+TANK = 1
+
+# Kierunek lotu -> wektor jednostkowy
+DIRECTIONS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+
+# Tablice puli i ich typy (w tej kolejności także w bajtach z dump)
+ARRAYS = {"x": np.float64, "y": np.float64, "vx": np.float64, "vy": np.float64, "owner": np.int8, "alive": np.bool_}
+RECORD_SIZE = sum(np.dtype(dtype).itemsize for dtype in ARRAYS.values())  # Bajty jednego pocisku w dump
+
+
+# KLASA PULI POCISKÓW
+class BulletPool:
+    def __init__(self, capacity=1024, speed=BULLET_SPEED):
+        """Konstruktor puli - tablice alokowane raz (i powiększane dwukrotnie, gdy zabraknie miejsca)
+        Args:
+            capacity (int): Początkowa liczba miejsc na pociski
+            speed (float): Prędkość pocisków w pikselach na klatkę
+        """
+        self.speed = speed
+        self.count = 0  # Liczba zajętych miejsc (po zagęszczeniu - liczba żywych pocisków)
+        self._rect = pygame.Rect(0, 0, 2 * BULLET_RADIUS, 2 * BULLET_RADIUS)  # Wspólny prostokąt dla get_rect
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Tworzy tablice o podanej pojemności, przepisując zajęte miejsca"""
+        old = getattr(self, "x", None)
+        for name, dtype in ARRAYS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self._mask = np.empty(capacity, dtype=np.bool_)  # Bufor na wyniki porównań w update
+        self.capacity = capacity
+
+    def __len__(self):
+        """Liczba żywych pocisków"""
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def fire(self, x, y, direction, owner):
+        """Dodaje pocisk w pierwszym wolnym miejscu
+        Args:
+            x, y (float): Pozycja startowa (środek pocisku)
+            direction (str): Kierunek lotu ('UP', 'DOWN', 'LEFT', 'RIGHT')
+            owner (int): PLAYER albo TANK
+        Returns:
+            int: Indeks pocisku
+        """
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        dx, dy = DIRECTIONS[direction]
+        self.x[i], self.y[i] = x, y
+        self.vx[i], self.vy[i] = dx * self.speed, dy * self.speed
+        self.owner[i] = owner
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def update(self, width, height):
+        """Przesuwa wszystkie pociski, usuwa te poza ekranem i zagęszcza tablice
+        Args:
+            width, height (int): Rozmiar ekranu - pocisk poza [0, width] x [0, height] znika
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        x += self.vx[:n]
+        y += self.vy[:n]
+        # Porównania do jednego bufora zamiast czterech nowych tablic na klatkę
+        alive, mask = self.alive[:n], self._mask[:n]
+        for coords, limit in ((x, width), (y, height)):
+            alive &= np.greater_equal(coords, 0, out=mask)
+            alive &= np.less_equal(coords, limit, out=mask)
+        self.compact()
+
+    def kill(self, index):
+        """Oznacza pocisk jako zużyty (miejsce zwalnia compact)"""
+        self.alive[index] = False
+
+    def compact(self):
+        """Przesuwa żywe pociski na początek tablic, zachowując ich kolejność"""
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        k = len(keep)
+        for array in (self.x, self.y, self.vx, self.vy, self.owner):
+            array[:k] = array[keep]
+        self.alive[:k] = True
+        self.alive[k:n] = False
+        self.count = k
+
+    def clear(self):
+        """Usuwa wszystkie pociski (tablice zostają do ponownego użycia)"""
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def dump(self):
+        """Zwraca zajęte miejsca puli jako bajty - kolejne tablice z ARRAYS przycięte do count"""
+        n = self.count
+        return b"".join(getattr(self, name)[:n].tobytes() for name in ARRAYS)  # count * RECORD_SIZE bajtów
+
+    def load(self, data, count):
+        """Odtwarza pulę z bajtów zapisanych przez dump
+        Args:
+            data (bytes): Bajty z dump (mogą być dłuższe - reszta jest pomijana)
+            count (int): Liczba zajętych miejsc w zapisie
+        Returns:
+            int: Liczba odczytanych bajtów
+        """
+        if count > self.capacity:
+            self._allocate(max(count, self.capacity * 2))
+        self.alive[count:self.count] = False  # Za zajętymi miejscami nie ma żywych pocisków
+        offset = 0
+        for name, dtype in ARRAYS.items():
+            getattr(self, name)[:count] = np.frombuffer(data, dtype, count, offset)
+            offset += count * np.dtype(dtype).itemsize
+        self.count = count
+        return offset
+
+    def indices(self, owner):
+        """Zwraca indeksy żywych pocisków danego właściciela w kolejności wystrzelenia"""
+        n = self.count
+        return np.flatnonzero(self.alive[:n] & (self.owner[:n] == owner))
+
+    def get_rect(self, index):
+        """Zwraca prostokąt pocisku 6x6 wyśrodkowany na jego pozycji (do wykrywania kolizji)
+        To jeden wspólny prostokąt puli aktualizowany w miejscu - jest ważny do następnego wywołania get_rect
+        """
+        self._rect.update(float(self.x[index]) - BULLET_RADIUS, float(self.y[index]) - BULLET_RADIUS,
+                          2 * BULLET_RADIUS, 2 * BULLET_RADIUS)
+        return self._rect
+
+    def positions(self):
+        """Zwraca pozycje żywych pocisków jako listy (x, y) - do rysowania"""
+        n = self.count
+        alive = self.alive[:n]
+        return zip(self.x[:n][alive].tolist(), self.y[:n][alive].tolist())
@@ -11,6 +11,9 @@ import random  # Do generowania losowych wartości
 # STAŁE GRY - wartości, które nie zmieniają się podczas gry
 WIDTH, HEIGHT = 640, 480  # Szerokość i wysokość okna gry w pikselach
 TILE_SIZE = 20            # Rozmiar czołgów i gracza w pikselach
+FPS = 60                  # Kroki symulacji na sekundę (jeden krok = jedna klatka gry)
+TICK = 1 / FPS            # Czas jednego kroku w sekundach
+MAX_STEPS = 5             # Najwięcej kroków nadrabianych w jednej klatce okna
 
 # Zmienne globalne dla ruchu czerwonego prostokąta (demonstracja)
 speed_x = 2  # Prędkość pozioma
@@ -266,9 +269,115 @@ def handle_player_tank_collisions(player, tanks):
             return player.take_damage()  # Zadaj obrażenia za zderzenie
     return False
 
+# KLASA STEROWANIA - wejście gracza w jednym kroku symulacji
+class Inputs:
+    def __init__(self, left=False, right=False, shots=0, restart=False):
+        """Konstruktor sterowania
+        Args:
+            left, right (bool): Czy wciśnięty jest klawisz A / D
+            shots (int): Liczba naciśnięć spacji od poprzedniego kroku
+            restart (bool): Czy naciśnięto R (działa tylko po końcu gry)
+        """
+        self.left = left
+        self.right = right
+        self.shots = shots
+        self.restart = restart
+
+    def __getitem__(self, key):
+        """Działa jak wynik pygame.key.get_pressed() - Player.move nie musi znać tej klasy"""
+        if key == pygame.K_a:
+            return self.left
+        if key == pygame.K_d:
+            return self.right
+        return False
+
+
+# KLASA ŚWIATA GRY - cała logika gry bez okna, rysowania i zdarzeń pygame
+# Jeden krok (step) to jedna klatka gry przy FPS krokach na sekundę, niezależnie od tego, jak szybko
+# działa komputer - okno wywołuje step tyle razy, ile kroków minęło.
+class World:
+    def __init__(self, seed=None):
+        """Konstruktor świata - tworzy gracza i pierwszy czołg
+        Args:
+            seed (int): Ziarno generatora liczb losowych (None - losowe)
+        """
+        self.rng = random.Random(seed)
+        self.bullets = []       # Pociski wystrzeliwane przez gracza
+        self.tanks = []         # Czołgi wrogów
+        self.tank_bullets = []  # Pociski wystrzeliwane przez czołgi
+        self.reset()
+
+    def reset(self):
+        """Zaczyna grę od nowa: nowy gracz z pełnym zdrowiem, zerowy wynik, pierwszy czołg"""
+        self.game_over = False
+        self.destroyed_tanks = 0
+        self.player = Player(WIDTH // 2, HEIGHT - 50)
+        self.bullets.clear()
+        self.tank_bullets.clear()
+        self.tanks.clear()
+        self.tanks.append(self.new_tank())
+
+    def new_tank(self):
+        """Tworzy czołg wroga na górze ekranu w losowej pozycji poziomej"""
+        return Tank(self.rng.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
+
+    def step(self, inputs):
+        """Wykonuje jeden krok gry
+        Args:
+            inputs (Inputs): Sterowanie gracza w tym kroku
+        Returns:
+            list: Zdarzenia kroku - pary (rodzaj, zdrowie gracza), rodzaj "hit" (trafienie pociskiem)
+                albo "crash" (zderzenie z czołgiem)
+        """
+        events = []
+        if inputs.restart and self.game_over:
+            self.reset()
+        if self.game_over:
+            return events
+
+        # Strzały gracza (pocisk na środku gracza, lecący w górę) i ruch
+        player = self.player
+        for _ in range(inputs.shots):
+            self.bullets.append(Bullet(player.x + TILE_SIZE // 2, player.y, 'UP'))
+        player.move(inputs)
+
+        # Aktualizuj pociski
+        for bullet in self.bullets[:]:
+            bullet.move()
+            if bullet.is_off_screen():
+                self.bullets.remove(bullet)
+
+        # Aktualizuj tanki
+        for tank in self.tanks[:]:
+            tank.move()
+            tank.update_shooting(self.tank_bullets)
+            if tank.is_off_screen():
+                self.tanks.remove(tank)
+
+        # Aktualizuj pociski tanków
+        for bullet in self.tank_bullets[:]:
+            bullet.move()
+            if bullet.is_off_screen():
+                self.tank_bullets.remove(bullet)
+
+        # Kolizje
+        self.destroyed_tanks += handle_bullet_tank_collisions(self.bullets, self.tanks)
+        if handle_tank_bullet_player_collisions(self.tank_bullets, player):
+            events.append(("hit", player.health))
+        if handle_player_tank_collisions(player, self.tanks):
+            events.append(("crash", player.health))
+        if player.health <= 0:
+            self.game_over = True
+
+        # Dodaj nowy tank jeśli wszystkie zostały zniszczone
+        if len(self.tanks) == 0:
+            self.tanks.append(self.new_tank())
+        return events
+
+
 # GŁÓWNA FUNKCJA GRY
 def main():
-    """Główna funkcja gry - inicjalizuje Pygame i uruchamia pętlę gry"""
+    """Główna funkcja gry - inicjalizuje Pygame i uruchamia pętlę gry (logika gry w World.step)"""
     
     # === INICJALIZACJA PYGAME ===
     pygame.init()  # Inicjalizuj wszystkie moduły Pygame
@@ -281,26 +390,13 @@ def main():
     clock = pygame.time.Clock()
     
     # === INICJALIZACJA OBIEKTÓW GRY ===
+    # Świat gry: gracz na dole ekranu, na środku, i pierwszy czołg wroga w losowej pozycji na górze
+    world = World()
+    inputs = Inputs()   # Sterowanie zebrane do następnego kroku
+    accumulator = 0.0   # Czas, który minął, a nie został jeszcze zasymulowany
     
-    # Stwórz gracza na dole ekranu, na środku
-    player = Player(WIDTH // 2, HEIGHT - 50)
-    
-    # Listy do przechowywania wszystkich obiektów w grze
-    bullets = []       # Pociski wystrzeliwane przez gracza
-    tanks = []         # Czołgi wrogów
-    tank_bullets = []  # Pociski wystrzeliwane przez czołgi
-    
-    # Dodaj pierwszy czołg wroga na górze ekranu w losowej pozycji poziomej
-    tank = Tank(random.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
-    tanks.append(tank)
-    
-    # === STAN GRY ===
-    game_over = False          # Czy gra się skończyła?
     font = pygame.font.Font(None, 74)        # Duża czcionka do napisów "GAME OVER"
     score_font = pygame.font.Font(None, 36)  # Średnia czcionka do wyniku
-    
-    # System punktacji
-    destroyed_tanks = 0  # Liczba zniszczonych czołgów
 
     # === GŁÓWNA PĘTLA GRY ===
     # Ta pętla działa w nieskończoność, aż do zamknięcia gry
@@ -314,70 +410,27 @@ def main():
                 
             elif event.type == pygame.KEYDOWN:  # Użytkownik nacisnął klawisz
                 # Strzał (spacja) - tylko gdy gra nie jest skończona
-                if event.key == pygame.K_SPACE and not game_over:
-                    # Stwórz pocisk na środku gracza, lecący w górę
-                    bullet = Bullet(player.x + TILE_SIZE // 2, player.y, 'UP')
-                    bullets.append(bullet)  # Dodaj pocisk do listy
+                if event.key == pygame.K_SPACE and not world.game_over:
+                    inputs.shots += 1
                     
                 # Restart gry (klawisz R) - tylko gdy gra się skończyła
-                elif event.key == pygame.K_r and game_over:
-                    # Zresetuj wszystkie zmienne gry do stanu początkowego
-                    game_over = False
-                    destroyed_tanks = 0  # Wyzeruj wynik
-                    player = Player(WIDTH // 2, HEIGHT - 50)  # Nowy gracz z pełnym zdrowiem
-                    
-                    # Wyczyść wszystkie listy obiektów
-                    bullets.clear()
-                    tank_bullets.clear()
-                    tanks.clear()
-                    
-                    # Stwórz pierwszego czołga
-                    tank = Tank(random.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
-                    tanks.append(tank)
-
-        # Obsługa klawiszy dla gracza (tylko gdy gra nie jest skończona)
-        if not game_over:
-            keys = pygame.key.get_pressed()
-            player.move(keys)
-            
-            # Aktualizuj pociski
-            for bullet in bullets[:]:
-                bullet.move()
-                if bullet.is_off_screen():
-                    bullets.remove(bullet)
-            
-            # Aktualizuj tanki
-            for tank in tanks[:]:
-                tank.move()
-                tank.update_shooting(tank_bullets)
-                if tank.is_off_screen():
-                    tanks.remove(tank)
-            
-            # Aktualizuj pociski tanków
-            for bullet in tank_bullets[:]:
-                bullet.move()
-                if bullet.is_off_screen():
-                    tank_bullets.remove(bullet)
-            
-            # Sprawdź kolizje pocisków gracza z tankami
-            destroyed_tanks += handle_bullet_tank_collisions(bullets, tanks)
-            
-            # Sprawdź kolizje pocisków tanków z graczem
-            if handle_tank_bullet_player_collisions(tank_bullets, player):
-                print("Gracz został trafiony! Pozostało życie:", player.health)
-                if player.health <= 0:
-                    game_over = True
-            
-            # Sprawdź kolizje gracza z tankami
-            if handle_player_tank_collisions(player, tanks):
-                print("Gracz zderzył się z tankiem! Pozostało życie:", player.health)
-                if player.health <= 0:
-                    game_over = True
-            
-            # Dodaj nowy tank jeśli wszystkie zostały zniszczone
-            if len(tanks) == 0:
-                new_tank = Tank(random.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
-                tanks.append(new_tank)
+                elif event.key == pygame.K_r and world.game_over:
+                    inputs.restart = True
+
+        keys = pygame.key.get_pressed()
+        inputs.left, inputs.right = keys[pygame.K_a], keys[pygame.K_d]
+
+        # === KROKI SYMULACJI ===
+        # Stały krok: tyle kroków, ile minęło czasu (po długim zacięciu najwyżej MAX_STEPS - gra zwalnia)
+        accumulator = min(accumulator + clock.tick(FPS) / 1000, MAX_STEPS * TICK)
+        while accumulator >= TICK:
+            for kind, health in world.step(inputs):
+                if kind == "hit":
+                    print("Gracz został trafiony! Pozostało życie:", health)
+                else:
+                    print("Gracz zderzył się z tankiem! Pozostało życie:", health)
+            inputs.shots, inputs.restart = 0, False  # Strzały i restart tylko w jednym kroku
+            accumulator -= TICK
 
         # Przesuń prostokąt
         # rect.x += speed_x
@@ -390,28 +443,28 @@ def main():
         # pygame.draw.rect(screen, color, rect)
         
         # Narysuj gracza
-        player.draw(screen)
+        world.player.draw(screen)
         
         # Narysuj tanki
-        for tank in tanks:
+        for tank in world.tanks:
             tank.draw(screen)
         
         # Narysuj pociski
-        for bullet in bullets:
+        for bullet in world.bullets:
             bullet.draw(screen)
             
         # Narysuj pociski tanków
-        for bullet in tank_bullets:
+        for bullet in world.tank_bullets:
             bullet.draw(screen)
         
         # Wyświetl wynik
-        score_text = score_font.render(f"Tanks Destroyed: {destroyed_tanks}", True, (255, 255, 255))
+        score_text = score_font.render(f"Tanks Destroyed: {world.destroyed_tanks}", True, (255, 255, 255))
         screen.blit(score_text, (10, 10))
         
         # Wyświetl ekran game over jeśli gra się skończyła
-        if game_over:
+        if world.game_over:
             game_over_text = font.render("GAME OVER", True, (255, 0, 0))
-            final_score_text = score_font.render(f"Final Score: {destroyed_tanks} tanks", True, (255, 255, 0))
+            final_score_text = score_font.render(f"Final Score: {world.destroyed_tanks} tanks", True, (255, 255, 0))
             restart_text = score_font.render("Press R to restart", True, (255, 255, 255))
             screen.blit(game_over_text, (WIDTH//2 - 150, HEIGHT//2 - 50))
             screen.blit(final_score_text, (WIDTH//2 - 120, HEIGHT//2 - 10))
@@ -420,10 +473,6 @@ def main():
         # === AKTUALIZACJA EKRANU ===
         # Wyświetl wszystko co zostało narysowane na ekranie
         pygame.display.flip()  # Odśwież cały ekran
-        
-        # === KONTROLA FPS ===
-        # Ograniczenie do 60 klatek na sekundę (gra działa płynnie i stabilnie)
-        clock.tick(60)
 
 
 # === URUCHOMIENIE GRY ===
@@ -7,10 +7,34 @@
 import pygame  # Główna biblioteka do tworzenia gier
 import sys     # Do zarządzania systemem (wyjście z gry)
 import random  # Do generowania losowych wartości
+import time    # Do pomiaru czasu faz symulacji (benchmark)
+import argparse  # Do obsługi argumentów wiersza poleceń (tryb bench)
+import gc      # Do liczenia odśmieceń pamięci w benchmarku
+import os      # Do ścieżki pliku z typami czołgów
+import struct  # Nagłówek zapisu stanu gry (snapshot)
+from array import array  # Tablice liczb zapisu stanu gry - pola czołgów i stan generatora losowego
+
+from spatial import SpatialHash  # Siatka przestrzenna - kolizje sprawdzane tylko dla obiektów w pobliżu
+from bullet_pool import BULLET_RADIUS, PLAYER, TANK, RECORD_SIZE, BulletPool  # Wszystkie pociski w tablicach numpy
+from render import Renderer  # Rysowanie grupami sprite'ów z gotowych obrazków
+from archetypes import ArchetypeRegistry  # Typy czołgów i fale z pliku tanks.json
+from scheduler import ShotScheduler  # Kopiec kroków strzałów - w kroku budzone są tylko strzelające czołgi
 
 # STAŁE GRY - wartości, które nie zmieniają się podczas gry
 WIDTH, HEIGHT = 640, 480  # Szerokość i wysokość okna gry w pikselach
 TILE_SIZE = 20            # Rozmiar czołgów i gracza w pikselach
+FPS = 60                  # Kroki symulacji na sekundę (jeden krok = jedna klatka gry)
+TICK = 1 / FPS            # Czas jednego kroku w sekundach
+MAX_STEPS = 5             # Najwięcej kroków nadrabianych w jednej klatce okna
+PHASES = ("player", "tanks", "bullets", "collisions", "spawn")  # Fazy kroku mierzone przez World
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')  # Kierunki gracza (w zapisie stanu gry - indeks kierunku)
+# Nagłówek zapisu stanu gry: krok, początek gry, zniszczone czołgi, koniec gry, licznik kolejności harmonogramu,
+# gracz (x, y, zdrowie, kierunek), generator losowy (wersja, czy jest gauss_next, gauss_next),
+# liczba czołgów i liczba miejsc w puli pocisków
+SNAPSHOT_HEADER = struct.Struct("<qqq?qddqBB?dII")
+RNG_STATE_SIZE = 625  # Liczby stanu generatora random.Random (Mersenne Twister i pozycja w stanie)
+TANK_FIELDS = ("B", "d", "d", "i", "q")  # Tablice pól czołgów w zapisie (kody modułu array): klasa, x, y, zdrowie, strzał
+TANK_RECORD_SIZE = sum(array(typecode).itemsize for typecode in TANK_FIELDS)  # Bajty jednego czołgu w zapisie
 
 # Zmienne globalne dla ruchu czerwonego prostokąta (demonstracja)
 speed_x = 2  # Prędkość pozioma
@@ -19,6 +43,10 @@ speed_y = 1  # Prędkość pionowa
 
 # KLASA GRACZA - reprezentuje kontrolowany przez użytkownika czołg
 class Player:
+    # Stała lista pól zamiast słownika __dict__ w każdym obiekcie (mniej pamięci, szybszy dostęp)
+    __slots__ = ("x", "y", "direction", "speed", "health", "max_health", "rect")
+    color = (0, 0, 255)  # Kolor gracza (niebieski)
+
     def __init__(self, x, y):
         """Konstruktor klasy Player - inicjalizuje gracza na pozycji (x, y)"""
         self.x = x                # Pozycja pozioma gracza
@@ -27,6 +55,7 @@ class Player:
         self.speed = 3            # Prędkość ruchu gracza (pikseli na klatkę)
         self.health = 3           # Punkty życia gracza
         self.max_health = 3       # Maksymalne punkty życia
+        self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)  # Prostokąt gracza (ten sam przez całą grę)
 
     def move(self, keys):
         """Porusza gracza na podstawie wciśniętych klawiszy"""
@@ -42,7 +71,7 @@ class Player:
     def draw(self, screen):
         """Rysuje gracza na ekranie wraz z paskiem zdrowia"""
         # Rysuj niebieskiego gracza (prostokąt)
-        pygame.draw.rect(screen, (0, 0, 255), (self.x, self.y, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(screen, self.color, (self.x, self.y, TILE_SIZE, TILE_SIZE))
         
         # Rysuj pasek zdrowia nad graczem
         health_bar_width = TILE_SIZE   # Szerokość paska zdrowia
@@ -63,8 +92,11 @@ class Player:
         pygame.draw.rect(screen, health_color, (self.x, self.y - 8, health_bar_width * health_ratio, health_bar_height))
     
     def get_rect(self):
-        """Zwraca prostokąt reprezentujący granice gracza (do wykrywania kolizji)"""
-        return pygame.Rect(self.x, self.y, TILE_SIZE, TILE_SIZE)
+        """Zwraca prostokąt reprezentujący granice gracza (do wykrywania kolizji)
+        Prostokąt jest aktualizowany w miejscu - to zawsze ten sam obiekt, bez nowej alokacji
+        """
+        self.rect.update(self.x, self.y, TILE_SIZE, TILE_SIZE)
+        return self.rect
     
     def take_damage(self):
         """Zadaje 1 punkt obrażeń graczowi
@@ -78,36 +110,37 @@ class Player:
 
 # KLASA CZOŁGU WROGA - reprezentuje wrogich czołgów sterowanych przez komputer
 class Tank:
+    __slots__ = ("x", "y", "health", "rect", "life")
+
+    # Parametry typu czołgu - pola klasy, wspólne dla wszystkich czołgów tego typu (typy w tanks.json)
+    direction = 'DOWN'        # Kierunek ruchu (zawsze w dół)
+    speed = 1                 # Prędkość ruchu (wolniejszy niż gracz)
+    shoot_delay = 120         # Opóźnienie między strzałami (2 sekundy przy 60 FPS)
+    max_health = 3            # Maksymalne punkty życia
+    color = (24, 56, 19)      # Kolor czołgu (ciemny zielony)
+
     def __init__(self, x, y):
         """Konstruktor klasy Tank - tworzy wrogi czołg na pozycji (x, y)"""
+        self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)  # Prostokąt czołgu (ten sam przez całe życie obiektu)
+        self.life = 0  # Numer życia obiektu - rośnie przy powrocie do puli (stare wpisy ShotScheduler są nieważne)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Ustawia czołg jak nowy na pozycji (x, y) - także przy ponownym użyciu czołgu z puli (TankPool)"""
         self.x = x                     # Pozycja pozioma czołgu
         self.y = y                     # Pozycja pionowa czołgu (zwykle zaczyna powyżej ekranu)
-        self.direction = 'DOWN'        # Kierunek ruchu (zawsze w dół)
-        self.speed = 1                 # Prędkość ruchu (wolniejszy niż gracz)
-        self.shoot_timer = 0           # Licznik czasu do następnego strzału
-        self.shoot_delay = 120         # Opóźnienie między strzałami (2 sekundy przy 60 FPS)
-        self.health = 3                # Punkty życia czołgu
-        self.max_health = 3            # Maksymalne punkty życia
-        self.color = (24, 56, 19)       # Kolor czołgu (ciemny zielony)
+        self.health = self.max_health  # Punkty życia czołgu
 
     def move(self):
         """Porusza czołg w dół ekranu"""
         if self.direction == 'DOWN':
             self.y += self.speed  # Przesuń w dół o wartość prędkości
     
-    def update_shooting(self, tank_bullets):
-        """Zarządza strzelaniem czołgu
-        Args:
-            tank_bullets (list): Lista pocisków czołgów do której dodamy nowy pocisk
+    def fire(self, bullets):
+        """Strzela - nowy pocisk na środku dolnej krawędzi czołgu, lecący w dół
+        (czołg nie liczy klatek do strzału - fire wywołuje harmonogram ShotScheduler co shoot_delay kroków)
         """
-        self.shoot_timer += 1  # Zwiększ licznik czasu
-        
-        # Jeśli minął odpowiedni czas, wystrzel pocisk
-        if self.shoot_timer >= self.shoot_delay:
-            # Stwórz nowy pocisk na środku czołgu, lecący w dół
-            bullet = Bullet(self.x + TILE_SIZE // 2, self.y + TILE_SIZE, 'DOWN')
-            tank_bullets.append(bullet)  # Dodaj pocisk do listy
-            self.shoot_timer = 0          # Zresetuj licznik czasu
+        bullets.fire(self.x + TILE_SIZE // 2, self.y + TILE_SIZE, 'DOWN', TANK)
 
     def draw(self, screen):
         """Rysuje czołg na ekranie wraz z paskiem zdrowia"""
@@ -132,8 +165,11 @@ class Tank:
         pygame.draw.rect(screen, health_color, (self.x, self.y - 8, health_bar_width * health_ratio, health_bar_height))
     
     def get_rect(self):
-        """Zwraca prostokąt reprezentujący granice czołgu (do wykrywania kolizji)"""
-        return pygame.Rect(self.x, self.y, TILE_SIZE, TILE_SIZE)
+        """Zwraca prostokąt reprezentujący granice czołgu (do wykrywania kolizji)
+        Prostokąt jest aktualizowany w miejscu - to zawsze ten sam obiekt, bez nowej alokacji
+        """
+        self.rect.update(self.x, self.y, TILE_SIZE, TILE_SIZE)
+        return self.rect
     
     def is_off_screen(self):
         """Sprawdza czy czołg wyjechał poza dolną krawędź ekranu
@@ -151,39 +187,20 @@ class Tank:
         return self.health <= 0
 
 # klasy czołógów z pracy domowej, Tiger 1, Tiger 2 i Panther
-
-class TigerI(Tank):
-    def __init__(self, x, y):
-        super().__init__(x, y)
-        self.speed = 1
-        self.shoot_timer = 0
-        self.shoot_delay = 100
-        self.health = 3
-        self.max_health = 3
-        self.color = (169, 169, 169)
-
-class TigerII(Tank):
-    def __init__(self, x, y):
-        super().__init__(x, y)
-        self.speed = 0.8
-        self.shoot_timer = 0
-        self.shoot_delay = 200
-        self.health = 2
-        self.max_health = 2
-        self.color = (139, 69, 19)
-
-class Panther(Tank):
-    def __init__(self, x, y):
-        super().__init__(x, y)
-        self.speed = 1.5
-        self.shoot_timer = 0
-        self.shoot_delay = 50
-        self.health = 5
-        self.max_health = 5
-        self.color = (189, 0, 0) # Czerwony, bo najszybszy
-
-# KLASA POCISKU - reprezentuje pociski wystrzeliwane przez gracza i czołgi
+# Typy czołgów są opisane w tanks.json (prędkość, opóźnienie strzałów, zdrowie, kolor, waga losowania)
+# i tworzone przez rejestr jako podklasy Tank - nowy typ to tylko nowy wpis w pliku
+ARCHETYPES = ArchetypeRegistry.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "tanks.json"), Tank)
+TigerI = ARCHETYPES["TigerI"]
+TigerII = ARCHETYPES["TigerII"]
+Panther = ARCHETYPES["Panther"]
+TANK_TYPES = (Tank, *ARCHETYPES)  # Klasy czołgów - w zapisie stanu gry czołg ma indeks swojej klasy
+TANK_TYPE_INDEX = {tank_type: i for i, tank_type in enumerate(TANK_TYPES)}
+
+# KLASA POCISKU - pojedynczy pocisk jako obiekt
+# Gra trzyma wszystkie pociski w BulletPool (bullet_pool.py) - ta klasa opisuje to samo zachowanie dla jednego pocisku
 class Bullet:    
+    __slots__ = ("x", "y", "direction", "speed", "rect")
+
     def __init__(self, x, y, direction):
         """Konstruktor klasy Bullet
         Args:
@@ -195,6 +212,7 @@ class Bullet:
         self.y = y                    # Pozycja pionowa pocisku
         self.direction = direction    # Kierunek lotu pocisku
         self.speed = 5                # Prędkość pocisku (szybszy niż czołgi)
+        self.rect = pygame.Rect(x - 3, y - 3, 6, 6)  # Prostokąt pocisku (ten sam przez całe życie obiektu)
     
     def move(self):
         """Porusza pocisk w jego kierunku"""
@@ -220,9 +238,10 @@ class Bullet:
     
     def get_rect(self):
         """Zwraca prostokąt reprezentujący pocisk (do wykrywania kolizji)
-        Pocisk ma rozmiar 6x6 pikseli wyśrodkowany na jego pozycji
+        Pocisk ma rozmiar 6x6 pikseli wyśrodkowany na jego pozycji (prostokąt aktualizowany w miejscu)
         """
-        return pygame.Rect(self.x - 3, self.y - 3, 6, 6)
+        self.rect.update(self.x - 3, self.y - 3, 6, 6)
+        return self.rect
 
 # FUNKCJE WYKRYWANIA KOLIZJI
 
@@ -235,80 +254,459 @@ def check_collision(rect1, rect2):
     """
     return rect1.colliderect(rect2)
 
-def handle_bullet_tank_collisions(bullets, tanks):
+def handle_bullet_tank_collisions(bullets, tanks, tank_grid=None, pool=None):
     """Obsługuje kolizje między pociskami gracza a czołgami wrogów
     
     Ta funkcja sprawdza czy którykolwiek pocisk gracza trafił w którykolwiek czołg.
     Jeśli tak, usuwa pocisk i zadaje obrażenia czołgowi.
     Jeśli czołg zostaje zniszczony, usuwa go i zwiększa wynik.
+    Pociski daleko od czołgów są odrzucane jedną operacją na tablicach puli (SpatialHash.touching),
+    a pozostałe sprawdzają tylko czołgi z pobliskich komórek siatki przestrzennej;
+    przy kilku trafieniach wygrywa czołg stojący wcześniej na liście (jak w pętli po wszystkich czołgach).
     
     Args:
-        bullets (list): Lista pocisków gracza
+        bullets (BulletPool): Pula pocisków (liczą się pociski gracza)
         tanks (list): Lista czołgów wrogów
+        tank_grid (SpatialHash): Siatka czołgów zbudowana w tej klatce (None - zbuduj nową)
+        pool (TankPool): Pula, do której wracają zniszczone czołgi (None - bez puli)
         
     Returns:
         int: Liczba zniszczonych czołgów w tej klatce
     """
-    destroyed_count = 0  # Licznik zniszczonych czołgów
+    if tank_grid is None:
+        tank_grid = SpatialHash.build(tanks)
     
-    # Iteruj przez kopie list, żeby móc bezpiecznie usuwać elementy
-    for bullet in bullets[:]:
-        for tank in tanks[:]:
-            # Sprawdź kolizję między tym pociskiem a tym czołgiem
-            if check_collision(bullet.get_rect(), tank.get_rect()):
-                bullets.remove(bullet)  # Usuń pocisk (został zużyty)
-                
-                # Zadaj obrażenia czołgowi i sprawdź czy został zniszczony
-                if tank.take_damage():
-                    tanks.remove(tank)     # Usuń zniszczony czołg
-                    destroyed_count += 1   # Zwiększ licznik
-                    
-                break  # Jeden pocisk może trafić tylko jeden czołg
-                
-    return destroyed_count
-
-def handle_tank_bullet_player_collisions(tank_bullets, player):
+    # Pociski gracza w kolejności wystrzelenia - tylko te, które mogą dotykać jakiegoś czołgu
+    indices = bullets.indices(PLAYER)
+    indices = indices[tank_grid.touching(bullets.x[indices], bullets.y[indices], BULLET_RADIUS)]
+    
+    destroyed = set()  # Zniszczone czołgi
+    for i in indices.tolist():
+        tank = tank_grid.first_hit(bullets.get_rect(i))
+        if tank is None:
+            continue
+        bullets.kill(i)  # Pocisk został zużyty (jeden pocisk może trafić tylko jeden czołg)
+        
+        # Zadaj obrażenia czołgowi i sprawdź czy został zniszczony
+        if tank.take_damage():
+            tank_grid.remove(tank)  # Zniszczonego czołgu nie trafi już żaden pocisk
+            destroyed.add(tank)
+    
+    # Zwolnij miejsca zużytych pocisków i usuń zniszczone czołgi jednym przejściem
+    bullets.compact()
+    if destroyed:
+        tanks[:] = [tank for tank in tanks if tank not in destroyed]
+        if pool is not None:
+            pool.release_all(destroyed)
+    return len(destroyed)
+
+def handle_tank_bullet_player_collisions(bullets, player):
     """Sprawdza kolizje między pociskami czołgów a graczem
     
+    Pociski czołgów, które nie mogą dotykać gracza, są odrzucane jednym porównaniem na tablicach puli;
+    pozostałe są sprawdzane dokładnie w kolejności wystrzelenia.
+    
     Args:
-        tank_bullets (list): Lista pocisków wystrzeliwanych przez czołgi
+        bullets (BulletPool): Pula pocisków (liczą się pociski czołgów)
         player (Player): Obiekt gracza
         
     Returns:
         bool: True jeśli gracz został zabity tym trafieniem
     """
-    for bullet in tank_bullets[:]:
-        if check_collision(bullet.get_rect(), player.get_rect()):
-            tank_bullets.remove(bullet)  # Usuń pocisk który trafił
+    rect = player.get_rect()
+    indices = bullets.indices(TANK)
+    xs, ys = bullets.x[indices], bullets.y[indices]
+    near = ((xs + BULLET_RADIUS >= rect.left - 1) & (xs - BULLET_RADIUS <= rect.right + 1) &
+            (ys + BULLET_RADIUS >= rect.top - 1) & (ys - BULLET_RADIUS <= rect.bottom + 1))
+    for i in indices[near].tolist():
+        if check_collision(bullets.get_rect(i), rect):
+            bullets.kill(i)      # Usuń pocisk który trafił
+            bullets.compact()
             return player.take_damage()   # Zadaj obrażenia i zwróć czy gracz umarł
     return False
 
-def handle_player_tank_collisions(player, tanks):
+def handle_player_tank_collisions(player, tanks, tank_grid=None):
     """Sprawdza bezpośrednią kolizję między graczem a czołgami
     
     Args:
         player (Player): Obiekt gracza
         tanks (list): Lista czołgów wrogów
+        tank_grid (SpatialHash): Siatka czołgów (None - zbuduj nową)
         
     Returns:
         bool: True jeśli gracz został zabity tym zderzeniem
     """
-    for tank in tanks[:]:
-        if check_collision(player.get_rect(), tank.get_rect()):
-            return player.take_damage()  # Zadaj obrażenia za zderzenie
+    if tank_grid is None:
+        tank_grid = SpatialHash.build(tanks)
+    if tank_grid.first_hit(player.get_rect()) is not None:
+        return player.take_damage()  # Zadaj obrażenia za zderzenie
     return False
 
 # Losowanie czołgów
 
-def create_random_tank(x, y):
-    """Tworzy losowy czołg w podanej pozycji"""
-    tank_type = random.choice([TigerI, TigerII, Panther])
+def create_random_tank(x, y, rng=random, pool=None, table=None):
+    """Tworzy losowy czołg w podanej pozycji
+    Args:
+        x, y (int): Pozycja czołgu
+        rng (random.Random): Generator liczb losowych (domyślnie moduł random)
+        pool (TankPool): Pula wolnych czołgów (None - zawsze nowy obiekt)
+        table (AliasTable): Losowanie typu z wagami (None - domyślne wagi z tanks.json)
+    """
+    tank_type = (table or ARCHETYPES.table).sample(rng)
+    if pool is not None:
+        return pool.acquire(tank_type, x, y)
     return tank_type(x, y)
 
 
+# KLASA PULI CZOŁGÓW - lista wolnych obiektów każdej klasy czołgu
+# Zniszczony albo wyjeżdżający za ekran czołg wraca do puli, a nowy czołg tej samej klasy jest tworzony
+# przez reset starego obiektu (razem z jego prostokątem) - w trakcie gry prawie nic nie jest alokowane.
+class TankPool:
+    def __init__(self):
+        """Konstruktor pustej puli"""
+        self.free = {}  # Klasa czołgu -> lista wolnych czołgów tej klasy
+
+    def acquire(self, tank_type, x, y):
+        """Zwraca czołg klasy tank_type na pozycji (x, y) - z puli albo nowy, gdy pula jest pusta"""
+        free = self.free.get(tank_type)
+        if free:
+            tank = free.pop()
+            tank.reset(x, y)
+            return tank
+        return tank_type(x, y)
+
+    def release(self, tank):
+        """Oddaje czołg do puli (nie może już być na liście czołgów w grze)"""
+        tank.life += 1  # Wpisy czołgu w harmonogramie strzałów przestają być ważne
+        free = self.free.get(type(tank))
+        if free is None:
+            free = self.free[type(tank)] = []
+        free.append(tank)
+
+    def release_all(self, tanks):
+        """Oddaje do puli wszystkie czołgi z kolekcji"""
+        for tank in tanks:
+            self.release(tank)
+
+
+# KLASA STEROWANIA - wejście gracza w jednym kroku symulacji
+class Inputs:
+    def __init__(self, left=False, right=False, shots=0, restart=False):
+        """Konstruktor sterowania
+        Args:
+            left, right (bool): Czy wciśnięty jest klawisz A / D
+            shots (int): Liczba naciśnięć spacji od poprzedniego kroku
+            restart (bool): Czy naciśnięto R (działa tylko po końcu gry)
+        """
+        self.left = left
+        self.right = right
+        self.shots = shots
+        self.restart = restart
+
+    def __getitem__(self, key):
+        """Działa jak wynik pygame.key.get_pressed() - Player.move nie musi znać tej klasy"""
+        if key == pygame.K_a:
+            return self.left
+        if key == pygame.K_d:
+            return self.right
+        return False
+
+
+# KLASA ŚWIATA GRY - cała logika gry bez okna, rysowania i zdarzeń pygame
+# Jeden krok (step) to jedna klatka gry przy FPS krokach na sekundę, niezależnie od tego, jak szybko
+# działa komputer - okno wywołuje step tyle razy, ile kroków minęło, a benchmark tak szybko, jak się da.
+class World:
+    def __init__(self, seed=None, tanks=1, waves=()):
+        """Konstruktor świata - tworzy gracza i pierwsze czołgi
+        Args:
+            seed (int): Ziarno generatora liczb losowych (None - losowe); to samo ziarno i sterowanie
+                dają ten sam przebieg gry
+            tanks (int): Najmniejsza liczba czołgów na planszy - brakujące są dodawane w każdym kroku
+            waves (list): Fale czołgów (Wave z ARCHETYPES.waves) - krok fali liczony od początku gry
+        """
+        self.rng = random.Random(seed)
+        self.min_tanks = tanks
+        self.waves = list(waves)
+        self.bullets = BulletPool()  # Pociski gracza i czołgów (właściciel zapisany w puli)
+        self.tanks = []              # Czołgi wrogów
+        self.pool = TankPool()       # Wolne czołgi do ponownego użycia
+        self.tank_grid = SpatialHash()  # Siatka czołgów, budowana od nowa w każdym kroku w tych samych listach
+        self.shots = ShotScheduler()    # Kroki następnych strzałów czołgów
+        self.tick = 0                # Liczba wykonanych kroków
+        self.timings = dict.fromkeys(PHASES, 0.0)  # Łączny czas faz kroku w sekundach
+        self.reset()
+
+    def reset(self):
+        """Zaczyna grę od nowa: nowy gracz z pełnym zdrowiem, zerowy wynik, pierwsze czołgi"""
+        self.game_over = False
+        self.destroyed_tanks = 0
+        self.started = self.tick     # Krok, w którym zaczęła się gra (do liczenia kroków fal)
+        self.player = Player(WIDTH // 2, HEIGHT - 50)
+        self.bullets.clear()
+        self.pool.release_all(self.tanks)
+        self.tanks.clear()
+        self.shots.clear()
+        self.spawn(self.tick)  # Reset jest przed fazami kroku - czołgi ruszają już w tym kroku
+
+    def add_tank(self, tank, first_update):
+        """Dodaje czołg do gry i do harmonogramu strzałów
+        Args:
+            tank (Tank): Nowy czołg
+            first_update (int): Krok, w którym czołg pierwszy raz się porusza
+        """
+        self.tanks.append(tank)
+        self.shots.add(tank, first_update)
+
+    def spawn_waves(self, first_update):
+        """Dodaje czołgi fal, które przypadają na ten krok gry (first_update - krok pierwszego ruchu czołgów)"""
+        elapsed = self.tick - self.started
+        for wave in self.waves:
+            if wave.due(elapsed):
+                for _ in range(wave.count):
+                    x = self.rng.randint(0, WIDTH - TILE_SIZE)
+                    self.add_tank(create_random_tank(x, -TILE_SIZE, self.rng, self.pool, wave.table), first_update)
+
+    def spawn(self, first_update):
+        """Dodaje losowe czołgi na górze ekranu, aż będzie ich co najmniej min_tanks
+        (first_update - krok pierwszego ruchu czołgów)"""
+        while len(self.tanks) < self.min_tanks:
+            x = self.rng.randint(0, WIDTH - TILE_SIZE)
+            self.add_tank(create_random_tank(x, -TILE_SIZE, self.rng, self.pool), first_update)
+
+    def snapshot(self):
+        """Zapisuje stan gry w jednym buforze bajtów (bez pickle): nagłówek SNAPSHOT_HEADER, stan generatora
+        losowego, pola czołgów (klasa, x, y, zdrowie, krok następnego strzału) w osobnych tablicach i pulę
+        pocisków. Ustawienia świata (min_tanks, waves) i czasy faz nie są zapisywane
+        Returns:
+            bytes: Zapis stanu do restore (w świecie z tymi samymi ustawieniami)
+        """
+        player, tanks = self.player, self.tanks
+        version, rng_state, gauss = self.rng.getstate()
+        columns = (list(map(TANK_TYPE_INDEX.__getitem__, map(type, tanks))), [tank.x for tank in tanks],
+                   [tank.y for tank in tanks], [tank.health for tank in tanks],
+                   list(map(self.shots.pending().__getitem__, tanks)))
+        header = SNAPSHOT_HEADER.pack(self.tick, self.started, self.destroyed_tanks, self.game_over, self.shots.order,
+                                      player.x, player.y, player.health, DIRECTIONS.index(player.direction),
+                                      version, gauss is not None, gauss or 0.0, len(tanks), self.bullets.count)
+        return b"".join([header, array("I", rng_state)]
+                        + [array(typecode, column) for typecode, column in zip(TANK_FIELDS, columns)]
+                        + [self.bullets.dump()])
+
+    def restore(self, snapshot):
+        """Przywraca stan gry zapisany przez snapshot - dalsze kroki z tym samym sterowaniem dają ten sam przebieg
+        Czołgi obecnej gry wracają do puli, a czołgi zapisu są z niej brane, więc przywracanie prawie nic nie alokuje
+        Args:
+            snapshot (bytes): Zapis stanu gry
+        """
+        data = memoryview(snapshot)
+        (tick, started, destroyed_tanks, game_over, order, x, y, health, direction,
+         version, has_gauss, gauss, count, bullets) = SNAPSHOT_HEADER.unpack_from(data)
+        rng_state = array("I")
+        offset = SNAPSHOT_HEADER.size
+        size = offset + RNG_STATE_SIZE * rng_state.itemsize + count * TANK_RECORD_SIZE + bullets * RECORD_SIZE
+        if len(data) != size:
+            raise ValueError(f"Niepoprawny zapis stanu gry: {len(data)} bajtów zamiast {size}")
+
+        end = offset + RNG_STATE_SIZE * rng_state.itemsize
+        rng_state.frombytes(data[offset:end])
+        offset = end
+        columns = [array(typecode) for typecode in TANK_FIELDS]
+        for column in columns:
+            end = offset + count * column.itemsize
+            column.frombytes(data[offset:end])
+            offset = end
+        types, xs, ys, healths, dues = columns
+        self.bullets.load(data[offset:], bullets)
+
+        self.tick, self.started, self.destroyed_tanks, self.game_over = tick, started, destroyed_tanks, game_over
+        self.rng.setstate((version, tuple(rng_state), gauss if has_gauss else None))
+        player = self.player
+        player.x, player.y, player.health, player.direction = x, y, health, DIRECTIONS[direction]
+
+        tanks, pool = self.tanks, self.pool
+        pool.release_all(tanks)
+        tanks.clear()
+        for type_index, tank_x, tank_y, tank_health in zip(types, xs, ys, healths):
+            tank = pool.acquire(TANK_TYPES[type_index], tank_x, tank_y)
+            tank.health = tank_health
+            tanks.append(tank)
+        self.shots.load(tanks, dues, order)
+
+    def _lap(self, phase, start):
+        """Dolicza czas od start do fazy i zwraca początek następnej fazy"""
+        now = time.perf_counter()
+        self.timings[phase] += now - start
+        return now
+
+    def step(self, inputs):
+        """Wykonuje jeden krok gry
+        Args:
+            inputs (Inputs): Sterowanie gracza w tym kroku
+        Returns:
+            list: Zdarzenia kroku - pary (rodzaj, zdrowie gracza), rodzaj "hit" (trafienie pociskiem)
+                albo "crash" (zderzenie z czołgiem)
+        """
+        events = []
+        if inputs.restart and self.game_over:
+            self.reset()
+        if not self.game_over:
+            self._update(inputs, events)
+        self.tick += 1
+        return events
+
+    def _update(self, inputs, events):
+        """Fazy kroku trwającej gry (czas każdej fazy jest doliczany do timings)"""
+        # Gracz: strzały (ze środka gracza, w górę) i ruch
+        start = time.perf_counter()
+        player = self.player
+        for _ in range(inputs.shots):
+            self.bullets.fire(player.x + TILE_SIZE // 2, player.y, 'UP', PLAYER)
+        player.move(inputs)
+        start = self._lap("player", start)
+
+        # Czołgi: ruch wszystkich, potem strzały tylko tych, na które przyszła pora (w kolejności listy czołgów,
+        # z pozycji po ruchu; nowe pociski lecą już w tym kroku). Czołg, który wyjechał za ekran, strzela
+        # jeszcze w tym kroku, więc wraca do puli dopiero po strzałach
+        tanks = self.tanks
+        leaving = False
+        for tank in tanks:
+            tank.move()
+            if tank.is_off_screen():
+                leaving = True
+        self.shots.fire(self.tick, self.bullets)
+        if leaving:
+            # Pozostałe czołgi są przesuwane na początek listy bez tworzenia jej kopii
+            kept = 0
+            for tank in tanks:
+                if tank.is_off_screen():
+                    self.pool.release(tank)
+                else:
+                    tanks[kept] = tank
+                    kept += 1
+            del tanks[kept:]
+        start = self._lap("tanks", start)
+
+        # Wszystkie pociski naraz: ruch, usunięcie pocisków spoza ekranu, zagęszczenie puli
+        self.bullets.update(WIDTH, HEIGHT)
+        start = self._lap("bullets", start)
+
+        # Kolizje - siatka przestrzenna czołgów budowana raz na krok (zniszczone czołgi są z niej usuwane)
+        tank_grid = self.tank_grid.rebuild(tanks)
+        self.destroyed_tanks += handle_bullet_tank_collisions(self.bullets, tanks, tank_grid, self.pool)
+        if handle_tank_bullet_player_collisions(self.bullets, player):
+            events.append(("hit", player.health))
+        if handle_player_tank_collisions(player, tanks, tank_grid):
+            events.append(("crash", player.health))
+        if player.health <= 0:
+            self.game_over = True
+        start = self._lap("collisions", start)
+
+        # Fale czołgów i nowe czołgi w miejsce zniszczonych (ruszają od następnego kroku)
+        self.spawn_waves(self.tick + 1)
+        self.spawn(self.tick + 1)
+        self._lap("spawn", start)
+
+
+# === TRYB BEZ OKNA (BENCHMARK) ===
+def scripted_inputs(tick):
+    """Sterowanie benchmarku: gracz jeździ co sekundę na zmianę w lewo i w prawo, strzela co 8 kroków,
+    a po końcu gry od razu zaczyna od nowa
+    Args:
+        tick (int): Numer kroku
+    Returns:
+        Inputs: Sterowanie w tym kroku
+    """
+    left = (tick // FPS) % 2 == 0
+    return Inputs(left=left, right=not left, shots=1 if tick % 8 == 0 else 0, restart=True)
+
+
+def run_benchmark(ticks, tanks, seed=0, waves=None):
+    """Wykonuje ticks kroków świata z min. tanks czołgami i sterowaniem scripted_inputs
+    Args:
+        ticks (int): Liczba kroków
+        tanks (int): Najmniejsza liczba czołgów na planszy
+        seed (int): Ziarno generatora liczb losowych świata
+        waves (str): Nazwa zestawu fal z tanks.json (None - bez fal)
+    Returns:
+        dict: Wyniki (ticks_per_sec, phases - czas fazy na krok w sekundach, gc - liczba odśmieceń
+            pamięci w każdej generacji, ...)
+    """
+    world = World(seed, tanks, ARCHETYPES.waves[waves] if waves else ())
+    games = 1
+    most = 0
+    collections = [stats["collections"] for stats in gc.get_stats()]
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if world.game_over:
+            games += 1  # Ten krok zacznie grę od nowa
+        world.step(scripted_inputs(tick))
+        most = max(most, len(world.tanks))
+    elapsed = time.perf_counter() - start
+    collections = [stats["collections"] - before for stats, before in zip(gc.get_stats(), collections)]
+
+    return {
+        "ticks": ticks,
+        "tanks": tanks,
+        "waves": waves,
+        "most_tanks": most,
+        "seed": seed,
+        "seconds": elapsed,
+        "ticks_per_sec": ticks / elapsed if elapsed > 0 else float("inf"),
+        "phases": {phase: total / max(ticks, 1) for phase, total in world.timings.items()},
+        "games": games,
+        "bullets": len(world.bullets),
+        "gc": collections,
+    }
+
+
+def print_benchmark(results):
+    """Wypisuje wyniki benchmarku w czytelnej postaci
+    Args:
+        results (dict): Wynik funkcji run_benchmark
+    """
+    waves = f", fale {results['waves']}" if results["waves"] else ""
+    print(f"=== BENCHMARK: {results['ticks']} kroków, min. {results['tanks']} czołgów{waves}, ziarno {results['seed']} ===")
+    print(f"Czas:      {results['seconds']:.3f} s")
+    print(f"Kroki/s:   {results['ticks_per_sec']:.1f} (gra potrzebuje {FPS})")
+    print(f"Gry:       {results['games']}, najwięcej czołgów: {results['most_tanks']}, "
+          f"pocisków na końcu: {results['bullets']}")
+    print(f"Odśmiecanie pamięci (gc), generacje 0/1/2: {'/'.join(map(str, results['gc']))}")
+    total = sum(results["phases"].values())
+    for phase, seconds in results["phases"].items():
+        share = seconds / total if total > 0 else 0
+        print(f"  {phase:<11} {seconds * 1000:8.3f} ms/krok  {share:6.1%}")
+
+
+def parse_args(argv=None):
+    """Parsuje argumenty wiersza poleceń
+    Args:
+        argv (list): Lista argumentów (domyślnie sys.argv[1:])
+    Returns:
+        argparse.Namespace: Sparsowane argumenty
+    """
+    # --waves działa przed i po nazwie komendy; opcja nie ma wartości domyślnej, żeby podparser nie nadpisywał
+    # wartości podanej przed komendą (domyślne None jest w przestrzeni nazw przekazanej do parsera)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--waves", choices=sorted(ARCHETYPES.waves), default=argparse.SUPPRESS,
+                        help="Zestaw fal czołgów z tanks.json")
+
+    parser = argparse.ArgumentParser(description="Tank Battle Game", parents=[common])
+    subparsers = parser.add_subparsers(dest="command")
+
+    bench = subparsers.add_parser("bench", parents=[common], help="Symuluj grę bez okna i zmierz wydajność")
+    bench.add_argument("--ticks", type=int, default=6000, help="Liczba kroków (60 kroków = 1 sekunda gry)")
+    bench.add_argument("--tanks", type=int, default=20, help="Najmniejsza liczba czołgów na planszy")
+    bench.add_argument("--seed", type=int, default=0, help="Ziarno generatora liczb losowych")
+
+    return parser.parse_args(argv, argparse.Namespace(waves=None))
+
+
 # GŁÓWNA FUNKCJA GRY
-def main():
-    """Główna funkcja gry - inicjalizuje Pygame i uruchamia pętlę gry"""
+def run_game(waves=None):
+    """Inicjalizuje Pygame i uruchamia pętlę gry (logika gry w World.step)
+    Args:
+        waves (str): Nazwa zestawu fal z tanks.json (None - bez fal)
+    """
     
     # === INICJALIZACJA PYGAME ===
     pygame.init()  # Inicjalizuj wszystkie moduły Pygame
@@ -321,26 +719,19 @@ def main():
     clock = pygame.time.Clock()
     
     # === INICJALIZACJA OBIEKTÓW GRY ===
+    # Świat gry: gracz na dole ekranu, na środku, i pierwszy czołg wroga w losowej pozycji na górze
+    world = World(waves=ARCHETYPES.waves[waves] if waves else ())
+    inputs = Inputs()   # Sterowanie zebrane do następnego kroku
+    accumulator = 0.0   # Czas, który minął, a nie został jeszcze zasymulowany
     
-    # Stwórz gracza na dole ekranu, na środku
-    player = Player(WIDTH // 2, HEIGHT - 50)
-    
-    # Listy do przechowywania wszystkich obiektów w grze
-    bullets = []       # Pociski wystrzeliwane przez gracza
-    tanks = []         # Czołgi wrogów
-    tank_bullets = []  # Pociski wystrzeliwane przez czołgi
-    
-    # Dodaj pierwszy czołg wroga na górze ekranu w losowej pozycji poziomej
-    tank = create_random_tank(random.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
-    tanks.append(tank)
-    
-    # === STAN GRY ===
-    game_over = False          # Czy gra się skończyła?
     font = pygame.font.Font(None, 74)        # Duża czcionka do napisów "GAME OVER"
     score_font = pygame.font.Font(None, 36)  # Średnia czcionka do wyniku
     
-    # System punktacji
-    destroyed_tanks = 0  # Liczba zniszczonych czołgów
+    # Rysowanie: obrazki gracza i wszystkich klas czołgów przygotowane z góry dla każdego poziomu zdrowia
+    renderer = Renderer(screen, TILE_SIZE, BULLET_RADIUS)
+    renderer.warm(world.player.color, world.player.max_health)
+    for tank_type in ARCHETYPES:
+        renderer.warm(tank_type.color, tank_type.max_health)
 
     # === GŁÓWNA PĘTLA GRY ===
     # Ta pętla działa w nieskończoność, aż do zamknięcia gry
@@ -354,120 +745,61 @@ def main():
                 
             elif event.type == pygame.KEYDOWN:  # Użytkownik nacisnął klawisz
                 # Strzał (spacja) - tylko gdy gra nie jest skończona
-                if event.key == pygame.K_SPACE and not game_over:
-                    # Stwórz pocisk na środku gracza, lecący w górę
-                    bullet = Bullet(player.x + TILE_SIZE // 2, player.y, 'UP')
-                    bullets.append(bullet)  # Dodaj pocisk do listy
+                if event.key == pygame.K_SPACE and not world.game_over:
+                    inputs.shots += 1
                     
                 # Restart gry (klawisz R) - tylko gdy gra się skończyła
-                elif event.key == pygame.K_r and game_over:
-                    # Zresetuj wszystkie zmienne gry do stanu początkowego
-                    game_over = False
-                    destroyed_tanks = 0  # Wyzeruj wynik
-                    player = Player(WIDTH // 2, HEIGHT - 50)  # Nowy gracz z pełnym zdrowiem
-                    
-                    # Wyczyść wszystkie listy obiektów
-                    bullets.clear()
-                    tank_bullets.clear()
-                    tanks.clear()
-                    
-                    # Stwórz pierwszego czołga
-                    tank = create_random_tank(random.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
-                    tanks.append(tank)
-
-        # Obsługa klawiszy dla gracza (tylko gdy gra nie jest skończona)
-        if not game_over:
-            keys = pygame.key.get_pressed()
-            player.move(keys)
-            
-            # Aktualizuj pociski
-            for bullet in bullets[:]:
-                bullet.move()
-                if bullet.is_off_screen():
-                    bullets.remove(bullet)
-            
-            # Aktualizuj tanki
-            for tank in tanks[:]:
-                tank.move()
-                tank.update_shooting(tank_bullets)
-                if tank.is_off_screen():
-                    tanks.remove(tank)
-            
-            # Aktualizuj pociski tanków
-            for bullet in tank_bullets[:]:
-                bullet.move()
-                if bullet.is_off_screen():
-                    tank_bullets.remove(bullet)
-            
-            # Sprawdź kolizje pocisków gracza z tankami
-            destroyed_tanks += handle_bullet_tank_collisions(bullets, tanks)
-            
-            # Sprawdź kolizje pocisków tanków z graczem
-            if handle_tank_bullet_player_collisions(tank_bullets, player):
-                print("Gracz został trafiony! Pozostało życie:", player.health)
-                if player.health <= 0:
-                    game_over = True
-            
-            # Sprawdź kolizje gracza z tankami
-            if handle_player_tank_collisions(player, tanks):
-                print("Gracz zderzył się z tankiem! Pozostało życie:", player.health)
-                if player.health <= 0:
-                    game_over = True
-            
-            # Dodaj nowy tank jeśli wszystkie zostały zniszczone
-            if len(tanks) == 0:
-                new_tank = create_random_tank(random.randint(0, WIDTH - TILE_SIZE), -TILE_SIZE)
-                tanks.append(new_tank)
+                elif event.key == pygame.K_r and world.game_over:
+                    inputs.restart = True
+
+        keys = pygame.key.get_pressed()
+        inputs.left, inputs.right = keys[pygame.K_a], keys[pygame.K_d]
+
+        # === KROKI SYMULACJI ===
+        # Stały krok: tyle kroków, ile minęło czasu (po długim zacięciu najwyżej MAX_STEPS - gra zwalnia)
+        accumulator = min(accumulator + clock.tick(FPS) / 1000, MAX_STEPS * TICK)
+        while accumulator >= TICK:
+            for kind, health in world.step(inputs):
+                if kind == "hit":
+                    print("Gracz został trafiony! Pozostało życie:", health)
+                else:
+                    print("Gracz zderzył się z tankiem! Pozostało życie:", health)
+            inputs.shots, inputs.restart = 0, False  # Strzały i restart tylko w jednym kroku
+            accumulator -= TICK
 
         # Przesuń prostokąt
         # rect.x += speed_x
         # rect.y += speed_y
 
-        # Wyczyść ekran
-        screen.fill((0, 0, 0))  # czarne tło
+        # Napisy na wierzchu: wynik i (po końcu gry) ekran game over
+        overlays = [(renderer.text(score_font, f"Tanks Destroyed: {world.destroyed_tanks}", (255, 255, 255)), (10, 10))]
+        if world.game_over:
+            overlays += [
+                (renderer.text(font, "GAME OVER", (255, 0, 0)), (WIDTH//2 - 150, HEIGHT//2 - 50)),
+                (renderer.text(score_font, f"Final Score: {world.destroyed_tanks} tanks", (255, 255, 0)),
+                 (WIDTH//2 - 120, HEIGHT//2 - 10)),
+                (renderer.text(score_font, "Press R to restart", (255, 255, 255)), (WIDTH//2 - 100, HEIGHT//2 + 30)),
+            ]
 
-        # Narysuj prostokąt
-        # pygame.draw.rect(screen, color, rect)
-        
-        # Narysuj gracza
-        player.draw(screen)
-        
-        # Narysuj tanki
-        for tank in tanks:
-            tank.draw(screen)
-        
-        # Narysuj pociski
-        for bullet in bullets:
-            bullet.draw(screen)
-            
-        # Narysuj pociski tanków
-        for bullet in tank_bullets:
-            bullet.draw(screen)
-        
-        # Wyświetl wynik
-        score_text = score_font.render(f"Tanks Destroyed: {destroyed_tanks}", True, (255, 255, 255))
-        screen.blit(score_text, (10, 10))
-        
-        # Wyświetl ekran game over jeśli gra się skończyła
-        if game_over:
-            game_over_text = font.render("GAME OVER", True, (255, 0, 0))
-            final_score_text = score_font.render(f"Final Score: {destroyed_tanks} tanks", True, (255, 255, 0))
-            restart_text = score_font.render("Press R to restart", True, (255, 255, 255))
-            screen.blit(game_over_text, (WIDTH//2 - 150, HEIGHT//2 - 50))
-            screen.blit(final_score_text, (WIDTH//2 - 120, HEIGHT//2 - 10))
-            screen.blit(restart_text, (WIDTH//2 - 100, HEIGHT//2 + 30))
+        # Narysuj gracza, tanki, pociski i napisy (czarne tło tylko pod tym, co się zmieniło)
+        dirty = renderer.draw([world.player] + world.tanks, world.bullets.positions(), overlays)
 
         # === AKTUALIZACJA EKRANU ===
-        # Wyświetl wszystko co zostało narysowane na ekranie
-        pygame.display.flip()  # Odśwież cały ekran
-        
-        # === KONTROLA FPS ===
-        # Ograniczenie do 60 klatek na sekundę (gra działa płynnie i stabilnie)
-        clock.tick(60)
+        # Odśwież tylko zmienione prostokąty zamiast całego ekranu
+        pygame.display.update(dirty)
 
 
 # === URUCHOMIENIE GRY ===
 # Ten kod uruchamia się tylko gdy plik jest uruchomiony bezpośrednio
 # (nie gdy jest importowany jako moduł)
+def main(argv=None):
+    """Główna funkcja - uruchamia grę albo benchmark (python praca_dom_tanks.py bench)"""
+    args = parse_args(argv)
+    if args.command == "bench":
+        print_benchmark(run_benchmark(args.ticks, args.tanks, args.seed, args.waves))
+        return
+    run_game(args.waves)
+
+
 if __name__ == "__main__":
     main()  # Uruchom główną funkcję gry
@@ -0,0 +1,198 @@
+# WARSTWA RYSOWANIA - grupy sprite'ów pygame z gotowymi obrazkami i aktualizacją tylko zmienionych fragmentów
+# Czołg albo gracz to prostokąt w swoim kolorze z paskiem zdrowia nad nim. Zamiast trzech wywołań
+# pygame.draw.rect na obiekt w każdej klatce obrazek (prostokąt z paskiem) jest rysowany raz dla każdego
+# koloru i poziomu zdrowia i trzymany w pamięci podręcznej. Cała grupa jest rysowana jednym Surface.blits,
+# pociski drugim, a na ekran trafiają tylko zmienione prostokąty (pygame.display.update zamiast flip).
+# Obraz na ekranie jest piksel w piksel taki sam jak przy rysowaniu metodami draw obiektów.
+
+# Importowanie niezbędnych bibliotek
+import pygame
+
+BAR_OFFSET = 8            # Pasek zdrowia zaczyna się 8 pikseli nad obiektem
+BAR_HEIGHT = 4            # Wysokość paska zdrowia
+BAR_BACKGROUND = (128, 128, 128)
+BULLET_COLOR = (255, 255, 0)
+COLORKEY = (255, 0, 255)  # Kolor przezroczysty obrazków (nie może być kolorem czołgu ani paska)
+TEXT_CACHE_SIZE = 256     # Najwięcej zapamiętanych napisów
+MAX_RECTS = 64            # Powyżej tylu prostokątów taniej jest wyczyścić i odświeżyć cały ekran naraz
+
+
+def health_color(ratio):
+    """Zwraca kolor paska zdrowia: czerwony (mało), żółty (średnio) albo zielony (dużo)
+    Args:
+        ratio (float): Stosunek zdrowia do maksymalnego zdrowia
+    """
+    if ratio <= 0.33:
+        return (255, 0, 0)
+    if ratio <= 0.66:
+        return (255, 255, 0)
+    return (0, 255, 0)
+
+
+def _transparent(width, height):
+    """Tworzy pusty obrazek z przezroczystym tłem (colorkey)"""
+    surface = pygame.Surface((width, height))
+    surface.fill(COLORKEY)
+    surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return surface
+
+
+def entity_image(color, health, max_health, size, shift=0):
+    """Rysuje obrazek czołgu albo gracza: pasek zdrowia w wierszu shift i prostokąt od wiersza BAR_OFFSET
+    Args:
+        color (tuple): Kolor prostokąta
+        health, max_health (int): Zdrowie obiektu
+        size (int): Bok prostokąta w pikselach
+        shift (int): Przesunięcie paska w dół (0 albo 1 - pasek nad obiektem na pozycji 0 < y < 8
+            jest o piksel niżej, bo pygame obcina współrzędne w stronę zera)
+    Returns:
+        pygame.Surface: Obrazek size x (size + BAR_OFFSET)
+    """
+    surface = _transparent(size, size + BAR_OFFSET)
+    pygame.draw.rect(surface, color, (0, BAR_OFFSET, size, size))
+    ratio = health / max_health
+    pygame.draw.rect(surface, BAR_BACKGROUND, (0, shift, size, BAR_HEIGHT))
+    pygame.draw.rect(surface, health_color(ratio), (0, shift, size * ratio, BAR_HEIGHT))
+    return surface
+
+
+def bullet_image(radius):
+    """Rysuje obrazek pocisku (koło jak pygame.draw.circle)
+    Returns:
+        tuple: (obrazek przycięty do koła, przesunięcie (dx, dy) lewego górnego rogu względem środka)
+    """
+    center = radius + 1
+    surface = _transparent(2 * center + 1, 2 * center + 1)
+    pygame.draw.circle(surface, BULLET_COLOR, (center, center), radius)
+    box = surface.get_bounding_rect()
+    return surface.subsurface(box).copy(), (box.x - center, box.y - center)
+
+
+# KLASA SPRITE'A OBIEKTU - obrazek z pamięci podręcznej i pozycja jednego czołgu albo gracza
+class EntitySprite(pygame.sprite.Sprite):
+    def __init__(self):
+        super().__init__()
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+
+# KLASA GRUPY - RenderUpdates rysowana jednym Surface.blits
+class BatchedRenderUpdates(pygame.sprite.RenderUpdates):
+    def draw(self, surface, bgsurf=None, special_flags=0):
+        """Rysuje wszystkie sprite'y jednym blits i zwraca zmienione prostokąty: poprzednie pozycje,
+        usunięte sprite'y i nowe pozycje (bez łączenia nachodzących prostokątów jak RenderUpdates.draw)"""
+        sprites = self.sprites()
+        drawn = surface.blits([(sprite.image, sprite.rect, None, special_flags) for sprite in sprites])
+        dirty = self.dirty_rects() + drawn
+        self.lostsprites = []
+        self.spritedict.update(zip(sprites, drawn))
+        return dirty
+
+    def dirty_rects(self):
+        """Zwraca prostokąty do wyczyszczenia przed następnym rysowaniem (poprzednie pozycje i usunięte sprite'y)"""
+        return self.lostsprites + [rect for rect in self.spritedict.values() if rect]
+
+
+# KLASA RYSOWANIA ŚWIATA GRY
+class Renderer:
+    def __init__(self, screen, tile_size, bullet_radius, background=(0, 0, 0)):
+        """Konstruktor warstwy rysowania (po pygame.display.set_mode - obrazki są w formacie ekranu)
+        Args:
+            screen (pygame.Surface): Ekran gry
+            tile_size (int): Bok czołgu i gracza w pikselach
+            bullet_radius (int): Promień pocisku
+            background (tuple): Kolor tła
+        """
+        self.screen = screen
+        self.tile_size = tile_size
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(background)
+
+        self.entities = BatchedRenderUpdates()  # Gracz i czołgi w kolejności rysowania
+        self._sprites = []     # Sprite'y do ponownego użycia: i-ty pokazuje i-ty obiekt
+        self._images = {}      # (kolor, zdrowie, maks. zdrowie, przesunięcie paska) -> obrazek
+        self._texts = {}       # (czcionka, tekst, kolor) -> obrazek napisu
+        self.bullet, self.bullet_offset = bullet_image(bullet_radius)
+        self.bullet = self.bullet.convert()
+        self.bullet.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        self._previous = []    # Prostokąty pocisków i napisów z poprzedniej klatki (do wyczyszczenia)
+        self._full = True      # Pierwsza klatka - cały ekran
+
+    def image(self, color, health, max_health, shift=0):
+        """Zwraca obrazek obiektu z pamięci podręcznej (rysowany przy pierwszym użyciu)"""
+        key = (color, health, max_health, shift)
+        image = self._images.get(key)
+        if image is None:
+            image = self._images[key] = entity_image(color, health, max_health, self.tile_size, shift).convert()
+            image.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return image
+
+    def warm(self, color, max_health):
+        """Rysuje z góry obrazki wszystkich poziomów zdrowia (1..max_health) obiektu w danym kolorze"""
+        for health in range(1, max_health + 1):
+            for shift in (0, 1):
+                self.image(color, health, max_health, shift)
+
+    def text(self, font, text, color):
+        """Zwraca obrazek napisu z pamięci podręcznej (font.render tylko dla nowego napisu)"""
+        key = (font, text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            if len(self._texts) >= TEXT_CACHE_SIZE:
+                self._texts.clear()
+            surface = self._texts[key] = font.render(text, True, color)
+        return surface
+
+    def _sync(self, entities):
+        """Ustawia sprite'y grupy na obiekty (każdy z polami x, y, color, health, max_health)"""
+        sprites, group = self._sprites, self.entities
+        while len(sprites) < len(entities):
+            sprites.append(EntitySprite())
+        # W grupie są zawsze sprite'y 0..len(group)-1 - nadmiarowe wychodzą, brakujące dochodzą na koniec
+        members = len(group)
+        group.remove(sprites[len(entities):members])  # Usunięte sprite'y zostawiają prostokąty do wyczyszczenia
+        group.add(sprites[members:len(entities)])
+
+        images = self._images
+        size = self.tile_size
+        height = size + BAR_OFFSET
+        for sprite, entity in zip(sprites, entities):
+            y = entity.y
+            top = int(y) - BAR_OFFSET
+            key = (entity.color, entity.health, entity.max_health, int(y - BAR_OFFSET) - top)
+            image = images.get(key)
+            sprite.image = image if image is not None else self.image(*key)
+            sprite.rect.update(int(entity.x), top, size, height)
+
+    def draw(self, entities, bullets, overlays):
+        """Rysuje klatkę
+        Args:
+            entities (list): Gracz i czołgi w kolejności rysowania
+            bullets: Pozycje (x, y) pocisków
+            overlays (list): Napisy na wierzchu - pary (obrazek, pozycja)
+        Returns:
+            list: Zmienione prostokąty ekranu - do pygame.display.update
+        """
+        screen, background = self.screen, self.background
+
+        # Wyczyść poprzednie pozycje wszystkiego, co było rysowane (jednym blits). Wszystko jest potem
+        # rysowane od nowa, więc przy wielu prostokątach można po prostu wyczyścić cały ekran
+        cleared = self._previous
+        full = self._full or len(cleared) + len(self.entities) > MAX_RECTS
+        if full:
+            screen.blit(background, (0, 0))
+        else:
+            screen.blits([(background, rect, rect) for rect in self.entities.dirty_rects() + cleared], False)
+
+        # Gracz i czołgi, potem pociski i napisy - każda warstwa jednym blits
+        self._sync(entities)
+        dirty = self.entities.draw(screen)
+        dx, dy = self.bullet_offset
+        image = self.bullet
+        drawn = screen.blits([(image, (int(x) + dx, int(y) + dy)) for x, y in bullets])
+        drawn += screen.blits(overlays)
+        self._previous = drawn
+        self._full = False
+        if full or len(dirty) + len(drawn) > MAX_RECTS:
+            return [screen.get_rect()]
+        return cleared + dirty + drawn
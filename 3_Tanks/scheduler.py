@@ -0,0 +1,75 @@
+# HARMONOGRAM STRZAŁÓW CZOŁGÓW - kopiec (heapq) z numerem kroku następnego strzału każdego czołgu
+# Zamiast zwiększać licznik strzałów każdego czołgu w każdej klatce, czołg jest wpisywany do kopca z numerem
+# kroku, w którym strzeli. W kroku gry zdejmowane są tylko wpisy, na które przyszła pora, więc koszt zależy
+# od liczby strzałów, a nie od liczby czołgów. Czołgi, które zniknęły (zniszczone, poza ekranem, restart),
+# nie są wyszukiwane w kopcu - czołg wracający do puli zmienia numer życia (life), więc jego stary wpis
+# przestaje pasować i jest pomijany dopiero przy zdejmowaniu (także gdy obiekt wrócił już z puli do gry).
+
+# Importowanie niezbędnych bibliotek
+import heapq  # Kopiec - wpis z najwcześniejszym strzałem zawsze na początku listy
+from operator import attrgetter  # Numery życia wielu czołgów naraz (przy odtwarzaniu harmonogramu)
+
+
+class ShotScheduler:
+    def __init__(self):
+        """Konstruktor pustego harmonogramu"""
+        self.heap = []   # Wpisy (krok strzału, kolejność dodania, życie czołgu, czołg)
+        self.order = 0   # Licznik kolejności - czołgi strzelające w tym samym kroku strzelają w kolejności dodania
+
+    def __len__(self):
+        """Liczba wpisów (razem z nieaktualnymi, jeszcze nie zdjętymi)"""
+        return len(self.heap)
+
+    def add(self, tank, first_update):
+        """Wpisuje nowy czołg do harmonogramu
+        Args:
+            tank (Tank): Czołg z polami shoot_delay i life
+            first_update (int): Krok, w którym czołg pierwszy raz się porusza - pierwszy strzał jest
+                w kroku first_update + shoot_delay - 1 (shoot_delay-ty krok ruchu), potem co shoot_delay
+        """
+        heapq.heappush(self.heap, (first_update + max(tank.shoot_delay, 1) - 1, self.order, tank.life, tank))
+        self.order += 1
+
+    def fire(self, tick, bullets):
+        """Strzela czołgami, na które przyszła pora, w kolejności dodania do harmonogramu
+        Args:
+            tick (int): Aktualny krok gry
+            bullets (BulletPool): Pula pocisków
+        Returns:
+            int: Liczba strzałów
+        """
+        heap = self.heap
+        shots = 0
+        while heap and heap[0][0] <= tick:
+            due, order, life, tank = heap[0]
+            if tank.life != life:
+                heapq.heappop(heap)  # Czołg zniknął z gry - wpis jest nieaktualny
+                continue
+            tank.fire(bullets)
+            heapq.heapreplace(heap, (due + max(tank.shoot_delay, 1), order, life, tank))
+            shots += 1
+        return shots
+
+    def pending(self):
+        """Zwraca kroki następnych strzałów z ważnych wpisów (bez czołgów, które zniknęły)
+        Returns:
+            dict: Czołg -> krok następnego strzału
+        """
+        return {tank: due for due, order, life, tank in self.heap if tank.life == life}
+
+    def load(self, tanks, dues, order):
+        """Ustawia harmonogram od nowa, np. po odtworzeniu zapisanego stanu gry
+        Liczy się tylko kolejność czołgów strzelających w tym samym kroku, więc czołgi dostają kolejne
+        numery od 0 - mniejsze od licznika order, od którego numerowane są czołgi dodane później
+        Args:
+            tanks (list): Czołgi w kolejności dodania
+            dues (list): Kroki następnych strzałów czołgów
+            order (int): Kolejność dla następnego dodanego czołgu (co najmniej liczba czołgów)
+        """
+        self.heap = list(zip(dues, range(len(tanks)), map(attrgetter("life"), tanks), tanks))
+        heapq.heapify(self.heap)
+        self.order = order
+
+    def clear(self):
+        """Usuwa wszystkie wpisy (np. przy restarcie gry)"""
+        self.heap.clear()
@@ -0,0 +1,137 @@
+# SIATKA PRZESTRZENNA (SPATIAL HASH) - szybkie wyszukiwanie obiektów w pobliżu prostokąta
+# Ekran jest podzielony na kwadratowe komórki o boku cell_size. Każdy obiekt jest wpisany do komórek,
+# na które zachodzi jego prostokąt, więc przy szukaniu kolizji sprawdzamy tylko obiekty z komórek
+# pod szukanym prostokątem, a nie wszystkie obiekty na ekranie.
+
+# Importowanie niezbędnych bibliotek
+import numpy as np  # Wstępny filtr wielu punktów naraz (touching)
+
+CELL_SIZE = 32  # Bok komórki w pikselach (czołg 20x20 zajmuje najwyżej 4 komórki)
+
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        """Konstruktor siatki
+        Args:
+            cell_size (int): Bok komórki w pikselach
+        """
+        self.cell_size = cell_size
+        self.cells = {}     # (kolumna, wiersz) -> lista wpisów [indeks, obiekt, prostokąt]
+        self.entries = {}   # id(obiekt) -> wpis (do usuwania)
+
+    @classmethod
+    def build(cls, items, cell_size=CELL_SIZE):
+        """Tworzy siatkę z listy obiektów z metodą get_rect()
+        Args:
+            items (list): Obiekty (czołgi, pociski) - indeks na liście decyduje o kolejności trafień
+            cell_size (int): Bok komórki w pikselach
+        Returns:
+            SpatialHash: Siatka z wpisanymi obiektami
+        """
+        grid = cls(cell_size)
+        for index, item in enumerate(items):
+            grid.insert(index, item, item.get_rect())
+        return grid
+
+    def rebuild(self, items):
+        """Wpisuje obiekty do siatki od nowa, używając ponownie list komórek i wpisów z poprzedniego budowania
+        (w każdej klatce te same czołgi w tych samych komórkach - prawie bez nowych alokacji)
+        Args:
+            items (list): Obiekty z metodą get_rect() - jak w build
+        Returns:
+            SpatialHash: Ta sama siatka
+        """
+        cells, known = self.cells, self.entries
+        for entries in cells.values():
+            entries.clear()
+        if len(known) > 2 * len(items) + 64:
+            known.clear()  # Wpisy obiektów, których już nie ma, nie mogą się zbierać bez końca
+
+        size = self.cell_size
+        for index, item in enumerate(items):
+            rect = item.get_rect()
+            entry = known.get(id(item))
+            if entry is None or entry[1] is not item:
+                entry = known[id(item)] = [index, item, rect]
+            else:
+                entry[0], entry[2] = index, rect
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cell = cells[cx, cy] = []
+                    cell.append(entry)
+        return self
+
+    def _cells(self, rect):
+        """Zwraca klucze komórek, na które zachodzi prostokąt (prawa i dolna krawędź nie należą do prostokąta)"""
+        size = self.cell_size
+        x0, x1 = rect.left // size, (rect.right - 1) // size
+        y0, y1 = rect.top // size, (rect.bottom - 1) // size
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def insert(self, index, item, rect):
+        """Wpisuje obiekt do siatki
+        Args:
+            index (int): Pozycja obiektu na liście (mniejszy indeks wygrywa, gdy trafień jest kilka)
+            item: Obiekt
+            rect (pygame.Rect): Prostokąt obiektu
+        """
+        entry = [index, item, rect]
+        self.entries[id(item)] = entry
+        for key in self._cells(rect):
+            self.cells.setdefault(key, []).append(entry)
+
+    def remove(self, item):
+        """Usuwa obiekt z siatki (np. zniszczony czołg nie może już zostać trafiony)"""
+        entry = self.entries.pop(id(item), None)
+        if entry is not None:
+            for key in self._cells(entry[2]):
+                self.cells[key].remove(entry)
+
+    def first_hit(self, rect):
+        """Zwraca obiekt o najmniejszym indeksie, którego prostokąt przecina podany
+        (tak samo jak pętla po liście, przerywana przy pierwszej kolizji)
+        Args:
+            rect (pygame.Rect): Szukany prostokąt
+        Returns:
+            Obiekt albo None, jeśli nic nie koliduje
+        """
+        best = None
+        for key in self._cells(rect):
+            for entry in self.cells.get(key, ()):
+                if (best is None or entry[0] < best[0]) and rect.colliderect(entry[2]):
+                    best = entry
+        return best[1] if best is not None else None
+
+    def touching(self, xs, ys, radius):
+        """Wstępny filtr wielu małych obiektów naraz (np. wszystkich pocisków z puli)
+
+        Zwraca maskę punktów, których kwadrat [x - radius, x + radius] zachodzi na komórkę z co najmniej
+        jednym obiektem. Filtr jest zachowawczy: kolizja jest możliwa tylko dla punktów z maską True,
+        a dokładne sprawdzenie robi first_hit. Kwadrat musi być mniejszy od komórki (sprawdzane są jego rogi).
+        Args:
+            xs, ys (np.ndarray): Środki obiektów
+            radius (float): Połowa boku kwadratu obiektu
+        Returns:
+            np.ndarray: Maska bool o długości len(xs)
+        """
+        mask = np.zeros(len(xs), dtype=bool)
+        keys = [key for key, entries in self.cells.items() if entries]
+        if not keys or not len(xs):
+            return mask
+
+        # Zajęte komórki jako tablica bool obejmująca ich prostokąt
+        columns, rows = np.array(keys).T
+        left, top = columns.min(), rows.min()
+        occupied = np.zeros((rows.max() - top + 1, columns.max() - left + 1), dtype=bool)
+        occupied[rows - top, columns - left] = True
+
+        size = self.cell_size
+        for dx in (-radius, radius):
+            cx = np.floor((xs + dx) / size).astype(np.int64) - left
+            for dy in (-radius, radius):
+                cy = np.floor((ys + dy) / size).astype(np.int64) - top
+                inside = (cx >= 0) & (cx < occupied.shape[1]) & (cy >= 0) & (cy < occupied.shape[0])
+                mask[inside] |= occupied[cy[inside], cx[inside]]
+        return mask
@@ -0,0 +1,181 @@
+# WYKRYWANIE CYKLI
+# Po każdej generacji liczony jest skrót stanu planszy w stylu Zobrista: każda para (komórka, stan)
+# ma stały losowy klucz 64-bitowy, a skrót to XOR kluczy niezerowych komórek. Zmiana stanu komórki
+# to XOR klucza starego i nowego stanu, więc skrót jest aktualizowany tylko na podstawie komórek
+# zmienionych w tej generacji. Zmienione komórki podaje silnik (Engine.changes) - zbiera je w kroku, więc
+# detektor nie porównuje całych plansz; tylko dla silników, które ich nie zbierają, trzyma kopię poprzedniej
+# generacji. Klucze nie są przechowywane w tablicy - liczy je funkcja mieszająca splitmix64 z kodu
+# (y * width + x) * 256 + stan.
+#
+# Skróty ostatnich generacji trafiają do tablicy historii o ograniczonym rozmiarze. Powtórzenie
+# skrótu oznacza, że plansza weszła w cykl (okres 1 to martwa natura albo pusta plansza).
+
+# Importowanie niezbędnych bibliotek
+from collections import deque  # Kolejność wpisów historii (do usuwania najstarszych)
+import numpy as np
+
+# Ziarno rodziny kluczy. Przy 64 bitach i kilku tysiącach pamiętanych skrótów przypadkowa kolizja
+# ma prawdopodobieństwo rzędu 2^-40 na generację, więc skrót nie jest dodatkowo weryfikowany.
+SEED = 0x243F6A8885A308D3
+REHASH_CELLS = 256 * 1024  # Komórki w jednym pasie przy liczeniu skrótu od zera
+
+
+def zobrist_keys(indices, seed=SEED):
+    """Zwraca klucze o podanych kodach (indeks komórki * 256 + stan)
+    Args:
+        indices (np.ndarray): Kody par (komórka, stan)
+        seed (int): Ziarno rodziny kluczy
+    Returns:
+        np.ndarray: Klucze uint64
+    """
+    z = np.asarray(indices, dtype=np.uint64) + np.uint64(seed)
+    z *= np.uint64(0x9E3779B97F4A7C15)
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return z
+
+
+def xor_keys(indices, seed=SEED):
+    """Zwraca XOR kluczy o podanych kodach jako liczbę całkowitą"""
+    return int(np.bitwise_xor.reduce(zobrist_keys(indices, seed), initial=np.uint64(0)))
+
+
+def state_codes(indices, values):
+    """Zwraca kody par (komórka, stan) z pominięciem komórek martwych
+    Args:
+        indices (np.ndarray): Indeksy komórek (y * width + x)
+        values (np.ndarray): Stany tych komórek
+    Returns:
+        np.ndarray: Kody indeks * 256 + stan
+    """
+    alive = values != 0
+    return indices[alive] * 256 + values[alive]
+
+
+# KLASA CYKLU - wynik wykrywania
+class Cycle:
+    def __init__(self, start, period):
+        """Konstruktor cyklu
+        Args:
+            start (int): Pierwsza generacja należąca do cyklu
+            period (int): Okres cyklu (1 - martwa natura lub pusta plansza)
+        """
+        self.start = start
+        self.period = period
+
+    def __repr__(self):
+        return f"Cycle(start={self.start}, period={self.period})"
+
+    def __str__(self):
+        return f"okres {self.period} od generacji {self.start}"
+
+
+# KLASA DETEKTORA CYKLI
+class CycleDetector:
+    def __init__(self, width, height, max_history=4096):
+        """Konstruktor detektora
+        Args:
+            width, height (int): Rozmiar planszy
+            max_history (int): Liczba pamiętanych generacji - dłuższe okresy nie zostaną wykryte
+        """
+        self.width = width
+        self.height = height
+        self.max_history = max_history
+
+        self.hash = 0            # Aktualny skrót stanu
+        self.generation = None   # Generacja, której dotyczy skrót
+        self.edits = None        # Licznik ręcznych zmian siatki z chwili ostatniej obserwacji
+        self.cycle = None        # Wykryty cykl (Cycle) albo None
+
+        self.history = {}        # Skrót -> generacja, w której wystąpił pierwszy raz
+        self._order = deque()    # Skróty w kolejności dodania
+        self._previous = None    # Stan z poprzedniej obserwacji (tylko dla silników bez Engine.changes)
+        self._changed = None     # Maska komórek zmienionych od poprzedniej obserwacji (jw.)
+
+    def _rehash(self, grid):
+        """Liczy skrót od zera z całej planszy - pasami wierszy (Grid.window), bez tablicy wielkości planszy"""
+        self.hash = 0
+        rows = max(1, REHASH_CELLS // grid.width)
+        for y in range(0, grid.height, rows):
+            band = grid.window(0, y, grid.width, y + rows).reshape(-1)
+            indices = np.flatnonzero(band)
+            self.hash ^= xor_keys(state_codes(indices + y * grid.width, band[indices]))
+        if self._previous is not None:
+            np.copyto(self._previous, grid.state)
+
+    def _diff(self, grid):
+        """Zwraca zmienione komórki z porównania z kopią poprzedniej generacji (silniki bez Engine.changes)
+        Przy pierwszym wywołaniu kopii jeszcze nie ma - wtedy zwraca None, a kopię wypełni _rehash
+        """
+        state = grid.state
+        if self._previous is None:
+            self._previous = np.empty_like(state)
+            self._changed = np.empty(state.shape, dtype=bool)
+            return None
+        # flatnonzero na spłaszczonej masce od razu daje indeksy y * width + x i jest szybsze niż nonzero 2D
+        np.not_equal(state, self._previous, out=self._changed)
+        indices = np.flatnonzero(self._changed)
+        changes = (indices, self._previous.ravel()[indices], state.ravel()[indices])
+        np.copyto(self._previous, state)
+        return changes
+
+    def _remember(self):
+        """Zapisuje skrót w historii albo wykrywa cykl, jeśli skrót już był"""
+        if self.cycle is not None:
+            return
+        key = self.hash
+        first = self.history.get(key)
+        if first is not None:
+            self.cycle = Cycle(first, self.generation - first)
+            return
+        self.history[key] = self.generation
+        self._order.append(key)
+        if len(self._order) > self.max_history:
+            del self.history[self._order.popleft()]
+
+    def reset(self, grid):
+        """Zapomina historię i cykl, liczy skrót od nowa (np. po ręcznej zmianie planszy)"""
+        self.history.clear()
+        self._order.clear()
+        self.cycle = None
+        self._rehash(grid)
+        self.generation = grid.generation
+        self.edits = grid.edits
+        self._remember()
+
+    def observe(self, grid):
+        """Aktualizuje skrót po zmianie generacji siatki
+        Args:
+            grid (Grid): Obserwowana siatka
+        Returns:
+            Cycle lub None: Wykryty cykl
+        """
+        if self.generation is None or grid.edits != self.edits:
+            # Ręczna zmiana planszy - dotychczasowa historia nie opisuje już tej ewolucji
+            self.reset(grid)
+            return self.cycle
+
+        if grid.generation == self.generation + 1:
+            # Zwykły krok - XOR kluczy tylko zmienionych komórek
+            changes = grid.engine.changes()
+            if changes is None:
+                changes = self._diff(grid)
+            if changes is None:
+                self._rehash(grid)  # Pierwszy krok silnika bez Engine.changes - skrót od zera, historia zostaje
+            elif len(changes[0]):
+                # Usunięcie klucza starego stanu i dodanie klucza nowego - oba przez XOR
+                indices, before, after = changes
+                self.hash ^= xor_keys(np.concatenate((state_codes(indices, before), state_codes(indices, after))))
+        else:
+            # Przeskok o wiele generacji - historia ma lukę, więc zaczynamy ją od nowa,
+            # ale wykryty cykl nadal obowiązuje (plansza nie była zmieniana ręcznie)
+            self.history.clear()
+            self._order.clear()
+            self._rehash(grid)
+
+        self.generation = grid.generation
+        self._remember()
+        return self.cycle
@@ -0,0 +1,1253 @@
+# SILNIKI GAME OF LIFE
+# Różne implementacje kroku symulacji ukryte za wspólnym interfejsem Engine
+# Klasa Grid (game_of_life.py) deleguje do wybranego silnika całą pracę na stanie planszy
+
+# Importowanie niezbędnych bibliotek
+from abc import ABC, abstractmethod  # Do zdefiniowania wspólnego interfejsu silników
+import numpy as np                    # Tablice i operacje wektorowe
+
+from rules import CONWAY, RuleError, parse_rule  # Reguły skompilowane do tablic przejść
+
+# Tryby brzegu planszy:
+# - dead - poza planszą komórki są zawsze martwe (jak w pierwotnej implementacji)
+# - torus - plansza zawinięta: prawa krawędź sąsiaduje z lewą, dolna z górną
+# - infinite - nieograniczona płaszczyzna, width x height to tylko okno widoczne w to_array
+BOUNDARIES = ("dead", "torus", "infinite")
+LANE_CELLS = 512 * 1024  # Od tylu komórek count_ones sumuje słowa uint64 (mniejsze tablice - count_nonzero)
+
+
+# KLASA KOMÓRKI - reprezentuje pojedynczą komórkę w siatce (używana przez silnik referencyjny)
+class Cell:
+    def __init__(self, x, y, alive=False):
+        """Konstruktor komórki
+        Args:
+            x (int): Pozycja w siatce (kolumna)
+            y (int): Pozycja w siatce (rząd)
+            alive (bool): Czy komórka jest żywa na początku
+        """
+        self.x = x                    # Pozycja X w siatce
+        self.y = y                    # Pozycja Y w siatce
+        self.alive = alive            # Aktualny stan (martwa/żywa, w regułach Generations także 2.. - umierająca)
+        self.next_state = alive       # Stan w następnej generacji
+        self.neighbors = []           # Sąsiednie komórki - ustawiane raz przez silnik zgodnie z trybem brzegu
+
+    def set_next_state(self, next_alive):
+        """Ustawia stan komórki w następnej generacji
+        Args:
+            next_alive (int): Stan komórki w następnej generacji (0 - martwa, 1 - żywa)
+        """
+        self.next_state = next_alive
+
+    def update(self):
+        """Aktualizuje stan komórki do następnej generacji"""
+        self.alive = self.next_state
+
+    def toggle(self):
+        """Przełącza stan komórki (żywa <-> martwa)"""
+        self.alive = not self.alive
+        self.next_state = self.alive
+
+
+# BAZOWA KLASA SILNIKA - wspólny interfejs wszystkich implementacji
+class Engine(ABC):
+    # Obsługiwane tryby brzegu (patrz BOUNDARIES) - pierwszy jest domyślny
+    boundaries = ("dead",)
+
+    def __init__(self, width, height, rule=None, boundary=None):
+        """Konstruktor silnika
+        Args:
+            width (int): Szerokość planszy (liczba komórek)
+            height (int): Wysokość planszy (liczba komórek)
+            rule (str lub Rule): Reguła automatu (domyślnie B3/S23, patrz rules.py)
+            boundary (str): Tryb brzegu planszy (domyślnie pierwszy z boundaries)
+        """
+        self.width = width
+        self.height = height
+        self.boundary = boundary or self.boundaries[0]
+        if self.boundary not in self.boundaries:
+            raise ValueError(f"Silnik {type(self).__name__} nie obsługuje brzegu {self.boundary} "
+                             f"(dostępne: {', '.join(self.boundaries)})")
+        self.rule = parse_rule(rule)
+        self.check_rule(self.rule)
+
+        # Czy krok ma od razu zbierać liczniki dla census (włącza Grid z metrykami;
+        # dotyczy silników, które liczą je przy okazji kroku, np. w procesach roboczych)
+        self.counting = False
+        # Czy krok ma od razu zapamiętać zmienione komórki dla changes (włącza Grid z wykrywaniem cykli)
+        self.tracking = False
+
+        # Generacja, od której silnik zaczyna (niezerowa, gdy wznawia przerwane obliczenia)
+        self.start_generation = 0
+
+    @property
+    def bounded(self):
+        """Czy plansza ma skończony rozmiar width x height (martwa ramka albo torus)"""
+        return self.boundary != "infinite"
+
+    def check_rule(self, rule):
+        """Sprawdza, czy silnik obsługuje regułę - jeśli nie, zgłasza RuleError
+        Args:
+            rule (Rule): Sprawdzana reguła
+        """
+
+    @abstractmethod
+    def get(self, x, y):
+        """Zwraca stan komórki (0 - martwa, 1 - żywa)"""
+
+    @abstractmethod
+    def set(self, x, y, alive):
+        """Ustawia stan komórki"""
+
+    @abstractmethod
+    def step(self):
+        """Przelicza planszę o jedną generację"""
+
+    @abstractmethod
+    def to_array(self):
+        """Zwraca stan planszy jako tablicę uint8 o kształcie (height, width)
+        (0 - martwa, 1 - żywa, 2.. - umierająca w regułach Generations)"""
+
+    @abstractmethod
+    def load_array(self, array):
+        """Wczytuje stan planszy z tablicy o kształcie (height, width)"""
+
+    def load_rows(self, chunks):
+        """Wczytuje stan planszy porcjami wierszy (np. losowaną porcja po porcji)
+        Domyślnie porcje trafiają do tablicy całej planszy wczytywanej przez load_array; silniki
+        trzymające planszę poza pamięcią zapisują każdą porcję od razu
+        Args:
+            chunks (iterable): Kolejne porcje wierszy od góry planszy - tablice o kształcie (n, width)
+        """
+        array = np.zeros((self.height, self.width), dtype=np.uint8)
+        y = 0
+        for rows in chunks:
+            array[y:y + len(rows)] = rows
+            y += len(rows)
+        self.load_array(array)
+
+    def set_cells(self, xs, ys):
+        """Ustawia wiele komórek naraz jako żywe (np. przy wczytywaniu wzorca)
+        Args:
+            xs, ys (np.ndarray): Tablice współrzędnych
+        """
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.set(x, y, 1)
+
+    def advance(self, generations):
+        """Przesuwa planszę o podaną liczbę generacji (domyślnie krok po kroku)
+        Args:
+            generations (int): Liczba generacji
+        """
+        for _ in range(generations):
+            self.step()
+
+    def clear(self):
+        """Czyści planszę (wszystkie komórki martwe)"""
+        self.load_array(np.zeros((self.height, self.width), dtype=np.uint8))
+
+    def population(self):
+        """Zwraca liczbę żywych komórek"""
+        return int(np.count_nonzero(self.to_array()))
+
+    def close(self):
+        """Zwalnia zasoby silnika (procesy, pamięć współdzieloną, pliki)"""
+
+    def census(self):
+        """Zwraca liczniki ostatniego kroku
+
+        Silniki liczą je z buforów, które i tak mają po kroku (bez kopii planszy). Wynik dotyczy
+        kroku wykonanego tuż przed wywołaniem - po ręcznej zmianie planszy trzeba najpierw wykonać krok.
+        Returns:
+            tuple lub None: (population, births, deaths) - żywe komórki (stan 1), komórki, które ożyły
+                i które przestały żyć; None, jeśli silnik nie zna narodzin i śmierci
+        """
+        return None
+
+    def changes(self):
+        """Zwraca komórki zmienione w ostatnim kroku
+
+        Silniki zbierają je w kroku (gdy tracking) z buforów, które i tak mają po kroku - bez kopii
+        i bez porównywania całych plansz. Wynik dotyczy kroku wykonanego tuż przed wywołaniem.
+        Returns:
+            tuple lub None: (indices, before, after) - indeksy y * width + x zmienionych komórek okna
+                width x height oraz ich stany przed krokiem i po nim; None, jeśli silnik nie zbiera zmian
+        """
+        return None
+
+    def bounding_box(self):
+        """Zwraca prostokąt zajętych (niezerowych) komórek
+        Returns:
+            tuple lub None: (x0, y0, x1, y1) - x1, y1 za ostatnią komórką; None dla pustej planszy
+        """
+        return find_box(self.to_array())
+
+    def window(self, x0, y0, x1, y1):
+        """Zwraca fragment planszy (np. widoczny na ekranie)
+
+        Silniki, które nie trzymają planszy w jednej tablicy bajtów, przygotowują tylko ten fragment.
+        Args:
+            x0, y0, x1, y1 (int): Prostokąt [y0:y1, x0:x1] - części spoza planszy są pomijane
+        Returns:
+            np.ndarray: Stan fragmentu (uint8, jak to_array)
+        """
+        return self.to_array()[max(0, y0):y1, max(0, x0):x1]
+
+    def changed_cells(self, previous):
+        """Zwraca współrzędne komórek, których stan różni się od podanej migawki
+        Args:
+            previous (np.ndarray): Wcześniejszy stan planszy (height, width)
+        Returns:
+            tuple: Tablice (xs, ys) zmienionych komórek
+        """
+        ys, xs = np.nonzero(self.to_array() != previous)
+        return xs, ys
+
+
+# SILNIK REFERENCYJNY - pierwotna implementacja na obiektach Cell
+# Wolny, ale prosty - służy jako wzorzec poprawności dla pozostałych silników
+class ReferenceEngine(Engine):
+    boundaries = ("dead", "torus")
+
+    def __init__(self, width, height, rule=None, boundary=None):
+        super().__init__(width, height, rule, boundary)
+        self._table = self.rule.table.tolist()  # Tablica przejść jako listy - szybszy odczyt pojedynczych pól
+
+        # Tworzenie dwuwymiarowej listy komórek
+        self.cells = []
+        for y in range(height):
+            row = []
+            for x in range(width):
+                # Każda komórka zaczyna jako martwa
+                cell = Cell(x, y, False)
+                row.append(cell)
+            self.cells.append(row)
+
+        self._link_neighbors()
+
+    def _link_neighbors(self):
+        """Zapisuje w każdej komórce listę jej sąsiadów
+        Granice planszy są sprawdzane tylko tutaj, raz - przy liczeniu generacji już nie.
+        """
+        torus = self.boundary == "torus"
+        for row in self.cells:
+            for cell in row:
+                cell.neighbors = []
+                for dx, dy in self.rule.offsets:
+                    if torus:
+                        neighbor = self.cells[(cell.y + dy) % self.height][(cell.x + dx) % self.width]
+                    else:
+                        neighbor = self.get_cell(cell.x + dx, cell.y + dy)
+                    if neighbor:
+                        cell.neighbors.append(neighbor)
+
+    def get_cell(self, x, y):
+        """Pobiera komórkę na danej pozycji
+        Args:
+            x, y (int): Współrzędne komórki
+        Returns:
+            Cell lub None: Komórka lub None jeśli poza siatką
+        """
+        # Sprawdź czy współrzędne są w granicach siatki
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y][x]
+        return None
+
+    def count_neighbors(self, x, y):
+        """Liczy żywych sąsiadów komórki
+        Args:
+            x, y (int): Współrzędne komórki
+        Returns:
+            int: Liczba żywych sąsiadów (0-8 dla zwykłych reguł)
+        """
+        count = 0
+
+        # Sprawdź wszystkich sąsiadów z listy komórki (zwykle 8 kierunków wokół niej)
+        for neighbor in self.cells[y][x].neighbors:
+            # Jeśli sąsiad jest żywy (umierający się nie liczy), zwiększ licznik
+            if neighbor.alive == 1:
+                count += 1
+
+        return count
+
+    def calculate_next_generation(self):
+        """Oblicza następną generację według reguły silnika
+
+        Następny stan komórki to pole tablicy przejść table[stan, liczba_sąsiadów].
+        Dla reguły Conway'a (B3/S23):
+        1. Żywa komórka z 2-3 sąsiadami pozostaje żywa
+        2. Martwa komórka z dokładnie 3 sąsiadami staje się żywa
+        3. W pozostałych przypadkach komórka umiera lub pozostaje martwa
+        """
+        table = self._table
+        for y in range(self.height):
+            for x in range(self.width):
+                cell = self.cells[y][x]
+                cell.set_next_state(table[int(cell.alive)][self.count_neighbors(x, y)])
+
+    def get(self, x, y):
+        return int(self.cells[y][x].alive)
+
+    def set(self, x, y, alive):
+        cell = self.cells[y][x]
+        cell.alive = int(alive)
+        cell.next_state = cell.alive
+
+    def step(self):
+        self.calculate_next_generation()
+
+        # Zaktualizuj wszystkie komórki
+        for row in self.cells:
+            for cell in row:
+                cell.update()
+
+    def to_array(self):
+        return np.array([[cell.alive for cell in row] for row in self.cells], dtype=np.uint8)
+
+    def load_array(self, array):
+        for y, row in enumerate(self.cells):
+            for x, cell in enumerate(row):
+                cell.alive = int(array[y][x])
+                cell.next_state = cell.alive
+
+
+# FUNKCJE JĄDRA - wspólne dla silnika numpy i silnika kafelkowego
+def sum_neighbors(padded, out):
+    """Liczy żywych sąsiadów wszystkich komórek naraz
+
+    Sumuje 8 przesuniętych wycinków tablicy z ramką - bez sprawdzania granic.
+    Args:
+        padded (np.ndarray): Stan (h+2, w+2) otoczony ramką jednej komórki
+        out (np.ndarray): Wynik (h, w) - liczba sąsiadów (0-8)
+    Returns:
+        np.ndarray: Tablica out
+    """
+    h, w = out.shape
+    np.add(padded[0:h, 0:w], padded[0:h, 1:w + 1], out=out)
+    np.add(out, padded[0:h, 2:w + 2], out=out)
+    np.add(out, padded[1:h + 1, 0:w], out=out)
+    np.add(out, padded[1:h + 1, 2:w + 2], out=out)
+    np.add(out, padded[2:h + 2, 0:w], out=out)
+    np.add(out, padded[2:h + 2, 1:w + 1], out=out)
+    np.add(out, padded[2:h + 2, 2:w + 2], out=out)
+    return out
+
+
+def sum_neighbors_range(padded, out, rule, prefix):
+    """Liczy żywych sąsiadów w zasięgu rule.radius (reguły Larger than Life)
+
+    Sumy prefiksowe wierszy pozwalają policzyć sumę dowolnego odcinka wiersza dwiema operacjami,
+    więc koszt to 2 * (2r + 1) operacji na tablicach niezależnie od liczby sąsiadów.
+    Args:
+        padded (np.ndarray): Żywe komórki (h+2r, w+2r) otoczone ramką r komórek
+        out (np.ndarray): Wynik (h, w) typu int32
+        rule (Rule): Reguła (zasięg, sąsiedztwo, liczenie środka)
+        prefix (np.ndarray): Bufor int32 (h+2r, w+2r+1) z zerową pierwszą kolumną
+    Returns:
+        np.ndarray: Tablica out
+    """
+    r = rule.radius
+    h, w = out.shape
+    np.cumsum(padded, axis=1, dtype=np.int32, out=prefix[:, 1:])
+
+    out.fill(0)
+    for dy in range(-r, r + 1):
+        # Połowa szerokości odcinka: kwadrat (Moore) albo romb (von Neumann)
+        span = r if rule.neighborhood == "M" else r - abs(dy)
+        rows = prefix[r + dy:r + dy + h]
+        np.add(out, rows[:, r + span + 1:r + span + 1 + w], out=out)
+        np.subtract(out, rows[:, r - span:r - span + w], out=out)
+
+    if not rule.middle:
+        np.subtract(out, padded[r:r + h, r:r + w], out=out)
+    return out
+
+
+def apply_rule(neighbors, state, out, rule=CONWAY, scratch=None):
+    """Zapisuje do out następną generację według skompilowanej reguły
+
+    Zawsze jest to odczyt z tablicy przejść table[stan, liczba_sąsiadów], tylko wykonany
+    najtańszą operacją wektorową dostępną dla danej reguły:
+    - B3/S23: (sąsiedzi | stan) == 3 - martwa z 3 sąsiadami: 3 | 0 = 3, żywa z 2 lub 3: 2 | 1 = 3 | 1 = 3,
+      każda inna kombinacja daje wartość różną od 3
+    - inne reguły dwustanowe: wiersz tablicy spakowany w bity (rule.masks), następny stan to bit
+      o numerze równym liczbie sąsiadów: (maska_stanu >> sąsiedzi) & 1
+    - Generations i Larger than Life: np.take z płaskiej tablicy pod indeksem stan * (max + 1) + sąsiedzi
+    Args:
+        neighbors (np.ndarray): Liczba sąsiadów (może zostać nadpisana)
+        state (np.ndarray): Aktualny stan (uint8)
+        out (np.ndarray): Następny stan (uint8)
+        rule (Rule): Reguła
+        scratch (np.ndarray): Bufor pomocniczy z RuleKernel (uint16 albo intp), zbędny dla B3/S23
+    """
+    if rule.is_conway:
+        np.bitwise_or(neighbors, state, out=neighbors)
+        np.equal(neighbors, 3, out=out.view(np.bool_))
+    elif rule.masks is not None:
+        birth, survive = rule.masks
+        # Maska stanu: birth dla martwych, survive dla żywych (birth ^ (birth ^ survive) * stan)
+        np.multiply(state, birth ^ survive, out=scratch)
+        np.bitwise_xor(scratch, birth, out=scratch)
+        np.right_shift(scratch, neighbors, out=scratch)
+        np.bitwise_and(scratch, 1, out=out, casting="unsafe")
+    else:
+        np.multiply(state, rule.max_count + 1, out=scratch, dtype=scratch.dtype)
+        np.add(scratch, neighbors, out=scratch)
+        np.take(rule.flat_table, scratch, out=out)
+
+
+# === LICZNIKI (METRYKI GENERACJI) ===
+
+def count_ones(cells):
+    """Liczy jedynki w tablicy uint8 zawierającej tylko 0 i 1
+
+    Tablica jest czytana jako słowa uint64 (8 komórek w słowie). Suma 255 słów nie przepełnia
+    żadnego z 8 bajtów, więc słowa są sumowane w blokach po 255, a na końcu sumowane są bajty
+    wyniku - jedna redukcja na 8 razy mniejszej liczbie elementów. Tablice mniejsze niż LANE_CELLS
+    liczy od razu count_nonzero (tam koszt wywołań przeważa nad zyskiem).
+    Args:
+        cells (np.ndarray): Tablica uint8 (0 i 1)
+    Returns:
+        int: Liczba jedynek
+    """
+    flat = cells.reshape(-1)
+    if len(flat) < LANE_CELLS:
+        return int(np.count_nonzero(flat))
+    n = len(flat) // (255 * 8) * (255 * 8)
+    total = int(np.count_nonzero(flat[n:]))
+    if n:
+        lanes = flat[:n].view(np.uint64).reshape(255, -1).sum(axis=0, dtype=np.uint64)
+        total += int(lanes.view(np.uint8).sum())
+    return total
+
+
+def popcount(words):
+    """Liczy ustawione bity w tablicy słów uint64"""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())  # NumPy < 2.0
+
+
+def word_changes(state, previous, width, y0=0):
+    """Zwraca komórki zmienione między dwiema generacjami planszy bitowej (patrz Engine.changes)
+
+    Słowa są porównywane przez XOR (64 komórki naraz), a rozpakowywane są tylko słowa, w których
+    coś się zmieniło.
+    Args:
+        state, previous (np.ndarray): Słowa uint64 po kroku i przed nim (ten sam kształt)
+        width (int): Szerokość planszy
+        y0 (int): Wiersz planszy, od którego zaczynają się słowa (np. pas planszy)
+    Returns:
+        tuple: (indices, before, after)
+    """
+    diff = np.bitwise_xor(state, previous)
+    ys, ws = np.nonzero(diff)
+    # Bity zmienionych słów po kolei - numer bitu to numer słowa * 64 + pozycja komórki w słowie
+    bits = np.flatnonzero(np.unpackbits(diff[ys, ws].view(np.uint8), bitorder="little").view(bool))
+    after = np.unpackbits(state[ys, ws].view(np.uint8), bitorder="little")[bits]
+    return ((ys + y0) * width + ws * 64)[bits >> 6] + (bits & 63), 1 - after, after
+
+
+def count_alive(cells, rule):
+    """Liczy żywe komórki (stan 1) - dla reguł dwustanowych przez count_ones"""
+    if rule.states == 2:
+        return count_ones(cells)
+    return int(np.count_nonzero(cells == 1))
+
+
+def _scan(lines, start, stop):
+    """Zwraca indeks pierwszego niepustego wiersza lines[start:stop] albo None
+
+    Sprawdzane porcje rosną dwukrotnie, więc krawędź blisko początku kosztuje kilka wierszy,
+    a pusta tablica - najwyżej dwa przejścia.
+    """
+    size = 1
+    while start < stop:
+        block = lines[start:min(start + size, stop)]
+        if block.any():
+            # Pojedynczy wiersz (zwykle krawędź, która się nie przesunęła) nie wymaga szukania w porcji
+            return start if size == 1 else start + int(np.argmax(block.any(axis=1)))
+        start += size
+        size *= 2
+    return None
+
+
+def find_box(cells, hint=None, reach=0):
+    """Zwraca prostokąt niezerowych komórek tablicy
+
+    Krawędzie są szukane od zewnątrz do środka. Z podpowiedzią (prostokąt sprzed kroku, poza którym
+    po poszerzeniu o reach nie ma żadnej komórki) szukanie zaczyna się od jej krawędzi, więc zwykle
+    sprawdzanych jest tylko kilka wierszy i kolumn, a nie cała tablica.
+    Args:
+        cells (np.ndarray): Tablica 2D
+        hint (tuple): Prostokąt (x0, y0, x1, y1) z poprzedniej generacji albo None
+        reach (int): O ile komórek mogły się od tego czasu przesunąć krawędzie
+    Returns:
+        tuple lub None: (x0, y0, x1, y1) albo None dla pustej tablicy
+    """
+    height, width = cells.shape
+    x0, y0, x1, y1 = hint if hint is not None else (0, 0, width, height)
+    x0, y0 = max(0, x0 - reach), max(0, y0 - reach)
+    x1, y1 = min(width, x1 + reach), min(height, y1 + reach)
+
+    rows = cells[y0:y1, x0:x1]
+    top = _scan(rows, 0, len(rows))
+    if top is None:
+        return None
+    bottom = len(rows) - _scan(rows[::-1], 0, len(rows) - top)
+    columns = rows[top:bottom].T
+    left = _scan(columns, 0, len(columns))
+    right = len(columns) - _scan(columns[::-1], 0, len(columns) - left)
+    return x0 + left, y0 + top, x0 + right, y0 + bottom
+
+
+def find_word_box(words):
+    """Zwraca prostokąt żywych komórek planszy zapisanej po 1 bicie w słowach uint64
+
+    Najpierw prostokąt w słowach (find_box), potem dokładne kolumny z bitów skrajnych słów.
+    Args:
+        words (np.ndarray): Słowa planszy (height, words)
+    Returns:
+        tuple lub None: (x0, y0, x1, y1) albo None dla pustej planszy
+    """
+    box = find_box(words)
+    if box is None:
+        return None
+    w0, y0, w1, y1 = box
+    first = np.bitwise_or.reduce(words[y0:y1, w0])
+    last = np.bitwise_or.reduce(words[y0:y1, w1 - 1])
+    low = int(first) & -int(first)
+    return w0 * 64 + low.bit_length() - 1, y0, (w1 - 1) * 64 + int(last).bit_length(), y1
+
+
+# KLASA JĄDRA REGUŁY - bufory jednego kroku dla danej reguły i rozmiaru planszy (albo pasa planszy)
+class RuleKernel:
+    def __init__(self, rule, height, width):
+        """Konstruktor jądra - wszystkie bufory są alokowane raz
+        Args:
+            rule (Rule): Reguła
+            height, width (int): Rozmiar liczonego obszaru
+        """
+        self.rule = rule
+        self.margin = r = rule.radius
+        self.height = height
+
+        # Żywe komórki (stan 1) z martwą ramką o grubości zasięgu reguły
+        self.padded = np.zeros((height + 2 * r, width + 2 * r), dtype=np.uint8)
+        if rule.ranged:
+            self.neighbors = np.zeros((height, width), dtype=np.int32)
+            self.prefix = np.zeros((height + 2 * r, width + 2 * r + 1), dtype=np.int32)
+        else:
+            self.neighbors = np.zeros((height, width), dtype=np.uint8)
+            self.prefix = None
+
+        if rule.is_conway:
+            self.scratch = None
+        elif rule.masks is not None:
+            self.scratch = np.zeros((height, width), dtype=np.uint16)
+        else:
+            self.scratch = np.zeros((height, width), dtype=np.intp)
+
+    def _copy_alive(self, source, target):
+        """Kopiuje do bufora z ramką tylko żywe komórki (umierające nie są liczone jako sąsiedzi)"""
+        if self.rule.states == 2:
+            target[...] = source
+        else:
+            np.equal(source, 1, out=target.view(np.bool_))
+
+    def load(self, state, above=None, below=None, wrap=False):
+        """Wypełnia bufor z ramką
+        Args:
+            state (np.ndarray): Liczony obszar (height, width)
+            above, below (np.ndarray): Do margin wierszy planszy nad i pod obszarem (None - martwe)
+            wrap (bool): Czy zawinąć kolumny (torus) - ramka po lewej to kopia prawej krawędzi i odwrotnie
+        """
+        r, h = self.margin, self.height
+        padded = self.padded
+        self._copy_alive(state, padded[r:r + h, r:-r])
+        padded[:r].fill(0)
+        padded[r + h:].fill(0)
+        if above is not None and len(above):
+            self._copy_alive(above, padded[r - len(above):r, r:-r])
+        if below is not None and len(below):
+            self._copy_alive(below, padded[r + h:r + h + len(below), r:-r])
+        if wrap:
+            width = padded.shape[1] - 2 * r
+            padded[:, :r] = padded[:, width:width + r]
+            padded[:, r + width:] = padded[:, r:2 * r]
+
+    def count(self):
+        """Liczy sąsiadów na podstawie bufora wypełnionego przez load"""
+        if self.prefix is None:
+            return sum_neighbors(self.padded, self.neighbors)
+        return sum_neighbors_range(self.padded, self.neighbors, self.rule, self.prefix)
+
+    def step(self, state, out, above=None, below=None, wrap=False):
+        """Zapisuje do out następną generację obszaru state
+        Args:
+            state (np.ndarray): Aktualny stan obszaru
+            out (np.ndarray): Następny stan obszaru
+            above, below, wrap: Ramka obszaru (patrz load)
+        """
+        self.load(state, above, below, wrap)
+        apply_rule(self.count(), state, out, self.rule, self.scratch)
+
+    def tally(self, state, previous, out=None):
+        """Liczy po kroku żywe komórki i komórki żywe w obu generacjach
+        Args:
+            state (np.ndarray): Obszar po kroku
+            previous (np.ndarray): Ten sam obszar przed krokiem
+            out (np.ndarray): Bufor uint8 na komórki żywe w obu generacjach; może to być previous, jeśli
+                nie jest już potrzebny - operacja w miejscu jest wyraźnie szybsza. None - bufor sąsiadów,
+                który po kroku jest wolny
+        Returns:
+            tuple: (population, survivors)
+        """
+        both = out if out is not None else self.spare(state.shape)
+        if self.rule.states == 2:
+            np.bitwise_and(state, previous, out=both)
+        else:
+            np.logical_and(state == 1, previous == 1, out=both.view(np.bool_))
+        return count_alive(state, self.rule), count_ones(both)
+
+    def spare(self, shape):
+        """Zwraca bufor uint8 o podanym kształcie w pamięci bufora sąsiadów (po kroku jest wolny)"""
+        size = shape[0] * shape[1]
+        return self.neighbors.reshape(-1).view(np.uint8)[:size].reshape(shape)
+
+    def changes(self, state, previous, y0=0):
+        """Zwraca komórki zmienione w kroku (patrz Engine.changes) - maska zmian powstaje w buforze sąsiadów
+        Args:
+            state (np.ndarray): Obszar po kroku
+            previous (np.ndarray): Ten sam obszar przed krokiem
+            y0 (int): Wiersz planszy, od którego zaczyna się obszar (np. pas planszy)
+        Returns:
+            tuple: (indices, before, after)
+        """
+        changed = self.spare(state.shape).view(np.bool_)
+        np.not_equal(state, previous, out=changed)
+        indices = np.flatnonzero(changed)
+        return indices + y0 * state.shape[1], previous.reshape(-1)[indices], state.reshape(-1)[indices]
+
+
+# SILNIK NUMPY - cały stan w jednej tablicy uint8, sąsiedzi liczeni wektorowo
+# Brzeg planszy nie jest sprawdzany przy żadnym sąsiedzie: martwa ramka to zera w buforze z ramką,
+# torus to kopia przeciwległych krawędzi w tej ramce, a płaszczyzna nieograniczona to tablica,
+# która rośnie porcjami GROW_CHUNK komórek, zanim żywe komórki dotkną jej krawędzi.
+class NumpyEngine(Engine):
+    boundaries = ("dead", "torus", "infinite")
+    GROW_CHUNK = 64  # O tyle komórek rośnie tablica płaszczyzny nieograniczonej z jednej strony
+
+    def __init__(self, width, height, rule=None, boundary=None):
+        super().__init__(width, height, rule, boundary)
+        if self.boundary == "torus" and self.rule.radius > min(width, height):
+            raise ValueError("Zasięg reguły większy niż plansza - torus nie ma sensu")
+
+        # Lewy górny róg tablicy stanu na płaszczyźnie (różny od zera tylko dla płaszczyzny nieograniczonej)
+        self.origin_x = 0
+        self.origin_y = 0
+        self._allocate(np.zeros((height, width), dtype=np.uint8))
+
+        # Wyniki census i bounding_box: (numer kroku, wynik) - wynik z poprzedniej generacji
+        # pozwala nie liczyć jeszcze raz populacji sprzed kroku i zawęża szukanie prostokąta
+        self._steps = 0
+        self._counted = None
+        self._box = None
+        self._changes = None  # Zmienione komórki okna z ostatniego kroku (gdy tracking)
+
+    def check_rule(self, rule):
+        if self.boundary == "infinite" and rule.births_from_nothing:
+            raise RuleError("Płaszczyzna nieograniczona nie obsługuje reguł z B0")
+
+    def _allocate(self, state):
+        """Ustawia tablicę stanu i alokuje pod jej rozmiar bufory kroku"""
+        height, width = state.shape
+        self.state = state                                        # Aktualna generacja
+
+        # Bufory alokowane raz (i przy każdym wzroście płaszczyzny) - krok symulacji nie tworzy nowych tablic
+        self._next = np.zeros((height, width), dtype=np.uint8)   # Następna generacja
+        self._kernel = RuleKernel(self.rule, height, width)      # Stan z martwą ramką, sąsiedzi, bufory reguły
+
+    # === PŁASZCZYZNA NIEOGRANICZONA ===
+
+    def _grow(self, left, top, right, bottom):
+        """Powiększa tablicę stanu o podaną liczbę komórek z każdej strony"""
+        height, width = self.state.shape
+        state = np.zeros((height + top + bottom, width + left + right), dtype=np.uint8)
+        state[top:top + height, left:left + width] = self.state
+        previous = self._next
+        self.origin_x -= left
+        self.origin_y -= top
+        self._allocate(state)
+        # Poprzednia generacja też jest przesuwana - census porównuje z nią stan po kroku
+        self._next[top:top + height, left:left + width] = previous
+
+    def _chunks(self, cells):
+        """Zaokrągla brakującą liczbę komórek w górę do wielokrotności GROW_CHUNK"""
+        return -(-cells // self.GROW_CHUNK) * self.GROW_CHUNK if cells > 0 else 0
+
+    def _fit(self, x0, y0, x1, y1):
+        """Powiększa tablicę tak, żeby prostokąt [x0, x1) x [y0, y1) płaszczyzny mieścił się w niej
+        razem z pustym pasem o szerokości zasięgu reguły"""
+        r = self.rule.radius
+        height, width = self.state.shape
+        grow = (self._chunks(self.origin_x - (x0 - r)), self._chunks(self.origin_y - (y0 - r)),
+                self._chunks(x1 + r - (self.origin_x + width)), self._chunks(y1 + r - (self.origin_y + height)))
+        if any(grow):
+            self._grow(*grow)
+
+    def _ensure_margin(self):
+        """Pilnuje, żeby przy krawędziach tablicy był pusty pas szerokości zasięgu reguły
+
+        Dopóki pas jest pusty, żadna komórka poza tablicą nie może ożyć w następnej generacji,
+        więc krok na tablicy z martwą ramką daje wynik identyczny z nieograniczoną płaszczyzną.
+        """
+        r = self.rule.radius
+        state = self.state
+        grow = (self.GROW_CHUNK if state[:, :r].any() else 0, self.GROW_CHUNK if state[:r].any() else 0,
+                self.GROW_CHUNK if state[:, -r:].any() else 0, self.GROW_CHUNK if state[-r:].any() else 0)
+        if any(grow):
+            self._grow(*grow)
+
+    def _reset_plane(self):
+        """Wraca do tablicy o rozmiarze okna (płaszczyzna nieograniczona po wyczyszczeniu)"""
+        self.origin_x = self.origin_y = 0
+        self._allocate(np.zeros((self.height, self.width), dtype=np.uint8))
+
+    # === KROK I DOSTĘP DO STANU ===
+
+    def count_neighbors(self):
+        """Liczy żywych sąsiadów wszystkich komórek naraz
+
+        Stan jest kopiowany do wnętrza tablicy z ramką, a potem
+        sumowane są przesunięte wycinki (sum_neighbors albo sum_neighbors_range).
+        Returns:
+            np.ndarray: Tablica z liczbą sąsiadów (rozmiar tablicy stanu)
+        """
+        self._load()
+        return self._kernel.count()
+
+    def _load(self):
+        """Wypełnia bufor z ramką zgodnie z trybem brzegu"""
+        if self.boundary == "torus":
+            r = self.rule.radius
+            self._kernel.load(self.state, above=self.state[-r:], below=self.state[:r], wrap=True)
+        else:
+            self._kernel.load(self.state)
+
+    def step(self):
+        self._load()
+        apply_rule(self._kernel.count(), self.state, self._next, self.rule, self._kernel.scratch)
+
+        # Zamiana buforów zamiast kopiowania
+        self.state, self._next = self._next, self.state
+        self._steps += 1
+
+        if self.boundary == "infinite":
+            self._ensure_margin()
+
+        self._changes = None
+        if self.counting or self.tracking:
+            self._collect()
+
+    def _collect(self):
+        """Zbiera w kroku zmienione komórki okna (tracking) i liczniki census (counting)
+
+        Po zamianie buforów _next to poprzednia generacja, a bufor sąsiadów jądra jest wolny - w nim
+        powstaje maska zmian. Dla reguł dwustanowych zmiany to narodziny i śmierci, więc liczniki wynikają
+        z nich i z populacji sprzed kroku (znanej z poprzedniego kroku): przy tracking na planszy skończonej
+        wystarczy lista zmian, bez żadnego przejścia po planszy, a bez niej - populacja po kroku i komórki
+        żywe w obu generacjach (RuleKernel.tally w wolnym buforze sąsiadów).
+        """
+        state, previous = self.state, self._next
+        whole = None  # Zmiany całej planszy (na planszy skończonej okno to cała plansza)
+        if self.tracking:
+            x, y = -self.origin_x, -self.origin_y
+            window = (slice(y, y + self.height), slice(x, x + self.width))
+            self._changes = self._kernel.changes(state[window], previous[window])
+            if self.bounded:
+                whole = self._changes
+        if not self.counting:
+            return
+
+        cached = self._counted
+        if cached is not None and cached[0] == self._steps - 1:
+            before = cached[1][0]
+        else:
+            before = count_alive(previous, self.rule)
+        if whole is not None and self.rule.states == 2:
+            flips = len(whole[0])
+            births = int(np.count_nonzero(whole[2]))
+            census = (before + 2 * births - flips, births, flips - births)
+        else:
+            # Komórki żywe w obu generacjach (u Generations umierające zmieniają stan bez narodzin i śmierci)
+            population, survivors = self._kernel.tally(state, previous)
+            census = (population, population - survivors, before - survivors)
+        self._counted = (self._steps, census)
+
+    def _touch(self):
+        """Unieważnia liczniki po ręcznej zmianie planszy"""
+        self._counted = None
+        self._box = None
+        self._changes = None
+
+    def census(self):
+        cached = self._counted
+        return cached[1] if cached is not None and cached[0] == self._steps else None
+
+    def changes(self):
+        return self._changes
+
+    def bounding_box(self):
+        hint, reach = None, 0
+        cached = self._box
+        if cached is not None and cached[0] >= self._steps - 1 and self.boundary != "torus":
+            # Krawędzie przesuwają się najwyżej o zasięg reguły na generację (na torusie wzorzec
+            # może przejść na drugą stronę planszy, więc tam prostokąt jest szukany od zera)
+            if cached[1] is None and not self.rule.births_from_nothing:
+                self._box = (self._steps, None)
+                return None
+            if cached[1] is not None:
+                x0, y0, x1, y1 = cached[1]
+                hint = (x0 - self.origin_x, y0 - self.origin_y, x1 - self.origin_x, y1 - self.origin_y)
+                reach = (self._steps - cached[0]) * self.rule.radius
+
+        box = find_box(self.state, hint, reach)
+        if box is not None:
+            x0, y0, x1, y1 = box
+            box = (x0 + self.origin_x, y0 + self.origin_y, x1 + self.origin_x, y1 + self.origin_y)
+        self._box = (self._steps, box)
+        return box
+
+    def get(self, x, y):
+        return int(self.state[y - self.origin_y, x - self.origin_x])
+
+    def set(self, x, y, alive):
+        if self.boundary == "infinite" and alive:
+            self._fit(x, y, x + 1, y + 1)
+        self.state[y - self.origin_y, x - self.origin_x] = 1 if alive else 0
+        self._touch()
+
+    def set_cells(self, xs, ys):
+        if self.boundary == "infinite" and len(xs):
+            self._fit(int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1)
+        self.state[ys - self.origin_y, xs - self.origin_x] = 1
+        self._touch()
+
+    def to_array(self):
+        # Zwracamy tablicę (albo okno płaszczyzny) bez kopiowania - renderer tylko ją czyta
+        x, y = -self.origin_x, -self.origin_y
+        return self.state[y:y + self.height, x:x + self.width]
+
+    def load_array(self, array):
+        if self.boundary == "infinite":
+            self._reset_plane()
+        # Reguły Generations zachowują stany umierające, pozostałe tylko żywe/martwe
+        self.to_array()[...] = np.asarray(array) if self.rule.states > 2 else np.asarray(array, dtype=bool)
+        if self.boundary == "infinite":
+            self._ensure_margin()
+        self._touch()
+
+    def load_rows(self, chunks):
+        # Porcje trafiają wprost do tablicy stanu - bez drugiej tablicy wielkości planszy
+        if self.boundary == "infinite":
+            self._reset_plane()
+        board = self.to_array()
+        board.fill(0)
+        y = 0
+        for rows in chunks:
+            board[y:y + len(rows)] = rows if self.rule.states > 2 else np.asarray(rows, dtype=bool)
+            y += len(rows)
+        if self.boundary == "infinite":
+            self._ensure_margin()
+        self._touch()
+
+    def clear(self):
+        if self.boundary == "infinite":
+            self._reset_plane()
+        self.state.fill(0)
+        self._touch()
+
+    def population(self):
+        return int(np.count_nonzero(self.state))
+
+
+# SILNIK RZADKI - przechowuje tylko współrzędne żywych komórek
+# Koszt generacji zależy od liczby żywych komórek, a nie od rozmiaru planszy
+class SparseEngine(Engine):
+    # Kodowanie współrzędnych w jednej liczbie int64: klucz = (y + OFFSET) << SHIFT | (x + OFFSET)
+    # Dzięki temu sąsiad (dx, dy) ma klucz = klucz + dy * 2**SHIFT + dx, a sortowanie kluczy
+    # daje kolejność wierszami
+    SHIFT = 32
+    OFFSET = 2 ** 30
+
+    boundaries = ("dead", "torus", "infinite")
+
+    def __init__(self, width, height, rule=None, boundary=None):
+        """Konstruktor silnika rzadkiego
+        Args:
+            width, height (int): Rozmiar planszy
+            rule (str lub Rule): Reguła automatu (tylko dwustanowa, bez B0)
+            boundary (str): "dead" - poza planszą komórki są martwe (jak w silniku referencyjnym),
+                "torus" - plansza zawinięta, "infinite" - plansza nieograniczona,
+                width x height to tylko okno widoczne w to_array
+        """
+        super().__init__(width, height, rule, boundary)
+        self.keys = np.empty(0, dtype=np.int64)  # Posortowane klucze żywych komórek
+        self._census = None  # Liczniki ostatniego kroku (liczone przy okazji kroku)
+        self._changes = None  # Zmienione komórki okna z ostatniego kroku (gdy tracking)
+        self._dense = None  # Pamięć podręczna wyniku to_array (unieważniana przy zmianie)
+
+        # Przesunięcia kluczy dla sąsiadów z sąsiedztwa reguły (zwykle 8)
+        self._offsets = np.array([dy * (1 << self.SHIFT) + dx for dx, dy in self.rule.offsets], dtype=np.int64)
+
+    def check_rule(self, rule):
+        # Przechowujemy tylko zbiór żywych komórek - bez stanów umierających i bez narodzin z niczego
+        if rule.states > 2:
+            raise RuleError("Silnik sparse obsługuje tylko reguły dwustanowe")
+        if rule.births_from_nothing:
+            raise RuleError("Silnik sparse nie obsługuje reguł z B0")
+
+    def encode(self, x, y):
+        """Zamienia współrzędne (liczby lub tablice) na klucze"""
+        return ((np.asarray(y, dtype=np.int64) + self.OFFSET) << self.SHIFT) \
+            | (np.asarray(x, dtype=np.int64) + self.OFFSET)
+
+    def decode(self, keys):
+        """Zamienia klucze z powrotem na tablice współrzędnych (x, y)"""
+        x = (keys & ((1 << self.SHIFT) - 1)) - self.OFFSET
+        y = (keys >> self.SHIFT) - self.OFFSET
+        return x, y
+
+    def _contains(self, keys):
+        """Zwraca maskę - które z podanych kluczy należą do żywych komórek"""
+        if len(self.keys) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        index = np.searchsorted(self.keys, keys)
+        index[index == len(self.keys)] = 0
+        return self.keys[index] == keys
+
+    def get(self, x, y):
+        return int(self._contains(self.encode([x], [y]))[0])
+
+    def set(self, x, y, alive):
+        key = self.encode(x, y)
+        index = np.searchsorted(self.keys, key)
+        present = index < len(self.keys) and self.keys[index] == key
+        if alive and not present:
+            self.keys = np.insert(self.keys, index, key)
+        elif not alive and present:
+            self.keys = np.delete(self.keys, index)
+        self._census = None
+        self._changes = None
+        self._dense = None
+
+    def set_cells(self, xs, ys):
+        self.keys = np.union1d(self.keys, self.encode(xs, ys))
+        self._census = None
+        self._changes = None
+        self._dense = None
+
+    def step(self):
+        if len(self.keys) == 0:
+            self._census = (0, 0, 0)
+            if self.tracking:
+                self._track(self.keys)
+            return
+
+        # Kandydaci: wszyscy sąsiedzi żywych komórek, każde wystąpienie to jeden żywy sąsiad
+        candidates = (self.keys[:, None] + self._offsets[None, :]).ravel()
+        if self.boundary == "torus":
+            # Sąsiedzi za krawędzią to komórki z przeciwnej strony planszy
+            x, y = self.decode(candidates)
+            candidates = self.encode(x % self.width, y % self.height)
+        candidates, counts = np.unique(candidates, return_counts=True)
+        alive = self._contains(candidates)
+
+        # Żywa komórka bez sąsiadów nie jest kandydatem - dołączamy ją tylko, gdy reguła ma S0
+        if self.rule.table[1, 0]:
+            lonely = np.setdiff1d(self.keys, candidates, assume_unique=True)
+            if len(lonely):
+                candidates = np.concatenate((candidates, lonely))
+                counts = np.concatenate((counts, np.zeros(len(lonely), dtype=counts.dtype)))
+                alive = np.concatenate((alive, np.ones(len(lonely), dtype=bool)))
+                order = np.argsort(candidates)
+                candidates, counts, alive = candidates[order], counts[order], alive[order]
+
+        # Następny stan z tablicy przejść reguły
+        living = self.rule.table[alive.astype(np.intp), counts] == 1
+        keys = candidates[living]
+        survivors = int(np.count_nonzero(living & alive))  # Żywe komórki leżą na planszy, więc filtr ramki ich nie usuwa
+
+        if self.boundary == "dead":
+            x, y = self.decode(keys)
+            keys = keys[(x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)]
+
+        self._census = (len(keys), len(keys) - survivors, len(self.keys) - survivors)
+        self._changes = None
+        if self.tracking:
+            self._track(keys)
+        self.keys = keys
+        self._dense = None
+
+    def _track(self, keys):
+        """Zapamiętuje komórki okna, które w kroku ożyły albo umarły - różnica posortowanych zbiorów kluczy"""
+        born = keys[~self._contains(keys)]
+        index = np.searchsorted(keys, self.keys)
+        index[index == len(keys)] = 0
+        died = self.keys[keys[index] != self.keys] if len(keys) else self.keys
+        x, y = self.decode(np.concatenate((born, died)))
+        after = np.repeat(np.array([1, 0], dtype=np.uint8), (len(born), len(died)))
+        visible = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        self._changes = (y[visible] * self.width + x[visible], 1 - after[visible], after[visible])
+
+    def census(self):
+        return self._census
+
+    def changes(self):
+        return self._changes
+
+    def bounding_box(self):
+        if len(self.keys) == 0:
+            return None
+        # Klucze są posortowane wierszami - pierwszy i ostatni wyznaczają górną i dolną krawędź
+        x, y = self.decode(self.keys)
+        return int(x.min()), int(y[0]), int(x.max()) + 1, int(y[-1]) + 1
+
+    def to_array(self):
+        if self._dense is None:
+            dense = np.zeros((self.height, self.width), dtype=np.uint8)
+            x, y = self.decode(self.keys)
+            visible = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+            dense[y[visible], x[visible]] = 1
+            self._dense = dense
+        return self._dense
+
+    def load_array(self, array):
+        # np.nonzero zwraca współrzędne wierszami, więc klucze są od razu posortowane
+        y, x = np.nonzero(np.asarray(array))
+        self.keys = self.encode(x, y)
+        self._census = None
+        self._changes = None
+        self._dense = None
+
+    def clear(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self._census = None
+        self._changes = None
+        self._dense = None
+
+    def population(self):
+        return len(self.keys)
+
+
+# JĄDRO BITOWE - następna generacja wierszy zapisanych po 1 bicie na komórkę w słowach uint64
+# Komórka x wiersza to bit x % 64 słowa x // 64. Sąsiedzi są liczeni na całych słowach
+# (SWAR - 64 komórki w jednej operacji) sumatorami zbudowanymi z operacji bitowych.
+# Jądro nie zna całej planszy - dostaje wiersze z jednym wierszem ramki nad i pod nimi,
+# więc to samo jądro liczy całą planszę (BitPackedEngine) albo jej pasy (MemmapEngine).
+class WordKernel:
+    def __init__(self, rule, width):
+        """Konstruktor jądra
+        Args:
+            rule (Rule): Reguła (dwustanowa, 8 sąsiadów)
+            width (int): Szerokość planszy w komórkach
+        """
+        if rule.states > 2 or rule.ranged:
+            raise RuleError("Reguły na bitach: tylko dwustanowe z 8 sąsiadami (B/S)")
+        self.rule = rule
+        self.width = width
+        self.words = (width + 63) // 64  # Liczba słów na wiersz
+
+        # Maska ostatniego słowa - bity za prawą krawędzią planszy zawsze martwe
+        self.mask = np.full(self.words, np.uint64(0xFFFFFFFFFFFFFFFF), dtype="<u8")
+        if width % 64:
+            self.mask[-1] = np.uint64((1 << (width % 64)) - 1)
+
+        # Liczby sąsiadów, przy których komórka żyje w następnej generacji: (n, martwa ożywa, żywa przeżywa)
+        table = rule.table
+        self.terms = [(n, bool(table[0, n]), bool(table[1, n])) for n in range(9) if table[0, n] or table[1, n]]
+
+    @staticmethod
+    def west(rows):
+        """Zwraca słowa, w których bit x zawiera komórkę x-1 (sąsiad z lewej)"""
+        shifted = rows << np.uint64(1)
+        shifted[:, 1:] |= rows[:, :-1] >> np.uint64(63)
+        return shifted
+
+    @staticmethod
+    def east(rows):
+        """Zwraca słowa, w których bit x zawiera komórkę x+1 (sąsiad z prawej)"""
+        shifted = rows >> np.uint64(1)
+        shifted[:, :-1] |= rows[:, 1:] << np.uint64(63)
+        return shifted
+
+    def step(self, padded, wrap=False):
+        """Liczy następną generację wierszy
+        Args:
+            padded (np.ndarray): Liczone wiersze z jednym wierszem ramki nad i pod nimi (height + 2, words)
+            wrap (bool): Czy zawinąć kolumny (torus) - komórka 0 sąsiaduje z komórką width-1
+        Returns:
+            np.ndarray: Następna generacja liczonych wierszy (height, words) - nowa tablica
+        """
+        state = padded[1:-1]
+        west, east = self.west(padded), self.east(padded)
+        if wrap:
+            # Komórka 0 ma z lewej komórkę width-1, a komórka width-1 z prawej komórkę 0
+            last = np.uint64((self.width - 1) % 64)
+            west[:, 0] |= (padded[:, -1] >> last) & np.uint64(1)
+            east[:, -1] |= (padded[:, 0] & np.uint64(1)) << last
+
+        # Suma trzech komórek w poziomie dla każdego wiersza (liczba 0-3 na dwóch bitach)
+        ones = west ^ padded ^ east
+        twos = (west & padded) | (west & east) | (padded & east)
+
+        # Wiersz środkowy: tylko lewy i prawy sąsiad (bez samej komórki)
+        mid_ones = west[1:-1] ^ east[1:-1]
+        mid_twos = west[1:-1] & east[1:-1]
+        top_ones, top_twos = ones[:-2], twos[:-2]
+        bottom_ones, bottom_twos = ones[2:], twos[2:]
+
+        # Dodawanie trzech liczb 2-bitowych: bit jedności, dwójek i czwórek sumy (modulo 8)
+        s0 = top_ones ^ mid_ones ^ bottom_ones
+        carry = (top_ones & mid_ones) | (top_ones & bottom_ones) | (mid_ones & bottom_ones)
+        x = top_twos ^ mid_twos
+        y = bottom_twos ^ carry
+        s1 = x ^ y
+        s2 = (top_twos & mid_twos) ^ (bottom_twos & carry) ^ (x & y)
+
+        if self.rule.is_conway:
+            # Reguły Conway'a: suma 3, albo suma 2 i komórka żywa
+            # (suma 8 daje modulo 8 zero, więc też poprawnie oznacza śmierć)
+            return s1 & ~s2 & (s0 | state) & self.mask
+
+        # Suma 8 daje modulo 8 zero - rozpoznajemy ją osobno (wszyscy sąsiedzi żywi)
+        eight = top_ones & top_twos & bottom_ones & bottom_twos & mid_twos
+        result = np.zeros_like(state)
+        for n, born, kept in self.terms:
+            if n == 8:
+                equal = eight
+            else:
+                equal = (s0 if n & 1 else ~s0) & (s1 if n & 2 else ~s1) & (s2 if n & 4 else ~s2)
+                if n == 0:
+                    equal &= ~eight
+            if born and kept:
+                result |= equal
+            elif born:
+                result |= equal & ~state
+            else:
+                result |= equal & state
+        return result & self.mask
+
+
+# SILNIK BITOWY - 1 bit na komórkę w 64-bitowych słowach
+# Komórka (x, y) to bit x % 64 słowa state[y, x // 64]; krok liczy WordKernel na całej planszy naraz.
+class BitPackedEngine(Engine):
+    boundaries = ("dead", "torus")
+
+    def __init__(self, width, height, rule=None, boundary=None):
+        super().__init__(width, height, rule, boundary)
+        self.kernel = WordKernel(self.rule, width)
+        self.words = self.kernel.words  # Liczba słów na wiersz
+        self.state = np.zeros((height, self.words), dtype="<u8")
+
+        self._padded = np.zeros((height + 2, self.words), dtype="<u8")  # Wiersze z martwą ramką
+        self._dense = None  # Pamięć podręczna wyniku to_array
+        # Liczniki dla census: (tablica, jej populacja) i wynik dla ostatniego kroku; zmienione komórki
+        self._counted = None
+        self._census = None
+        self._changes = None
+
+    def check_rule(self, rule):
+        # Jeden bit na komórkę i sumatory dla dokładnie 8 sąsiadów
+        if rule.states > 2 or rule.ranged:
+            raise RuleError("Silnik bitpacked obsługuje tylko reguły dwustanowe z 8 sąsiadami (B/S)")
+
+    def step(self):
+        previous = self.state
+        padded = self._padded
+        padded[1:-1] = self.state
+        if self.boundary == "torus":
+            # Wiersze ramki to przeciwległe krawędzie planszy (w trybie dead zostają zerami)
+            padded[0] = self.state[-1]
+            padded[-1] = self.state[0]
+        self.state = self.kernel.step(padded, wrap=self.boundary == "torus")
+        self._census = None
+        self._dense = None
+
+        # Krok tworzy nową tablicę stanu, więc poprzednia generacja jest pod ręką bez kopiowania
+        self._changes = word_changes(self.state, previous, self.width) if self.tracking else None
+        if self.counting:
+            counted = self._counted
+            before = counted[1] if counted is not None and counted[0] is previous else popcount(previous)
+            population = popcount(self.state)
+            # Poprzednia tablica stanu nie jest już potrzebna - AND w miejscu
+            survivors = popcount(np.bitwise_and(previous, self.state, out=previous))
+            self._counted = (self.state, population)  # Populacja tej tablicy przyda się po następnym kroku
+            self._census = (population, population - survivors, before - survivors)
+
+    def _touch(self):
+        """Unieważnia liczniki po ręcznej zmianie planszy"""
+        self._counted = None
+        self._census = None
+        self._changes = None
+
+    def census(self):
+        return self._census
+
+    def changes(self):
+        return self._changes
+
+    def bounding_box(self):
+        return find_word_box(self.state)
+
+    def window(self, x0, y0, x1, y1):
+        if self._dense is not None:
+            return super().window(x0, y0, x1, y1)
+        # Rozpakowanie tylko słów fragmentu
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        words = self.state[y0:y1, x0 >> 6:(x1 + 63) >> 6]
+        bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1, bitorder="little")
+        return bits[:, x0 & 63:(x0 & 63) + x1 - x0]
+
+    def get(self, x, y):
+        return int(self.state[y, x >> 6] >> np.uint64(x & 63)) & 1
+
+    def set(self, x, y, alive):
+        bit = np.uint64(1 << (x & 63))
+        if alive:
+            self.state[y, x >> 6] |= bit
+        else:
+            self.state[y, x >> 6] &= ~bit
+        self._touch()
+        self._dense = None
+
+    def set_cells(self, xs, ys):
+        xs = np.asarray(xs, dtype=np.uint64)
+        bits = np.left_shift(np.uint64(1), xs & np.uint64(63))
+        np.bitwise_or.at(self.state, (np.asarray(ys), (xs >> np.uint64(6)).astype(np.intp)), bits)
+        self._touch()
+        self._dense = None
+
+    def to_array(self):
+        # Rozpakowanie bitów (kolejność little - bit 0 słowa to pierwsza komórka)
+        if self._dense is None:
+            bits = np.unpackbits(self.state.view(np.uint8), axis=1, bitorder="little")
+            self._dense = bits[:, :self.width]
+        return self._dense
+
+    def load_array(self, array):
+        packed = np.packbits(np.asarray(array, dtype=bool), axis=1, bitorder="little")
+        buffer = np.zeros((self.height, self.words * 8), dtype=np.uint8)
+        buffer[:, :packed.shape[1]] = packed
+        self.state = buffer.view("<u8").copy()
+        self._touch()
+        self._dense = None
+
+    def clear(self):
+        self.state.fill(0)
+        self._touch()
+        self._dense = None
+
+    def population(self):
+        return popcount(self.state)
@@ -7,7 +7,21 @@
 # Importowanie niezbędnych bibliotek
 import pygame  # Główna biblioteka do tworzenia gier i grafiki
 import sys     # Do zarządzania systemem (wyjście z programu)
-import random  # Do generowania losowych stanów początkowych
+import argparse    # Do obsługi argumentów wiersza poleceń (tryb bench)
+import time        # Do pomiaru czasu w benchmarku
+import tracemalloc # Do pomiaru szczytowego zużycia pamięci w benchmarku
+import numpy as np  # Tablice przechowujące stan planszy
+
+from engines import BOUNDARIES, BitPackedEngine, NumpyEngine, ReferenceEngine, SparseEngine  # Silniki obliczające kolejne generacje
+from hashlife import HashLifeEngine, LRUCache  # Silnik przeskakujący o wiele generacji naraz (i pamięć LRU)
+from tiled import TiledEngine  # Silnik liczący pasy planszy w wielu procesach
+from memmap import MemmapEngine  # Silnik trzymający planszę w plikach (plansze większe niż pamięć)
+from patterns import load_pattern, save_pattern  # Wczytywanie i zapis wzorców (RLE, .cells, Life 1.06)
+from simulation import SimulationWorker  # Wątek liczący generacje niezależnie od rysowania
+from cycles import CycleDetector  # Wykrywanie martwych natur i oscylatorów po skrócie stanu
+from metrics import EVERY, Metrics  # Populacja, narodziny, śmierci i czas kroku po każdej generacji
+from session import Session, SessionError  # Nagrywanie zdarzeń i klatek stanu do odtworzenia sesji
+from rules import RuleError, parse_rule  # Reguły automatu (B/S, Generations, Larger than Life)
 
 # STAŁE GRY - wartości konfiguracyjne
 WINDOW_WIDTH = 800      # Szerokość okna w pikselach
@@ -20,142 +34,326 @@ GRID_HEIGHT = WINDOW_HEIGHT // CELL_SIZE # Liczba komórek w pionie
 BLACK = (0, 0, 0)       # Kolor tła i martwych komórek
 WHITE = (255, 255, 255) # Kolor żywych komórek
 GRAY = (128, 128, 128)  # Kolor siatki
+DARK_GRAY = (80, 80, 80)  # Kolor komórek umierających (reguły Generations)
+
+# Liczba klatek na sekundę w trybie z wątkiem symulacji (rysowanie nie zależy od tempa symulacji)
+RENDER_FPS = 60
+
+# Wykres populacji (sparkline) pod napisami interfejsu
+SPARKLINE_RECT = (10, 90, 200, 40)  # x, y, szerokość, wysokość w pikselach
+
+# Rozmiary czcionek i liczba zapamiętanych powierzchni napisów
+FONT_SIZE = 36          # Napisy stanu gry
+SMALL_FONT_SIZE = 24    # Instrukcje i podpisy
+TEXT_CACHE_SIZE = 256
+
+# Liczba komórek losowanych naraz w Grid.randomize (porcja float64 to 2 MB)
+RANDOM_CHUNK = 256 * 1024
+
+
+# REJESTR SILNIKÓW - nazwa silnika -> klasa
+ENGINES = {
+    "numpy": NumpyEngine,
+    "reference": ReferenceEngine,
+    "sparse": SparseEngine,
+    "hashlife": HashLifeEngine,
+    "tiled": TiledEngine,
+    "bitpacked": BitPackedEngine,
+    "memmap": MemmapEngine,
+}
 
 
-# KLASA KOMÓRKI - reprezentuje pojedynczą komórkę w siatce
-class Cell:
-    def __init__(self, x, y, alive=False):
-        """Konstruktor komórki
+def create_engine(name, width, height, **options):
+    """Tworzy silnik o podanej nazwie
+    Args:
+        name (str): Nazwa silnika z rejestru ENGINES
+        width, height (int): Rozmiar planszy
+        **options: Dodatkowe argumenty konstruktora silnika
+    Returns:
+        Engine: Nowy silnik z pustą planszą
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Nieznany silnik: {name} (dostępne: {', '.join(ENGINES)})")
+    return ENGINES[name](width, height, **options)
+
+
+# KLASA WIDOKU KOMÓRKI - lekki obiekt udostępniający jedną komórkę silnika
+# Stan nie jest przechowywany w obiekcie - odczyt i zapis trafiają prosto do silnika
+class CellView:
+    def __init__(self, grid, x, y):
+        """Konstruktor widoku komórki
         Args:
+            grid (Grid): Siatka, do której należy komórka
             x (int): Pozycja w siatce (kolumna)
             y (int): Pozycja w siatce (rząd)
-            alive (bool): Czy komórka jest żywa na początku
         """
-        self.x = x                    # Pozycja X w siatce
-        self.y = y                    # Pozycja Y w siatce
-        self.alive = alive            # Aktualny stan (żywa/martwa)
-        self.next_state = alive       # Stan w następnej generacji
-        
-    def set_next_state(self, next_alive):
-        """Ustawia stan komórki w następnej generacji
-        Args:
-            next_alive (bool): Czy komórka będzie żywa w następnej generacji
-        """
-        self.next_state = next_alive
-        
-    def update(self):
-        """Aktualizuje stan komórki do następnej generacji"""
-        self.alive = self.next_state
-        
+        self.grid = grid
+        self.x = x
+        self.y = y
+
+    @property
+    def alive(self):
+        """Czy komórka jest żywa"""
+        return bool(self.grid.engine.get(self.x, self.y))
+
+    @alive.setter
+    def alive(self, value):
+        self.grid.engine.set(self.x, self.y, value)
+        self.grid._edited("set", x=self.x, y=self.y, value=int(bool(value)))
+
     def toggle(self):
         """Przełącza stan komórki (żywa <-> martwa)"""
         self.alive = not self.alive
-        self.next_state = self.alive
 
 
-# KLASA SIATKI - zarządza wszystkimi komórkami i regułami gry
+# KLASA SIATKI - zarządza planszą i licznikiem generacji, obliczenia deleguje do silnika
 class Grid:
-    def __init__(self, width, height):
+    def __init__(self, width, height, engine="numpy", detect_cycles=False, metrics=False, record=False,
+                 **engine_options):
         """Konstruktor siatki
         Args:
             width (int): Szerokość siatki (liczba komórek)
             height (int): Wysokość siatki (liczba komórek)
+            engine (str): Nazwa silnika obliczeń (patrz ENGINES)
+            detect_cycles (bool): Czy po każdej generacji szukać cyklu (patrz CycleDetector)
+            metrics (bool, int lub Metrics): Czy zbierać metryki generacji (patrz Metrics); liczba to pojemność
+                bufora próbek, a obiekt Metrics - gotowe metryki (np. z innym odstępem próbek)
+            record (bool): Czy nagrywać sesję do odtworzenia (patrz Session) - tylko plansze skończone
+            **engine_options: Dodatkowe argumenty konstruktora silnika (np. rule="B36/S23", boundary="torus")
         """
         self.width = width
         self.height = height
-        self.generation = 0           # Numer aktualnej generacji
-        
-        # Tworzenie dwuwymiarowej listy komórek
-        self.cells = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                # Każda komórka zaczyna jako martwa
-                cell = Cell(x, y, False)
-                row.append(cell)
-            self.cells.append(row)
-    
+        self.edits = 0                # Licznik ręcznych zmian planszy (kliknięcia, losowanie, wzorce)
+
+        # Silnik przechowuje stan planszy i liczy kolejne generacje
+        self.engine = create_engine(engine, width, height, **engine_options)
+        # Numer aktualnej generacji (silnik wznawiający przerwane obliczenia zaczyna od zapisanej)
+        self.generation = self.engine.start_generation
+
+        # Generator liczb losowych do randomize
+        self.rng = np.random.default_rng()
+
+        # Skrót stanu i historia generacji do wykrywania cykli (zmienione komórki podaje krok silnika)
+        self.cycles = CycleDetector(width, height) if detect_cycles else None
+
+        # Metryki generacji (silnik zbiera liczniki przy okazji kroku, przed którym wypada próbka)
+        self.metrics = None
+        if isinstance(metrics, Metrics):
+            self.metrics = metrics
+        elif metrics:
+            self.metrics = Metrics() if metrics is True else Metrics(metrics)
+
+        # Nagranie sesji: ziarno generatora, zdarzenia i klatki stanu
+        self.session = None
+        if record:
+            if not self.engine.bounded:
+                raise ValueError("Nagrywać można tylko planszę skończoną (brzeg dead albo torus)")
+            self.session = Session(width, height, engine, self.rule, self.engine.boundary)
+            self.rng = np.random.default_rng(self.session.seed)
+            self.session.capture(self.state, self.generation)
+
+    @classmethod
+    def from_session(cls, session, tick=None, engine=None, **options):
+        """Odtwarza siatkę z nagranej sesji w podanej chwili
+
+        Stan pochodzi z najbliższej wcześniejszej klatki (klatka kluczowa i różnice XOR po niej),
+        a generacje, których nie ma w klatkach (np. środek Grid.advance(n)), są liczone silnikiem.
+        Args:
+            session (Session): Nagrana sesja
+            tick (int): Chwila sesji - liczba generacji od początku nagrania (None - koniec nagrania)
+            engine (str): Silnik odtworzonej siatki (domyślnie ten z nagrania)
+            **options: Dodatkowe argumenty konstruktora siatki (np. detect_cycles=True)
+        Returns:
+            Grid: Siatka w stanie z chwili tick
+        """
+        grid = cls(session.width, session.height, engine or session.engine, rule=session.rule,
+                   boundary=session.boundary, **options)
+        state, frame_tick, generation = session.seek(tick)
+        grid.engine.load_array(state)
+        grid.generation = generation
+        grid.edits += 1
+        if tick is not None and tick > frame_tick:
+            grid.advance(tick - frame_tick)
+        return grid
+
+    @classmethod
+    def rerun(cls, session, engine=None):
+        """Powtarza nagraną sesję od początku: to samo ziarno, te same zdarzenia i kroki
+
+        Wynik nie korzysta z klatek, więc pozwala sprawdzić, że nagranie jest deterministyczne
+        (ostatni stan powinien być równy session.seek()).
+        Args:
+            session (Session): Nagrana sesja
+            engine (str): Silnik (domyślnie ten z nagrania)
+        Returns:
+            Grid: Siatka po ostatnim zdarzeniu sesji
+        """
+        grid = cls(session.width, session.height, engine or session.engine, rule=session.rule,
+                   boundary=session.boundary)
+        grid.rng = np.random.default_rng(session.seed)
+        for event in session.events:
+            kind = event["kind"]
+            if kind == "advance":
+                grid.advance(event["n"])
+            elif kind == "set":
+                grid.get_cell(event["x"], event["y"]).alive = event["value"]
+            elif kind == "cells":
+                grid.set_cells(event["xs"], event["ys"])
+            elif kind == "randomize":
+                grid.randomize(event["probability"], event["seed"])
+            elif kind == "clear":
+                grid.clear()
+            else:
+                raise SessionError(f"Nieznane zdarzenie sesji: {kind}")
+        return grid
+
+    @property
+    def cycle(self):
+        """Wykryty cykl (Cycle z polami start i period) albo None
+
+        Po ręcznej zmianie planszy stary cykl przestaje obowiązywać - detektor zacznie od nowa przy następnej generacji.
+        """
+        if self.cycles is None or self.cycles.edits != self.edits:
+            return None
+        return self.cycles.cycle
+
+    @property
+    def state(self):
+        """Stan planszy jako tablica uint8 (height, width) - 1 oznacza żywą komórkę"""
+        return self.engine.to_array()
+
+    @property
+    def rule(self):
+        """Reguła automatu (obiekt Rule z rules.py)"""
+        return self.engine.rule
+
+    def window(self, x0, y0, x1, y1):
+        """Zwraca fragment stanu planszy [y0:y1, x0:x1] - np. widoczny na ekranie (patrz Engine.window)"""
+        return self.engine.window(x0, y0, x1, y1)
+
     def get_cell(self, x, y):
         """Pobiera komórkę na danej pozycji
         Args:
             x, y (int): Współrzędne komórki
         Returns:
-            Cell lub None: Komórka lub None jeśli poza siatką
+            CellView lub None: Widok komórki lub None jeśli poza siatką
         """
         # Sprawdź czy współrzędne są w granicach siatki
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.cells[y][x]
+            return CellView(self, x, y)
         return None
-    
+
+    def set_cells(self, xs, ys):
+        """Ustawia wiele komórek naraz jako żywe
+        Na planszy z martwą ramką komórki spoza siatki są pomijane, na torusie są zawijane.
+        Args:
+            xs, ys (np.ndarray): Tablice współrzędnych
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if self.engine.boundary == "torus":
+            xs, ys = xs % self.width, ys % self.height
+        elif self.engine.bounded:
+            inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+            xs, ys = xs[inside], ys[inside]
+        self.engine.set_cells(xs, ys)
+        self._edited("cells", xs=xs.tolist(), ys=ys.tolist())
+
+    def _edited(self, kind, **data):
+        """Odnotowuje ręczną zmianę planszy (licznik edits i nagranie sesji)
+        Args:
+            kind (str): Rodzaj zmiany zapisywany w sesji
+            **data: Dane potrzebne do powtórzenia zmiany
+        """
+        self.edits += 1
+        if self.session is not None:
+            self.session.log(kind, self.generation, **data)
+            self.session.capture(self.state, self.generation)
+
     def count_neighbors(self, x, y):
-        """Liczy żywych sąsiadów komórki
+        """Liczy żywych sąsiadów komórki w sąsiedztwie reguły
         Args:
             x, y (int): Współrzędne komórki
         Returns:
-            int: Liczba żywych sąsiadów (0-8)
+            int: Liczba żywych sąsiadów (0-8 dla zwykłych reguł)
         """
+        state = self.state
         count = 0
-        
-        # Sprawdź wszystkie 8 kierunków wokół komórki
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                # Pomiń samą komórkę (dx=0, dy=0)
-                if dx == 0 and dy == 0:
-                    continue
-                
-                # Oblicz pozycję sąsiada
-                neighbor_x = x + dx
-                neighbor_y = y + dy
-                
-                # Pobierz sąsiada
-                neighbor = self.get_cell(neighbor_x, neighbor_y)
-                
-                # Jeśli sąsiad istnieje i jest żywy, zwiększ licznik
-                if neighbor and neighbor.alive:
-                    count += 1
-        
+        for dx, dy in self.rule.offsets:
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height and state[y + dy, x + dx] == 1:
+                count += 1
         return count
-    
-    def calculate_next_generation(self):
-        """Oblicza następną generację według reguł Conway'a
-        
-        Reguły Game of Life:
-        1. Żywa komórka z 2-3 sąsiadami pozostaje żywa
-        2. Martwa komórka z dokładnie 3 sąsiadami staje się żywa
-        3. W pozostałych przypadkach komórka umiera lub pozostaje martwa
+
+    def close(self):
+        """Zwalnia zasoby silnika (np. procesy silnika tiled)"""
+        self.engine.close()
+
+    def changed_cells(self, previous):
+        """Zwraca współrzędne komórek zmienionych względem migawki stanu
+        Args:
+            previous (np.ndarray): Wcześniejsza kopia grid.state
+        Returns:
+            tuple: Tablice (xs, ys) zmienionych komórek
         """
-        # Przejdź przez wszystkie komórki
-        for y in range(self.height):
-            for x in range(self.width):
-                cell = self.cells[y][x]
-                neighbors = self.count_neighbors(x, y)
-                
-                # Zastosuj reguły Conway'a
-                if cell.alive:
-                    # Komórka żywa
-                    if neighbors == 2 or neighbors == 3:
-                        cell.set_next_state(True)   # Pozostaje żywa
-                    else:
-                        cell.set_next_state(False)  # Umiera (za mało lub za dużo sąsiadów)
-                else:
-                    # Komórka martwa
-                    if neighbors == 3:
-                        cell.set_next_state(True)   # Narodziny
-                    else:
-                        cell.set_next_state(False)  # Pozostaje martwa
-    
+        return self.engine.changed_cells(previous)
+
     def update(self):
         """Aktualizuje siatkę do następnej generacji"""
-        self.calculate_next_generation()
-        
-        # Zaktualizuj wszystkie komórki
-        for y in range(self.height):
-            for x in range(self.width):
-                self.cells[y][x].update()
-        
+        self._sync_cycles()
+        if self.metrics is not None:
+            self.engine.counting = self.metrics.due(self.generation + 1)
+        self.engine.tracking = self.cycles is not None
+        start = time.perf_counter()
+        self.engine.step()
+        step_time = time.perf_counter() - start
+
         # Zwiększ numer generacji
         self.generation += 1
-    
+
+        if self.metrics is not None:
+            self.metrics.observe(self, step_time)
+        if self.cycles is not None:
+            self.cycles.observe(self)
+        if self.session is not None:
+            self.session.advance(1)
+            self.session.capture(self.state, self.generation)
+
+    def _sync_cycles(self):
+        """Po ręcznej zmianie planszy zaczyna historię detektora od aktualnego stanu"""
+        if self.cycles is not None and self.cycles.edits != self.edits:
+            self.cycles.reset(self)
+
+    def advance(self, generations):
+        """Przesuwa siatkę o wiele generacji naraz
+
+        Silnik hashlife przeskakuje od razu o 2^k generacji, pozostałe silniki liczą krok po kroku.
+        Jeśli wykryto już cykl, liczone jest tylko generations % okres kroków - reszta to pełne okresy,
+        po których plansza wraca do tego samego stanu. Dotyczy to tylko plansz skończonych: na nieograniczonej
+        płaszczyźnie detektor widzi jedynie okno width x height (np. szybowiec może z niego wylecieć).
+        Args:
+            generations (int): Liczba generacji
+        """
+        self._sync_cycles()
+        start = time.perf_counter()
+        cycle = self.cycle
+        if self.metrics is not None:
+            self.engine.counting = False  # Po przeskoku narodziny i śmierci i tak są nieznane
+        self.engine.tracking = False      # Po przeskoku detektor i tak liczy skrót od zera
+        if cycle is not None and self.engine.bounded:
+            self.engine.advance(generations % cycle.period)
+        else:
+            self.engine.advance(generations)
+        step_time = time.perf_counter() - start
+        self.generation += generations
+
+        if self.metrics is not None:
+            self.metrics.observe(self, step_time, generations)
+        if self.cycles is not None:
+            self.cycles.observe(self)
+        if self.session is not None:
+            self.session.advance(generations)
+            self.session.capture(self.state, self.generation)
+
     def toggle_cell(self, x, y):
         """Przełącza stan komórki na danej pozycji
         Args:
@@ -164,80 +362,208 @@ class Grid:
         cell = self.get_cell(x, y)
         if cell:
             cell.toggle()
-    
-    def randomize(self, probability=0.3):
+
+    def randomize(self, probability=0.3, seed=None):
         """Losowo ustawia stan komórek
         Args:
             probability (float): Prawdopodobieństwo że komórka będzie żywa (0.0-1.0)
+            seed (int): Ziarno generatora - ten sam seed daje zawsze tę samą planszę
         """
-        for y in range(self.height):
-            for x in range(self.width):
-                # Losowo decyduj czy komórka ma być żywa
-                self.cells[y][x].alive = random.random() < probability
-                self.cells[y][x].next_state = self.cells[y][x].alive
-        
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+        # Plansza losowana porcjami wierszy - liczby losowe te same co przy jednym losowaniu całej planszy,
+        # ale bez tymczasowej tablicy float64 wielkości planszy (8 bajtów na komórkę); silnik dostaje porcje
+        # po kolei, więc memmap zapisuje je od razu do pliku i nic wielkości planszy nie trafia do pamięci
+        rows = max(1, RANDOM_CHUNK // max(1, self.width))
+        self.engine.load_rows(self.rng.random((min(rows, self.height - y), self.width)) < probability
+                              for y in range(0, self.height, rows))
+
         # Zresetuj licznik generacji
         self.generation = 0
-    
+        self._edited("randomize", probability=probability, seed=seed)
+
     def clear(self):
         """Czyści siatkę (wszystkie komórki stają się martwe)"""
-        for y in range(self.height):
-            for x in range(self.width):
-                self.cells[y][x].alive = False
-                self.cells[y][x].next_state = False
-        
+        self.engine.clear()
         self.generation = 0
+        self._edited("clear")
+
+
+# KLASA PAMIĘCI NAPISÓW - gotowe powierzchnie tekstu
+# Utworzenie czcionki to odczyt i parsowanie pliku, a renderowanie napisu - rasteryzacja glifów,
+# więc czcionki są tworzone raz, a napisy renderowane tylko przy pierwszym użyciu danego tekstu
+class TextCache:
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        """Konstruktor pamięci napisów
+        Args:
+            maxsize (int): Maksymalna liczba zapamiętanych powierzchni (najdawniej użyte są usuwane)
+        """
+        self.fonts = {}                     # (plik czcionki, rozmiar) -> pygame.font.Font
+        self.surfaces = LRUCache(maxsize)   # (plik czcionki, rozmiar, tekst, kolor) -> powierzchnia
+
+    def font(self, size, name=None):
+        """Zwraca czcionkę o podanym rozmiarze (tworzoną tylko za pierwszym razem)
+        Args:
+            size (int): Rozmiar czcionki
+            name (str): Plik czcionki (None - domyślna czcionka Pygame)
+        """
+        font = self.fonts.get((name, size))
+        if font is None:
+            font = self.fonts[(name, size)] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size=FONT_SIZE, color=WHITE, name=None):
+        """Zwraca powierzchnię z napisem - z pamięci albo renderowaną i zapamiętywaną
+        Args:
+            text (str): Treść napisu
+            size (int): Rozmiar czcionki
+            color (tuple): Kolor RGB
+            name (str): Plik czcionki (None - domyślna)
+        Returns:
+            pygame.Surface: Napis (nie należy go modyfikować - jest współdzielony)
+        """
+        key = (name, size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(size, name).render(text, True, color)
+            self.surfaces.put(key, surface)
+        return surface
 
 
 # KLASA RENDERERA - odpowiedzialna za rysowanie na ekranie
 class Renderer:
-    def __init__(self, screen, cell_size):
+    # Powyżej tej części zmienionych komórek taniej jest przerysować całą planszę
+    FULL_REDRAW_RATIO = 0.25
+
+    def __init__(self, screen, cell_size, incremental=True):
         """Konstruktor renderera
         Args:
             screen: Powierzchnia Pygame do rysowania
             cell_size (int): Rozmiar komórki w pikselach
+            incremental (bool): Czy przerysowywać tylko zmienione komórki (brudne prostokąty)
         """
         self.screen = screen
         self.cell_size = cell_size
-        self.font = pygame.font.Font(None, 36)  # Czcionka do tekstu
-    
+        self.incremental = incremental
+        self.text = TextCache()  # Czcionki i gotowe napisy
+
+        self.background = None  # Tło z liniami siatki, rysowane raz
+        self._drawn = None      # Kopia stanu planszy z ostatnio narysowanej klatki
+        self._ui_rects = []     # Obszary zasłonięte przez napisy w poprzedniej klatce
+
+    def _build_background(self, grid):
+        """Rysuje raz tło z ramkami wszystkich komórek
+        Args:
+            grid (Grid): Siatka, dla której powstaje tło
+        """
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(BLACK)
+        for y in range(grid.height):
+            for x in range(grid.width):
+                pygame.draw.rect(self.background, GRAY,
+                                 (x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size), 1)
+
+    def screen_to_cell(self, pos):
+        """Zamienia pozycję na ekranie na współrzędne komórki
+        Args:
+            pos (tuple): Pozycja (x, y) w pikselach
+        Returns:
+            tuple: Współrzędne komórki (x, y)
+        """
+        return pos[0] // self.cell_size, pos[1] // self.cell_size
+
+    def _cell_rect(self, x, y):
+        """Zwraca prostokąt komórki na ekranie"""
+        return pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+
+    def _fill_cell(self, x, y, value=1):
+        """Wypełnia wnętrze żywej (albo umierającej, value > 1) komórki - ramka zostaje z tła"""
+        self.screen.fill(WHITE if value == 1 else DARK_GRAY,
+                         (x * self.cell_size + 1, y * self.cell_size + 1, self.cell_size - 2, self.cell_size - 2))
+
+    def _redraw_area(self, rect, state):
+        """Odtwarza fragment ekranu: tło i żywe komórki leżące w prostokącie
+        Args:
+            rect (pygame.Rect): Obszar ekranu do odtworzenia
+            state (np.ndarray): Aktualny stan planszy
+        """
+        self.screen.blit(self.background, rect, rect)
+        x0, y0 = rect.left // self.cell_size, rect.top // self.cell_size
+        x1, y1 = rect.right // self.cell_size + 1, rect.bottom // self.cell_size + 1
+        ys, xs = np.nonzero(state[y0:y1, x0:x1])
+        for x, y in zip(xs + x0, ys + y0):
+            self._fill_cell(x, y, state[y, x])
+
     def draw_grid(self, grid):
         """Rysuje siatkę komórek
         Args:
             grid (Grid): Siatka do narysowania
+        Returns:
+            list: Prostokąty ekranu, które się zmieniły
         """
-        # Wyczyść ekran
-        self.screen.fill(BLACK)
-        
-        # Rysuj wszystkie komórki
-        for y in range(grid.height):
-            for x in range(grid.width):
-                cell = grid.cells[y][x]
-                
-                # Oblicz pozycję komórki na ekranie
-                rect_x = x * self.cell_size
-                rect_y = y * self.cell_size
-                
-                # Wybierz kolor na podstawie stanu komórki
-                color = WHITE if cell.alive else BLACK
-                
-                # Narysuj komórkę
-                pygame.draw.rect(self.screen, color, 
-                               (rect_x, rect_y, self.cell_size, self.cell_size))
-                
-                # Narysuj ramkę komórki (opcjonalnie)
-                pygame.draw.rect(self.screen, GRAY, 
-                               (rect_x, rect_y, self.cell_size, self.cell_size), 1)
-    
-    def draw_ui(self, grid, paused):
+        # Stan planszy jako tablica (bez kopiowania)
+        state = grid.state
+
+        if self.background is None:
+            self._build_background(grid)
+
+        # Pełne przerysowanie: pierwsza klatka, tryb bez śledzenia zmian albo bardzo dużo zmian
+        if self._drawn is None or self._drawn.shape != state.shape:
+            xs = None
+        elif self.incremental:
+            xs, ys = grid.changed_cells(self._drawn)
+            if len(xs) > self.FULL_REDRAW_RATIO * state.size:
+                xs = None
+        else:
+            xs = None
+
+        if xs is None:
+            self.screen.blit(self.background, (0, 0))
+            ys, xs = np.nonzero(state)
+            for x, y in zip(xs, ys):
+                self._fill_cell(x, y, state[y, x])
+            dirty = [self.screen.get_rect()]
+        else:
+            # Przerysuj tylko zmienione komórki
+            dirty = []
+            for x, y in zip(xs, ys):
+                rect = self._cell_rect(x, y)
+                self.screen.blit(self.background, rect, rect)
+                if state[y, x]:
+                    self._fill_cell(x, y, state[y, x])
+                dirty.append(rect)
+
+            # Odtwórz miejsca, gdzie w poprzedniej klatce były napisy
+            for rect in self._ui_rects:
+                self._redraw_area(rect, state)
+                dirty.append(rect)
+
+        # Zapamiętaj narysowany stan (kopia - silnik może nadpisać swój bufor)
+        if self._drawn is None or self._drawn.shape != state.shape:
+            self._drawn = state.copy()
+        else:
+            self._drawn[...] = state
+
+        return dirty
+
+    def draw_ui(self, grid, paused, cycle=None, population=None):
         """Rysuje interfejs użytkownika
         Args:
             grid (Grid): Siatka (do pobrania informacji o generacji)
             paused (bool): Czy symulacja jest wstrzymana
+            cycle (Cycle): Wykryty cykl planszy (None - brak)
+            population (np.ndarray): Populacje ostatnich generacji - rysowany jest ich wykres (None - bez wykresu)
+        Returns:
+            list: Prostokąty ekranu zajęte przez napisy
         """
         # Informacje o stanie gry
-        generation_text = self.font.render(f"Generation: {grid.generation}", True, WHITE)
-        status_text = self.font.render("PAUSED" if paused else "RUNNING", True, WHITE)
+        # (napis jest renderowany ponownie tylko wtedy, gdy zmieni się jego treść)
+        generation_text = self.text.render(f"Generation: {grid.generation}")
+        status = "PAUSED" if paused else "RUNNING"
+        if cycle is not None:
+            status += f" - CYCLE p={cycle.period} @ {cycle.start}"
+        status_text = self.text.render(status)
         
         # Instrukcje
         instructions = [
@@ -247,20 +573,206 @@ class Renderer:
             "Click - Toggle cell"
         ]
         
-        # Rysuj teksty
-        self.screen.blit(generation_text, (10, 10))
-        self.screen.blit(status_text, (10, 50))
+        # Rysuj teksty (blit zwraca zajęty prostokąt)
+        rects = [self.screen.blit(generation_text, (10, 10)),
+                 self.screen.blit(status_text, (10, 50))]
         
         # Rysuj instrukcje
         for i, instruction in enumerate(instructions):
-            text = pygame.font.Font(None, 24).render(instruction, True, WHITE)
-            self.screen.blit(text, (10, WINDOW_HEIGHT - 100 + i * 20))
+            text = self.text.render(instruction, SMALL_FONT_SIZE)
+            rects.append(self.screen.blit(text, (10, WINDOW_HEIGHT - 100 + i * 20)))
+
+        # Wykres populacji z ostatnich próbek metryk
+        if population is not None and len(population) > 1:
+            rects.append(self.draw_sparkline(population))
+
+        # Te obszary trzeba odtworzyć w następnej klatce
+        self._ui_rects = rects
+        return rects
+
+    def draw_sparkline(self, values, rect=SPARKLINE_RECT):
+        """Rysuje mały wykres liniowy (jeden piksel w poziomie na wartość) z podpisem ostatniej wartości
+        Args:
+            values (np.ndarray): Wartości od najstarszej do najnowszej
+            rect (tuple): Obszar wykresu (x, y, szerokość, wysokość)
+        Returns:
+            pygame.Rect: Zajęty prostokąt ekranu
+        """
+        x, y, width, height = rect
+        values = np.asarray(values, dtype=np.float64)[-width:]
+        low, high = values.min(), values.max()
+        scale = (height - 1) / (high - low) if high > low else 0.0
+        xs = x + np.arange(len(values))
+        ys = y + height - 1 - (values - low) * scale
+        pygame.draw.lines(self.screen, WHITE, False, np.column_stack((xs, ys)).tolist())
+
+        label = self.text.render(f"Population: {int(values[-1])}", SMALL_FONT_SIZE)
+        label_rect = self.screen.blit(label, (x, y + height + 4))
+        return pygame.Rect(x, y, width, height).union(label_rect)
+
+    def draw_stats(self, lines):
+        """Rysuje w prawym górnym rogu dodatkowe informacje (np. FPS i generacje/s)
+        Args:
+            lines (list): Lista napisów do wyświetlenia
+        Returns:
+            list: Prostokąty ekranu zajęte przez napisy
+        """
+        rects = []
+        for i, line in enumerate(lines):
+            text = self.text.render(line)
+            rects.append(self.screen.blit(text, (self.screen.get_width() - text.get_width() - 10, 10 + i * 40)))
+
+        # Dołącz do obszarów odtwarzanych w następnej klatce
+        self._ui_rects = self._ui_rects + rects
+        return rects
+
+
+# KLASA RENDERERA HURTOWEGO - cała plansza jako jeden obraz 8-bitowy
+# Przeznaczona dla dużych plansz, na których rysowanie komórka po komórce jest za wolne
+class SurfarrayRenderer(Renderer):
+    def __init__(self, screen, cell_size=1):
+        """Konstruktor renderera hurtowego
+        Args:
+            screen: Powierzchnia Pygame do rysowania
+            cell_size (int): Początkowa liczba pikseli na komórkę
+        """
+        super().__init__(screen, cell_size, incremental=False)
+        self.pixels_per_cell = max(1, cell_size)  # Powiększenie (piksele na komórkę)
+        self.cells_per_pixel = 1                  # Pomniejszenie (komórki na piksel)
+        self.view_x = 0                           # Lewa górna komórka widoku
+        self.view_y = 0
+
+        # Paleta obrazu 8-bitowego: wartość w tablicy stanu -> kolor piksela (2.. - komórki umierające)
+        self.palette = [BLACK, WHITE] + [DARK_GRAY] * 254
+
+        # Bufory używane między klatkami
+        self._rows = None    # Wiersze po złączeniu pionowym przy pomniejszeniu
+        self._pooled = None  # Wynik pomniejszenia
+        self._scaled = None  # Obraz po powiększeniu
+
+    def fit(self, grid):
+        """Dobiera powiększenie tak, żeby cała plansza zmieściła się na ekranie
+        Args:
+            grid (Grid): Rysowana siatka
+        """
+        screen_w, screen_h = self.screen.get_size()
+        self.view_x = self.view_y = 0
+        if grid.width <= screen_w and grid.height <= screen_h:
+            self.cells_per_pixel = 1
+            self.pixels_per_cell = max(1, min(screen_w // grid.width, screen_h // grid.height))
+        else:
+            self.pixels_per_cell = 1
+            self.cells_per_pixel = max(-(-grid.width // screen_w), -(-grid.height // screen_h))
+
+    def zoom_in(self):
+        """Przybliża widok dwukrotnie"""
+        if self.cells_per_pixel > 1:
+            self.cells_per_pixel = max(1, self.cells_per_pixel // 2)
+        else:
+            self.pixels_per_cell = min(64, self.pixels_per_cell * 2)
+
+    def zoom_out(self):
+        """Oddala widok dwukrotnie"""
+        if self.pixels_per_cell > 1:
+            self.pixels_per_cell //= 2
+        else:
+            self.cells_per_pixel = min(1024, self.cells_per_pixel * 2)
+
+    def pan(self, dx, dy):
+        """Przesuwa widok o podaną liczbę ekranów (np. 0.25 to ćwierć ekranu)"""
+        screen_w, screen_h = self.screen.get_size()
+        self.view_x = max(0, self.view_x + int(dx * screen_w * self.cells_per_pixel / self.pixels_per_cell))
+        self.view_y = max(0, self.view_y + int(dy * screen_h * self.cells_per_pixel / self.pixels_per_cell))
+
+    def screen_to_cell(self, pos):
+        return (self.view_x + pos[0] * self.cells_per_pixel // self.pixels_per_cell,
+                self.view_y + pos[1] * self.cells_per_pixel // self.pixels_per_cell)
+
+    def _pool(self, view, factor):
+        """Pomniejsza widok: piksel jest zapalony, jeśli żyje którakolwiek z factor x factor komórek
+
+        Zamiast reshape + max (wolne na dużych tablicach) łączymy co factor-ty wiersz,
+        a potem co factor-tą kolumnę operacją OR do buforów alokowanych raz.
+        """
+        rows, cols = view.shape[0] // factor, view.shape[1] // factor
+        view = view[:rows * factor, :cols * factor]
+
+        if self._rows is None or self._rows.shape != (rows, cols * factor):
+            self._rows = np.empty((rows, cols * factor), dtype=np.uint8)
+            self._pooled = np.empty((rows, cols), dtype=np.uint8)
+
+        np.copyto(self._rows, view[0::factor])
+        for i in range(1, factor):
+            np.bitwise_or(self._rows, view[i::factor], out=self._rows)
+        np.copyto(self._pooled, self._rows[:, 0::factor])
+        for i in range(1, factor):
+            np.bitwise_or(self._pooled, self._rows[:, i::factor], out=self._pooled)
+        return self._pooled
+
+    def draw_grid(self, grid):
+        """Rysuje widoczną część planszy jednym obrazem
+        Args:
+            grid (Grid): Siatka do narysowania
+        Returns:
+            list: Prostokąty ekranu, które się zmieniły (cały ekran)
+        """
+        screen_w, screen_h = self.screen.get_size()
+        cpp, ppc = self.cells_per_pixel, self.pixels_per_cell
+
+        # Fragment planszy mieszczący się na ekranie - silnik przygotowuje tylko jego
+        # (np. memmap wczytuje z pliku tylko widoczne wiersze)
+        view = grid.window(self.view_x, self.view_y, self.view_x + screen_w * cpp // ppc,
+                           self.view_y + screen_h * cpp // ppc)
+        if cpp > 1:
+            view = self._pool(view, cpp)
+        elif not view.flags.c_contiguous:
+            # Kopia tylko wtedy, gdy widać wycinek planszy (frombuffer wymaga ciągłej pamięci)
+            view = np.ascontiguousarray(view)
+
+        self.screen.fill(BLACK)
+        if view.size == 0:
+            return [self.screen.get_rect()]
+
+        # Obraz 8-bitowy współdzielący pamięć z tablicą - bez kopiowania pikseli
+        height, width = view.shape
+        image = pygame.image.frombuffer(view, (width, height), "P")
+        image.set_palette(self.palette)
+
+        if ppc > 1:
+            size = (width * ppc, height * ppc)
+            if self._scaled is None or self._scaled.get_size() != size:
+                self._scaled = pygame.Surface(size, 0, 8)
+            self._scaled.set_palette(self.palette)
+            image = pygame.transform.scale(image, size, self._scaled)
+
+        self.screen.blit(image, (0, 0))
+        return [self.screen.get_rect()]
 
 
 # GŁÓWNA KLASA GRY - zarządza całą aplikacją
 class GameOfLife:
-    def __init__(self):
-        """Konstruktor głównej klasy gry"""
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, engine="numpy", bulk=None,
+                 threaded=False, speed=10, pattern=None, stop_on_cycle=False, rule=None, boundary=None,
+                 metrics=False, metrics_out=None, record_out=None, replay=None, seek=None, detect_cycles=False):
+        """Konstruktor głównej klasy gry
+        Args:
+            grid_width, grid_height (int): Rozmiar planszy w komórkach
+            engine (str): Nazwa silnika obliczeń (patrz ENGINES)
+            bulk (bool): Czy rysować planszę jednym obrazem (SurfarrayRenderer);
+                None - automatycznie, gdy plansza nie mieści się w oknie przy CELL_SIZE
+            threaded (bool): Czy liczyć generacje w osobnym wątku (rysowanie ze stałym RENDER_FPS)
+            speed (float): Prędkość symulacji w generacjach na sekundę (0 - bez ograniczenia)
+            pattern (str): Plik wzorca wczytywany na start zamiast losowej planszy
+            stop_on_cycle (bool): Czy wstrzymać symulację, gdy plansza wejdzie w cykl
+            rule (str): Reguła automatu (None - reguła z pliku wzorca albo B3/S23)
+            boundary (str): Tryb brzegu planszy: dead, torus albo infinite (None - domyślny dla silnika)
+            metrics (bool): Czy zbierać metryki generacji i rysować wykres populacji
+            metrics_out (str): Plik (.csv lub .jsonl), do którego przy wyjściu trafią metryki generacji (włącza metrics)
+            record_out (str): Plik, do którego przy wyjściu trafi nagranie sesji (patrz Session)
+            replay (str): Plik nagranej sesji - gra zaczyna od planszy z nagrania (rozmiar, silnik i reguła z pliku)
+            seek (int): Chwila nagrania, od której zacząć (liczba generacji od początku; None - koniec nagrania)
+            detect_cycles (bool): Czy wykrywać cykle i pokazywać je na ekranie (włącza je też stop_on_cycle)
+        """
         # Inicjalizacja Pygame
         pygame.init()
         
@@ -272,17 +784,83 @@ class GameOfLife:
         self.clock = pygame.time.Clock()
         
         # Komponenty gry
-        self.grid = Grid(GRID_WIDTH, GRID_HEIGHT)
-        self.renderer = Renderer(self.screen, CELL_SIZE)
+        self.engine = engine
+        self.boundary = boundary
+        self.metrics = metrics or bool(metrics_out)
+        self.detect_cycles = detect_cycles or stop_on_cycle
+        self.metrics_out = metrics_out
+        self.record_out = record_out
+        if replay:
+            session = Session.load(replay)
+            self.grid = Grid.from_session(session, seek, detect_cycles=self.detect_cycles, metrics=self.metrics)
+            self.engine, self.boundary = session.engine, session.boundary
+            grid_width, grid_height = session.width, session.height
+        else:
+            self.grid = Grid(grid_width, grid_height, engine, detect_cycles=self.detect_cycles,
+                             metrics=self.metrics, record=bool(record_out), rule=rule, boundary=boundary)
+        if bulk is None:
+            bulk = grid_width * CELL_SIZE > WINDOW_WIDTH or grid_height * CELL_SIZE > WINDOW_HEIGHT
+        if bulk:
+            self.renderer = SurfarrayRenderer(self.screen)
+            self.renderer.fit(self.grid)
+        else:
+            self.renderer = Renderer(self.screen, CELL_SIZE)
         
         # Stan gry
         self.running = True    # Czy aplikacja działa
         self.paused = True     # Czy symulacja jest wstrzymana
-        self.speed = 10        # Prędkość symulacji (generacji na sekundę)
+        self.speed = speed     # Prędkość symulacji (generacji na sekundę)
+        self.stop_on_cycle = stop_on_cycle
+        self.reported_cycle = None  # Ostatnio zgłoszony cykl (żeby wypisać go tylko raz)
         
-        # Losowy stan początkowy
-        self.grid.randomize(0.25)
+        # Stan początkowy - nagranie, wzorzec z pliku albo losowa plansza
+        if pattern and not replay:
+            info = load_pattern(self.grid, pattern)
+            if rule is None and info["rule"]:
+                self.use_pattern_rule(info["rule"], pattern)
+        elif not replay:
+            self.grid.randomize(0.25)
+
+        # W trybie z wątkiem siatką zarządza wyłącznie wątek symulacji
+        self.worker = SimulationWorker(self.grid, speed, history=SPARKLINE_RECT[2]) if threaded else None
+        self.frame = None  # Ramka z wątku symulacji rysowana w tej klatce (odczytana w update)
+
+    def use_pattern_rule(self, text, pattern):
+        """Przełącza siatkę na regułę zapisaną w pliku wzorca (jeśli różni się od obecnej)
+        Args:
+            text (str): Reguła z nagłówka pliku
+            pattern (str): Plik wzorca do ponownego wczytania
+        """
+        try:
+            rule = parse_rule(text)
+            if rule == self.grid.rule:
+                return
+            grid = Grid(self.grid.width, self.grid.height, self.engine, detect_cycles=self.detect_cycles,
+                        metrics=self.metrics, record=self.grid.session is not None, rule=rule, boundary=self.boundary)
+        except RuleError as e:
+            print(f"Pomijam regułę z pliku wzorca: {e}")
+            return
+        self.grid.close()
+        self.grid = grid
+        load_pattern(self.grid, pattern)
+
+    def grid_call(self, function, *args):
+        """Wywołuje metodę siatki - bezpośrednio albo przez kolejkę wątku symulacji
+        Args:
+            function: Metoda siatki (np. self.grid.toggle_cell)
+            *args: Jej argumenty
+        """
+        if self.worker is not None:
+            self.worker.submit(function, *args)
+        else:
+            function(*args)
     
+    def save_snapshot(self):
+        """Zapisuje aktualną generację do pliku snapshot_<generacja>.rle"""
+        path = f"snapshot_{self.grid.generation}.rle"
+        save_pattern(self.grid, path)
+        print(f"Zapisano {path}")
+
     def handle_events(self):
         """Obsługuje zdarzenia (klawisze, mysz, zamknięcie okna)"""
         for event in pygame.event.get():
@@ -297,43 +875,94 @@ class GameOfLife:
                 
                 elif event.key == pygame.K_r:
                     # R - losowy stan
-                    self.grid.randomize()
+                    self.grid_call(self.grid.randomize)
                     self.paused = True
                 
                 elif event.key == pygame.K_c:
                     # C - wyczyść siatkę
-                    self.grid.clear()
+                    self.grid_call(self.grid.clear)
                     self.paused = True
                 
+                elif event.key == pygame.K_s:
+                    # S - zapisz migawkę planszy do pliku RLE
+                    self.grid_call(self.save_snapshot)
+
                 elif event.key == pygame.K_ESCAPE:
                     # Escape - wyjście
                     self.running = False
+
+                elif isinstance(self.renderer, SurfarrayRenderer):
+                    # Powiększanie i przesuwanie widoku w trybie hurtowym
+                    if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                        self.renderer.zoom_in()
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.renderer.zoom_out()
+                    elif event.key == pygame.K_f:
+                        self.renderer.fit(self.grid)
+                    elif event.key == pygame.K_LEFT:
+                        self.renderer.pan(-0.25, 0)
+                    elif event.key == pygame.K_RIGHT:
+                        self.renderer.pan(0.25, 0)
+                    elif event.key == pygame.K_UP:
+                        self.renderer.pan(0, -0.25)
+                    elif event.key == pygame.K_DOWN:
+                        self.renderer.pan(0, 0.25)
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Lewy przycisk myszy
                     # Przełącz komórkę pod kursorem
-                    mouse_x, mouse_y = event.pos
-                    grid_x = mouse_x // CELL_SIZE
-                    grid_y = mouse_y // CELL_SIZE
-                    
-                    self.grid.toggle_cell(grid_x, grid_y)
+                    grid_x, grid_y = self.renderer.screen_to_cell(event.pos)
+                    self.grid_call(self.grid.toggle_cell, grid_x, grid_y)
     
     def update(self):
         """Aktualizuje stan gry"""
-        # Aktualizuj siatkę tylko jeśli gra nie jest wstrzymana
-        if not self.paused:
-            self.grid.update()
+        # W trybie z wątkiem generacje liczy wątek - przekaż mu tylko pauzę i weź ostatnią kompletną
+        # generację (cykl i metryki pochodzą z tej samej ramki, którą narysuje render)
+        if self.worker is not None:
+            self.worker.paused = self.paused
+            self.frame = self.worker.frames.latest()
+            cycle = self.frame.cycle
+        else:
+            # Aktualizuj siatkę tylko jeśli gra nie jest wstrzymana
+            if not self.paused:
+                self.grid.update()
+            cycle = self.grid.cycle
+
+        # Plansza w cyklu nie zmieni się już w nic nowego - zgłoś to i ewentualnie wstrzymaj
+        if cycle is not None and cycle is not self.reported_cycle:
+            self.reported_cycle = cycle
+            print(f"Wykryto cykl: {cycle}")
+            if self.stop_on_cycle:
+                self.paused = True
     
     def render(self):
         """Rysuje całą scenę"""
+        # W trybie z wątkiem rysujemy ostatnią kompletną generację z bufora (razem z jej cyklem i metrykami)
+        if self.worker is not None:
+            grid = self.frame
+            cycle, population = grid.cycle, grid.population
+        else:
+            grid = self.grid
+            cycle, population = grid.cycle, None
+            if grid.metrics is not None:
+                population = grid.metrics.series("population", last=SPARKLINE_RECT[2])
+
         # Narysuj siatkę
-        self.renderer.draw_grid(self.grid)
+        dirty = self.renderer.draw_grid(grid)
         
         # Narysuj interfejs użytkownika
-        self.renderer.draw_ui(self.grid, self.paused)
+        dirty += self.renderer.draw_ui(grid, self.paused, cycle, population)
+
+        # Tempo symulacji i rysowania mierzone osobno
+        if self.worker is not None:
+            dirty += self.renderer.draw_stats([f"FPS: {self.clock.get_fps():.0f}",
+                                               f"Gen/s: {self.worker.generations_per_second:.1f}"])
         
-        # Odśwież ekran
-        pygame.display.flip()
+        # Odśwież ekran - w trybie przyrostowym tylko zmienione prostokąty
+        if self.renderer.incremental:
+            pygame.display.update(dirty)
+        else:
+            pygame.display.flip()
     
     def run(self):
         """Główna pętla gry"""
@@ -342,10 +971,14 @@ class GameOfLife:
         print("SPACE - Play/Pause")
         print("R - Randomize")
         print("C - Clear")
+        print("S - Save snapshot (RLE)")
         print("Mouse Click - Toggle cell")
         print("ESC - Exit")
         print("=============================")
         
+        if self.worker is not None:
+            self.worker.start()
+
         # Główna pętla
         while self.running:
             # Obsługa zdarzeń
@@ -357,21 +990,248 @@ class GameOfLife:
             # Renderowanie
             self.render()
             
-            # Kontrola prędkości (FPS)
-            self.clock.tick(self.speed)
+            # Kontrola prędkości (FPS) - z wątkiem rysujemy ze stałą częstotliwością
+            self.clock.tick(RENDER_FPS if self.worker is not None else self.speed)
+
+        if self.worker is not None:
+            self.worker.stop()
+        if self.metrics_out:
+            self.grid.metrics.save(self.metrics_out)
+            print(f"Zapisano metryki {len(self.grid.metrics)} generacji do {self.metrics_out}")
+        if self.record_out:
+            self.grid.session.save(self.record_out)
+            print(f"Zapisano nagranie sesji ({self.grid.session.tick} generacji) do {self.record_out}")
+        self.grid.close()
         
         # Zamknięcie Pygame
         pygame.quit()
         sys.exit()
 
 
+# === TRYB BEZ OKNA (BENCHMARK) ===
+def run_benchmark(size, gens, seed=0, density=0.3, engine="numpy", check_size=64, check_gens=100, rule=None,
+                  boundary=None, metrics=False, metrics_out=None, engine_options=None, metrics_every=EVERY):
+    """Przelicza planszę bez renderowania i mierzy wydajność silnika
+
+    Plansza size x size jest losowana z ustalonym seedem i przeliczana gens razy (silnik wznawiający
+    przerwane obliczenia, np. memmap z katalogiem punktu kontrolnego, liczy dalej bez losowania).
+    Na koniec wynik jest porównywany z silnikiem referencyjnym:
+    - jeśli size <= check_size, porównywany jest dokładnie stan końcowy benchmarku,
+    - w przeciwnym razie obie implementacje liczą planszę check_size x check_size
+      (ten sam seed, min(gens, check_gens) generacji), bo silnik referencyjny
+      na dużej planszy liczyłby godzinami.
+    Args:
+        size (int): Bok planszy w komórkach
+        gens (int): Liczba generacji do przeliczenia
+        seed (int): Ziarno losowania planszy
+        density (float): Prawdopodobieństwo żywej komórki na starcie
+        engine (str): Nazwa testowanego silnika
+        check_size (int): Bok planszy do sprawdzenia poprawności (0 wyłącza sprawdzanie)
+        check_gens (int): Maksymalna liczba generacji sprawdzenia na planszy zastępczej
+        rule (str): Reguła automatu (domyślnie B3/S23)
+        boundary (str): Tryb brzegu planszy (None - domyślny dla silnika)
+        metrics (bool): Czy zbierać metryki generacji i zmierzyć ich narzut
+        metrics_out (str): Plik (.csv lub .jsonl) na metryki generacji (włącza metrics)
+        engine_options (dict): Dodatkowe argumenty silnika testowanej planszy (np. path i packed dla memmap)
+        metrics_every (int): Co ile generacji zapisywać próbkę metryk (1 - po każdej)
+    Returns:
+        dict: Wyniki (gens_per_sec, cells_per_sec, peak_memory, check, ...)
+    """
+    metrics = metrics or bool(metrics_out)
+    tracemalloc.start()
+    samples = Metrics(max(gens // metrics_every, 1), metrics_every) if metrics else False
+    grid = Grid(size, size, engine, metrics=samples, rule=rule, boundary=boundary, **(engine_options or {}))
+    start_generation = grid.generation
+    if start_generation == 0:
+        grid.randomize(density, seed=seed)
+
+    start = time.perf_counter()
+    for _ in range(gens):
+        grid.update()
+    elapsed = time.perf_counter() - start
+
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = {
+        "engine": engine,
+        "rule": str(grid.rule),
+        "boundary": grid.engine.boundary,
+        "size": size,
+        "gens": gens,
+        "start_generation": start_generation,
+        "seconds": elapsed,
+        "gens_per_sec": gens / elapsed if elapsed > 0 else float("inf"),
+        "cells_per_sec": size * size * gens / elapsed if elapsed > 0 else float("inf"),
+        "peak_memory": peak_memory,
+        "population": grid.engine.population(),
+        "check": None,
+        "metrics": None,
+    }
+
+    if grid.metrics is not None:
+        results["metrics"] = {
+            "step_time": grid.metrics.step_time,
+            "overhead": grid.metrics.overhead,
+            "overhead_ratio": grid.metrics.overhead_ratio,
+            "every": grid.metrics.every,
+            "last": grid.metrics.last,
+        }
+        if metrics_out:
+            grid.metrics.save(metrics_out)
+
+    # Sprawdzenie poprawności względem implementacji referencyjnej (wznowiona plansza nie zaczynała
+    # od wylosowanej w tym uruchomieniu, więc sprawdzana jest wtedy plansza zastępcza)
+    if check_size > 0:
+        if size <= check_size and start_generation == 0:
+            tested = grid
+            check_gens = gens
+        else:
+            check_gens = min(gens, check_gens)
+            tested = Grid(check_size, check_size, engine, rule=rule, boundary=boundary)
+            tested.randomize(density, seed=seed)
+            for _ in range(check_gens):
+                tested.update()
+
+        # Silniki na nieograniczonej płaszczyźnie porównujemy z rzadkim silnikiem bez ramki
+        # (ten sam kod, który w trybie z ramką jest sprawdzany względem referencyjnego)
+        if tested.engine.bounded:
+            reference = Grid(tested.width, tested.height, "reference", rule=rule, boundary=tested.engine.boundary)
+        else:
+            reference = Grid(tested.width, tested.height, "sparse", boundary="infinite", rule=rule)
+        reference.randomize(density, seed=seed)
+        for _ in range(check_gens):
+            reference.update()
+
+        results["check"] = {
+            "ok": bool(np.array_equal(tested.state, reference.state)),
+            "reference": "reference" if tested.engine.bounded else "sparse (boundary=infinite)",
+            "size": tested.width,
+            "gens": check_gens,
+        }
+        if tested is not grid:
+            tested.close()
+
+    grid.close()
+    return results
+
+
+def print_benchmark(results):
+    """Wypisuje wyniki benchmarku w czytelnej postaci
+    Args:
+        results (dict): Wynik funkcji run_benchmark
+    """
+    print(f"=== BENCHMARK: silnik {results['engine']}, reguła {results['rule']}, brzeg {results['boundary']}, "
+          f"plansza {results['size']}x{results['size']}, {results['gens']} generacji ===")
+    if results.get("start_generation"):
+        print(f"Wznowiono od generacji {results['start_generation']}")
+    print(f"Czas:         {results['seconds']:.3f} s")
+    print(f"Generacje/s:  {results['gens_per_sec']:.1f}")
+    print(f"Komórki/s:    {results['cells_per_sec']:.3e}")
+    print(f"Pamięć szczytowa: {results['peak_memory'] / 2**20:.1f} MiB")
+    print(f"Populacja końcowa: {results['population']}")
+
+    metrics = results.get("metrics")
+    if metrics is not None:
+        print(f"Metryki co {metrics['every']} generacji: {metrics['overhead'] * 1000:.1f} ms "
+              f"na {metrics['step_time'] * 1000:.1f} ms kroków (narzut {metrics['overhead_ratio']:.1%})")
+
+    check = results["check"]
+    if check is None:
+        print("Sprawdzenie: pominięte")
+    else:
+        status = "OK" if check["ok"] else "BŁĄD - wynik różni się od implementacji referencyjnej"
+        print(f"Sprawdzenie z {check['reference']} ({check['size']}x{check['size']}, "
+              f"{check['gens']} generacji): {status}")
+
+
+def parse_args(argv=None):
+    """Parsuje argumenty wiersza poleceń
+    Args:
+        argv (list): Lista argumentów (domyślnie sys.argv[1:])
+    Returns:
+        argparse.Namespace: Sparsowane argumenty
+    """
+    parser = argparse.ArgumentParser(description="Conway's Game of Life")
+    parser.add_argument("--width", type=int, default=GRID_WIDTH, help="Szerokość planszy w komórkach")
+    parser.add_argument("--height", type=int, default=GRID_HEIGHT, help="Wysokość planszy w komórkach")
+    parser.add_argument("--engine", default="numpy", choices=sorted(ENGINES), help="Silnik obliczeń")
+    parser.add_argument("--threaded", action="store_true",
+                        help="Licz generacje w osobnym wątku, rysuj ze stałym FPS")
+    parser.add_argument("--speed", type=float, default=10,
+                        help="Generacje na sekundę (0 = bez ograniczenia)")
+    parser.add_argument("--pattern", help="Plik wzorca do wczytania (.rle, .cells, .lif)")
+    parser.add_argument("--rule", type=parse_rule, help="Reguła, np. B36/S23, B2/S/C3, R5,C0,M1,S34..58,B34..45,NM "
+                                       "albo nazwa: highlife, daynight, seeds, briansbrain, bosco")
+    parser.add_argument("--boundary", choices=BOUNDARIES,
+                        help="Brzeg planszy: martwa ramka, torus albo płaszczyzna nieograniczona")
+    parser.add_argument("--cycles", action="store_true",
+                        help="Wykrywaj cykle planszy (martwa natura, oscylator) i pokazuj je na ekranie")
+    parser.add_argument("--stop-on-cycle", action="store_true",
+                        help="Wstrzymaj symulację, gdy plansza wejdzie w cykl (włącza --cycles)")
+    parser.add_argument("--metrics", action="store_true", help="Zbieraj metryki generacji i rysuj wykres populacji")
+    parser.add_argument("--metrics-out", help="Przy wyjściu zapisz metryki generacji do pliku .csv albo .jsonl "
+                                              "(włącza --metrics)")
+    session = parser.add_mutually_exclusive_group()
+    session.add_argument("--record", help="Nagrywaj sesję (ziarno, kliknięcia, losowanie, klatki) i zapisz ją do pliku")
+    session.add_argument("--replay", help="Zacznij od planszy z nagranej sesji")
+    parser.add_argument("--seek", type=int,
+                        help="Chwila nagrania dla --replay (generacje od początku nagrania; domyślnie koniec)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    bench = subparsers.add_parser("bench", help="Przelicz planszę bez okna i zmierz wydajność")
+    bench.add_argument("--size", type=int, default=1024, help="Bok planszy w komórkach")
+    bench.add_argument("--gens", type=int, default=1000, help="Liczba generacji")
+    bench.add_argument("--seed", type=int, default=0, help="Ziarno losowania planszy")
+    bench.add_argument("--density", type=float, default=0.3, help="Gęstość żywych komórek na starcie")
+    bench.add_argument("--engine", default="numpy", choices=sorted(ENGINES), help="Testowany silnik")
+    bench.add_argument("--check-size", type=int, default=64,
+                       help="Bok planszy do sprawdzenia z silnikiem referencyjnym (0 wyłącza)")
+    bench.add_argument("--check-gens", type=int, default=100,
+                       help="Maksymalna liczba generacji sprawdzenia na planszy zastępczej")
+    bench.add_argument("--rule", type=parse_rule, help="Reguła automatu (domyślnie B3/S23)")
+    bench.add_argument("--boundary", choices=BOUNDARIES, help="Brzeg planszy (domyślnie dead)")
+    bench.add_argument("--metrics", action="store_true",
+                       help="Zbieraj metryki generacji i wypisz ich narzut względem czasu kroku")
+    bench.add_argument("--metrics-out", help="Zapisz metryki generacji do pliku .csv albo .jsonl (włącza --metrics)")
+    bench.add_argument("--metrics-every", type=int, default=EVERY,
+                       help=f"Co ile generacji zapisywać próbkę metryk (domyślnie {EVERY}; 1 - po każdej)")
+    bench.add_argument("--memmap-dir", help="Katalog plików planszy silnika memmap (domyślnie tymczasowy)")
+    bench.add_argument("--packed", action="store_true", help="Silnik memmap: 1 bit na komórkę zamiast 1 bajtu")
+
+    return parser.parse_args(argv)
+
+
+def engine_options(args):
+    """Zwraca dodatkowe argumenty silnika z wiersza poleceń (tylko silnik memmap je ma)"""
+    if args.engine != "memmap":
+        return {}
+    return {"path": args.memmap_dir, "packed": args.packed}
+
+
 # === URUCHOMIENIE GRY ===
 # Ten kod uruchamia się tylko gdy plik jest uruchomiony bezpośrednio
-def main():
-    """Główna funkcja - tworzy i uruchamia grę"""
+def main(argv=None):
+    """Główna funkcja - tworzy i uruchamia grę albo benchmark"""
+    args = parse_args(argv)
+
+    if args.command == "bench":
+        results = run_benchmark(args.size, args.gens, args.seed, args.density, args.engine,
+                                args.check_size, args.check_gens, args.rule, args.boundary, args.metrics,
+                                args.metrics_out, engine_options(args), args.metrics_every)
+        print_benchmark(results)
+        # Kod wyjścia 1 gdy wynik nie zgadza się z implementacją referencyjną
+        if results["check"] is not None and not results["check"]["ok"]:
+            sys.exit(1)
+        return
+
     try:
         # Stwórz i uruchom grę
-        game = GameOfLife()
+        game = GameOfLife(args.width, args.height, args.engine,
+                          threaded=args.threaded, speed=args.speed, pattern=args.pattern,
+                          stop_on_cycle=args.stop_on_cycle, rule=args.rule, boundary=args.boundary,
+                          metrics=args.metrics, metrics_out=args.metrics_out, record_out=args.record,
+                          replay=args.replay, seek=args.seek, detect_cycles=args.cycles)
         game.run()
     except Exception as e:
         print(f"Błąd: {e}")
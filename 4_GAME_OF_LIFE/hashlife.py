@@ -0,0 +1,422 @@
+# HASHLIFE
+# Silnik przeskakujący o 2^k generacji naraz dzięki drzewu czwórkowemu z zapamiętanymi wynikami
+# (algorytm Gospera). Identyczne fragmenty planszy są jednym obiektem Node, więc wynik
+# policzony raz dla danego fragmentu jest używany wszędzie, gdzie ten fragment występuje.
+#
+# HashLife liczy na nieograniczonej płaszczyźnie - width x height to tylko okno widoczne
+# w to_array. Wynik jest identyczny z krokowaniem na płaszczyźnie (SparseEngine z boundary="infinite"),
+# a z planszą z martwą ramką tak długo, jak wzorzec nie dotyka jej krawędzi.
+
+# Importowanie niezbędnych bibliotek
+from collections import OrderedDict  # Do pamięci podręcznej LRU
+import numpy as np                    # Do budowy tablicy przejść i konwersji z/do tablic
+
+from engines import Engine
+from rules import CONWAY, RuleError
+
+
+# KLASA WĘZŁA - kwadrat 2^k x 2^k złożony z czterech ćwiartek
+# a | b
+# --+--
+# c | d
+class Node:
+    __slots__ = ("k", "a", "b", "c", "d", "n", "h")  # Węzłów są miliony - bez __dict__
+
+    def __init__(self, k, a, b, c, d, n, h):
+        """Konstruktor węzła (używaj HashLifeEngine.join, a nie bezpośrednio)
+        Args:
+            k (int): Poziom węzła - bok ma 2^k komórek
+            a, b, c, d (Node): Ćwiartki NW, NE, SW, SE (None dla liścia)
+            n (int): Liczba żywych komórek w węźle
+            h (int): Skrót wyliczony ze skrótów ćwiartek
+        """
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+        self.h = h
+
+    def __hash__(self):
+        return self.h
+
+    # Porównanie przez tożsamość (domyślne) - węzły są kanonizowane w join
+
+
+# KLASA PAMIĘCI LRU - słownik o ograniczonym rozmiarze usuwający najdawniej używane wpisy
+class LRUCache:
+    def __init__(self, maxsize):
+        """Konstruktor pamięci podręcznej
+        Args:
+            maxsize (int): Maksymalna liczba wpisów
+        """
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Zwraca wartość dla klucza albo None, odświeżając wpis"""
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Zapisuje wartość, usuwając najstarszy wpis po przekroczeniu rozmiaru"""
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+
+def build_base_table(rule=CONWAY):
+    """Buduje tablicę przejść dla wszystkich 65536 kwadratów 4x4
+
+    Dla każdego kwadratu 4x4 (bit y*4+x) liczy środkowy kwadrat 2x2 po jednej generacji.
+    Args:
+        rule (Rule): Reguła dwustanowa z 8 sąsiadami
+    Returns:
+        np.ndarray: Tablica 65536 kodów 4-bitowych (bit 0 = NW, 1 = NE, 2 = SW, 3 = SE)
+    """
+    codes = np.arange(1 << 16, dtype=np.uint32)
+    cells = ((codes[:, None] >> np.arange(16, dtype=np.uint32)) & 1).reshape(-1, 4, 4)
+
+    result = np.zeros(1 << 16, dtype=np.uint8)
+    for bit, (y, x) in enumerate(((1, 1), (1, 2), (2, 1), (2, 2))):
+        neighbors = cells[:, y - 1:y + 2, x - 1:x + 2].sum(axis=(1, 2)) - cells[:, y, x]
+        alive = rule.table[cells[:, y, x], neighbors]
+        result |= alive << bit
+    return result
+
+
+# SILNIK HASHLIFE
+class HashLifeEngine(Engine):
+    boundaries = ("infinite",)  # Płaszczyzna nieograniczona
+
+    def __init__(self, width, height, max_nodes=1_000_000, max_results=1_000_000, rule=None, boundary=None):
+        """Konstruktor silnika HashLife
+        Args:
+            width, height (int): Rozmiar okna widocznego w to_array
+            max_nodes (int): Maksymalna liczba zapamiętanych węzłów kanonicznych
+            max_results (int): Maksymalna liczba zapamiętanych wyników successor
+            rule (str lub Rule): Reguła dwustanowa z 8 sąsiadami, bez B0
+            boundary (str): Tylko "infinite"
+        """
+        super().__init__(width, height, rule, boundary)
+
+        # Pamięci o ograniczonym rozmiarze. Usunięcie węzła z tablicy kanonicznej nie psuje
+        # poprawności - najwyżej powstanie drugi obiekt o tej samej treści i wynik
+        # zostanie policzony ponownie
+        self.nodes = LRUCache(max_nodes)
+        self.results = LRUCache(max_results)
+
+        # Liście i puste węzły są trzymane osobno - nigdy nie są usuwane
+        self.off = Node(0, None, None, None, None, 0, 0)
+        self.on = Node(0, None, None, None, None, 1, 1)
+        self._zeros = [self.off]
+
+        # Wszystkie 16 węzłów poziomu 1 (kod 4-bitowy: NW, NE, SW, SE)
+        leaves = (self.off, self.on)
+        self._level1 = [self._make(leaves[code & 1], leaves[code >> 1 & 1],
+                                   leaves[code >> 2 & 1], leaves[code >> 3 & 1])
+                        for code in range(16)]
+        self._base = build_base_table(self.rule)
+
+        # Korzeń drzewa i pozycja jego lewego górnego rogu na płaszczyźnie
+        self.root = self.zero(3)
+        self.origin_x = 0
+        self.origin_y = 0
+
+        self._dense = None  # Pamięć podręczna wyniku to_array
+
+    def check_rule(self, rule):
+        # Przypadek bazowy to kwadrat 4x4 z 8 sąsiadami, a pusta płaszczyzna musi zostać pusta
+        if rule.states > 2 or rule.ranged:
+            raise RuleError("Silnik hashlife obsługuje tylko reguły dwustanowe z 8 sąsiadami (B/S)")
+        if rule.births_from_nothing:
+            raise RuleError("Silnik hashlife nie obsługuje reguł z B0")
+
+    # === BUDOWA WĘZŁÓW ===
+
+    def _make(self, a, b, c, d):
+        """Tworzy nowy węzeł z czterech ćwiartek (bez kanonizacji)"""
+        n = a.n + b.n + c.n + d.n
+        h = hash((a.k + 1, a.h, b.h, c.h, d.h))
+        return Node(a.k + 1, a, b, c, d, n, h)
+
+    def join(self, a, b, c, d):
+        """Zwraca kanoniczny węzeł złożony z czterech ćwiartek"""
+        key = (a, b, c, d)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self._make(a, b, c, d)
+            self.nodes.put(key, node)
+        return node
+
+    def zero(self, k):
+        """Zwraca pusty węzeł poziomu k"""
+        while len(self._zeros) <= k:
+            z = self._zeros[-1]
+            self._zeros.append(self._make(z, z, z, z))
+        return self._zeros[k]
+
+    def centre(self, m):
+        """Zwraca środkowy kwadrat węzła (poziom k-1)"""
+        return self.join(m.a.d, m.b.c, m.c.b, m.d.a)
+
+    def pad(self, m):
+        """Zwraca węzeł poziomu k+1 z węzłem m pośrodku"""
+        z = self.zero(m.k - 1)
+        return self.join(self.join(z, z, z, m.a), self.join(z, z, m.b, z),
+                         self.join(z, m.c, z, z), self.join(m.d, z, z, z))
+
+    # === OBLICZENIA ===
+
+    def _life_4x4(self, m):
+        """Przypadek bazowy: środek 2x2 kwadratu 4x4 po jednej generacji"""
+        code = (m.a.a.n | m.a.b.n << 1 | m.b.a.n << 2 | m.b.b.n << 3
+                | m.a.c.n << 4 | m.a.d.n << 5 | m.b.c.n << 6 | m.b.d.n << 7
+                | m.c.a.n << 8 | m.c.b.n << 9 | m.d.a.n << 10 | m.d.b.n << 11
+                | m.c.c.n << 12 | m.c.d.n << 13 | m.d.c.n << 14 | m.d.d.n << 15)
+        return self._level1[self._base[code]]
+
+    def successor(self, m, j):
+        """Zwraca środek węzła m (poziom k-1) po 2^j generacjach
+        Args:
+            m (Node): Węzeł poziomu k >= 2
+            j (int): Wykładnik liczby generacji, j <= k-2
+        Returns:
+            Node: Środkowy kwadrat po 2^j generacjach
+        """
+        if m.n == 0:
+            return m.a
+        if m.k == 2:
+            return self._life_4x4(m)
+
+        key = (m, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+
+        join = self.join
+        step = min(j, m.k - 3)  # Każda z dwóch rund liczy co najwyżej 2^(k-3) generacji
+
+        # 9 nakładających się podkwadratów poziomu k-1, każdy przesunięty o 2^step generacji
+        c1 = self.successor(m.a, step)
+        c2 = self.successor(join(m.a.b, m.b.a, m.a.d, m.b.c), step)
+        c3 = self.successor(m.b, step)
+        c4 = self.successor(join(m.a.c, m.a.d, m.c.a, m.c.b), step)
+        c5 = self.successor(join(m.a.d, m.b.c, m.c.b, m.d.a), step)
+        c6 = self.successor(join(m.b.c, m.b.d, m.d.a, m.d.b), step)
+        c7 = self.successor(m.c, step)
+        c8 = self.successor(join(m.c.b, m.d.a, m.c.d, m.d.c), step)
+        c9 = self.successor(m.d, step)
+
+        if j < m.k - 2:
+            # Wystarczy jedna runda - składamy środki wyników
+            result = join(join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                          join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a))
+        else:
+            # Druga runda o kolejne 2^(k-3) generacji
+            result = join(self.successor(join(c1, c2, c4, c5), step),
+                          self.successor(join(c2, c3, c5, c6), step),
+                          self.successor(join(c4, c5, c7, c8), step),
+                          self.successor(join(c5, c6, c8, c9), step))
+
+        self.results.put(key, result)
+        return result
+
+    def _is_padded(self, m):
+        """Czy cały wzorzec mieści się w środkowym kwadracie o boku 1/4 węzła"""
+        return m.k >= 3 and self.centre(self.centre(m)).n == m.n
+
+    def _pad_root(self):
+        """Powiększa korzeń, zachowując położenie wzorca na płaszczyźnie"""
+        half = 1 << (self.root.k - 1)
+        self.root = self.pad(self.root)
+        self.origin_x -= half
+        self.origin_y -= half
+
+    def _crop_root(self):
+        """Obcina puste obrzeża korzenia"""
+        while self.root.k > 3 and self._is_padded(self.root):
+            quarter = 1 << (self.root.k - 2)
+            self.root = self.centre(self.root)
+            self.origin_x += quarter
+            self.origin_y += quarter
+
+    def advance(self, generations):
+        """Przesuwa planszę o dowolną liczbę generacji
+
+        Liczba generacji jest rozkładana na potęgi dwójki; każda potęga 2^j to jedno
+        wywołanie successor. Przed nim korzeń jest powiększany tak, żeby wzorzec leżał
+        w środkowej ćwiartce, a margines (1/8 boku) był nie mniejszy niż 2^j - wtedy
+        żadna żywa komórka nie wyjdzie poza zwracany środek.
+        Args:
+            generations (int): Liczba generacji (>= 0)
+        """
+        j = 0
+        while generations > 0:
+            if generations & 1:
+                while self.root.k < j + 3 or not self._is_padded(self.root):
+                    self._pad_root()
+                quarter = 1 << (self.root.k - 2)
+                self.root = self.successor(self.root, j)
+                self.origin_x += quarter
+                self.origin_y += quarter
+            generations >>= 1
+            j += 1
+
+        self._crop_root()
+        self._dense = None
+
+    def step(self):
+        self.advance(1)
+
+    # === KONWERSJA Z/DO TABLIC ===
+
+    def _build(self, array, x, y, k):
+        """Buduje węzeł poziomu k z fragmentu tablicy zaczynającego się w (x, y)"""
+        size = 1 << k
+        block = array[y:y + size, x:x + size]
+        if not block.any():
+            return self.zero(k)
+        if k == 1:
+            return self._level1[int(block[0, 0]) | int(block[0, 1]) << 1
+                                | int(block[1, 0]) << 2 | int(block[1, 1]) << 3]
+        half = size >> 1
+        return self.join(self._build(array, x, y, k - 1), self._build(array, x + half, y, k - 1),
+                         self._build(array, x, y + half, k - 1),
+                         self._build(array, x + half, y + half, k - 1))
+
+    def load_array(self, array):
+        array = np.asarray(array, dtype=bool)
+        k = max(3, int(np.ceil(np.log2(max(array.shape)))))
+        padded = np.zeros((1 << k, 1 << k), dtype=np.uint8)
+        padded[:array.shape[0], :array.shape[1]] = array
+
+        self.root = self._build(padded, 0, 0, k)
+        self.origin_x = 0
+        self.origin_y = 0
+        self._dense = None
+
+    def _collect(self, node, x, y, xs, ys):
+        """Dopisuje do list współrzędne żywych komórek węzła leżących w oknie"""
+        size = 1 << node.k
+        if node.n == 0 or x >= self.width or y >= self.height or x + size <= 0 or y + size <= 0:
+            return
+        if node.k == 0:
+            xs.append(x)
+            ys.append(y)
+            return
+        half = size >> 1
+        self._collect(node.a, x, y, xs, ys)
+        self._collect(node.b, x + half, y, xs, ys)
+        self._collect(node.c, x, y + half, xs, ys)
+        self._collect(node.d, x + half, y + half, xs, ys)
+
+    def live_cells(self):
+        """Zwraca tablice współrzędnych (x, y) żywych komórek widocznych w oknie"""
+        xs, ys = [], []
+        self._collect(self.root, self.origin_x, self.origin_y, xs, ys)
+        return np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64)
+
+    def to_array(self):
+        if self._dense is None:
+            dense = np.zeros((self.height, self.width), dtype=np.uint8)
+            x, y = self.live_cells()
+            dense[y, x] = 1
+            self._dense = dense
+        return self._dense
+
+    # === POJEDYNCZE KOMÓRKI ===
+
+    def get(self, x, y):
+        node = self.root
+        x -= self.origin_x
+        y -= self.origin_y
+        size = 1 << node.k
+        if not (0 <= x < size and 0 <= y < size):
+            return 0
+        while node.k > 0 and node.n > 0:
+            size >>= 1
+            node = (node.a, node.b, node.c, node.d)[(x >= size) | (y >= size) << 1]
+            x %= size
+            y %= size
+        return node.n
+
+    def _set(self, node, x, y, alive):
+        """Zwraca kopię węzła ze zmienioną komórką (x, y) względem jego rogu"""
+        if node.k == 0:
+            return self.on if alive else self.off
+        half = 1 << (node.k - 1)
+        quarters = [node.a, node.b, node.c, node.d]
+        index = (x >= half) | (y >= half) << 1
+        quarters[index] = self._set(quarters[index], x % half, y % half, alive)
+        return self.join(*quarters)
+
+    def set(self, x, y, alive):
+        # Powiększ korzeń, aż komórka znajdzie się w jego obszarze
+        while not (0 <= x - self.origin_x < (1 << self.root.k)
+                   and 0 <= y - self.origin_y < (1 << self.root.k)):
+            self._pad_root()
+        self.root = self._set(self.root, x - self.origin_x, y - self.origin_y, alive)
+        self._dense = None
+
+    def _build_points(self, xs, ys, k):
+        """Buduje węzeł poziomu k z listy współrzędnych żywych komórek (względem rogu węzła)"""
+        if len(xs) == 0:
+            return self.zero(k)
+        if k == 1:
+            code = int(np.bitwise_or.reduce(np.left_shift(1, xs + 2 * ys)))
+            return self._level1[code]
+        half = 1 << (k - 1)
+        right = xs >= half
+        bottom = ys >= half
+        quarters = []
+        for mask in (~right & ~bottom, right & ~bottom, ~right & bottom, right & bottom):
+            quarters.append(self._build_points(xs[mask] % half, ys[mask] % half, k - 1))
+        return self.join(*quarters)
+
+    def _union(self, a, b):
+        """Zwraca węzeł, w którym żyją komórki żywe w a lub w b"""
+        if b.n == 0 or a is b:
+            return a
+        if a.n == 0:
+            return b
+        if a.k == 0:
+            return self.on
+        return self.join(self._union(a.a, b.a), self._union(a.b, b.b),
+                         self._union(a.c, b.c), self._union(a.d, b.d))
+
+    def set_cells(self, xs, ys):
+        if len(xs) == 0:
+            return
+        # Powiększ korzeń, aż obejmie wszystkie nowe komórki
+        while not (xs.min() >= self.origin_x and xs.max() < self.origin_x + (1 << self.root.k)
+                   and ys.min() >= self.origin_y and ys.max() < self.origin_y + (1 << self.root.k)):
+            self._pad_root()
+        batch = self._build_points(np.asarray(xs) - self.origin_x, np.asarray(ys) - self.origin_y, self.root.k)
+        self.root = self._union(self.root, batch)
+        self._dense = None
+
+    def clear(self):
+        self.root = self.zero(3)
+        self.origin_x = 0
+        self.origin_y = 0
+        self._dense = None
+
+    def population(self):
+        return self.root.n
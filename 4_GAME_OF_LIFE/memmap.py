@@ -0,0 +1,285 @@
+# SILNIK NA PLIKACH (MEMMAP)
+# Stan planszy leży w dwóch plikach mapowanych w pamięć (numpy.memmap): aktualna generacja w jednym,
+# następna w drugim, a po kroku pliki zamieniają się rolami. Plansza może więc być większa niż pamięć -
+# system wczytuje tylko strony, których właśnie potrzeba. Krok przechodzi przez planszę poziomymi pasami
+# (wiersze pasa i po jednym wierszu ramki nad i pod nim), tak żeby pas z buforami jądra mieścił się
+# w pamięci podręcznej procesora, i zapisuje każdy pas od razu do drugiego pliku.
+#
+# Po każdym kroku w katalogu planszy zapisywany jest punkt kontrolny (checkpoint.json): numer generacji
+# i plik z aktualnym stanem. Krok nigdy nie pisze do pliku aktualnej generacji, więc przerwane obliczenia
+# można wznowić - nowy silnik z tym samym katalogiem otworzy pliki i zacznie od zapisanej generacji.
+
+# Importowanie niezbędnych bibliotek
+import json      # Punkt kontrolny
+import os        # Ścieżki i atomowa podmiana pliku punktu kontrolnego
+import shutil    # Usuwanie katalogu tymczasowego
+import tempfile  # Katalog planszy, jeśli nie podano własnego
+import weakref   # Sprzątanie plików tymczasowych
+import numpy as np
+
+from engines import Engine, RuleKernel, WordKernel, count_alive, find_word_box, popcount, word_changes
+
+BAND_BYTES = 256 * 1024  # Bajty stanu w jednym pasie (pas razem z buforami jądra mieści się w L2)
+CHECKPOINT = "checkpoint.json"
+FILES = ("state0.bin", "state1.bin")
+
+
+def _release(directory, temporary):
+    """Usuwa katalog planszy, jeśli był tymczasowy"""
+    if temporary:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class MemmapEngine(Engine):
+    boundaries = ("dead", "torus")
+
+    def __init__(self, width, height, path=None, packed=False, band=None, sync=False, rule=None, boundary=None):
+        """Konstruktor silnika na plikach
+        Args:
+            width, height (int): Rozmiar planszy
+            path (str): Katalog na pliki planszy i punkt kontrolny (None - katalog tymczasowy usuwany
+                przy close); jeśli zawiera punkt kontrolny tej samej planszy, obliczenia są wznawiane
+            packed (bool): 1 bit na komórkę w słowach uint64 (jak bitpacked) zamiast 1 bajtu
+            band (int): Liczba wierszy pasa (domyślnie tyle, żeby pas miał ok. BAND_BYTES bajtów)
+            sync (bool): Czy przed zapisaniem punktu kontrolnego zapisywać plik stanu na dysk (flush) -
+                wtedy wznowienie działa także po awarii systemu, nie tylko po przerwaniu programu
+            rule (str lub Rule): Reguła automatu (packed - tylko dwustanowe B/S)
+            boundary (str): "dead" albo "torus"
+        """
+        super().__init__(width, height, rule, boundary)
+        self.packed = packed
+        self.sync = sync
+        if packed:
+            self.kernel = WordKernel(self.rule, width)
+            shape, dtype = (height, self.kernel.words), np.dtype("<u8")
+        else:
+            shape, dtype = (height, width), np.dtype(np.uint8)
+        if self.boundary == "torus" and self.rule.radius > min(width, height):
+            raise ValueError("Zasięg reguły większy niż plansza - torus nie ma sensu")
+
+        # Pasy: jądro bitowe tworzy kilkanaście tymczasowych tablic wielkości pasa, więc jego pas jest mniejszy
+        row_bytes = shape[1] * dtype.itemsize
+        band = band or max(1, BAND_BYTES // (row_bytes * (4 if packed else 1)))
+        bounds = list(range(0, height, band)) + [height]
+        self.bands = list(zip(bounds[:-1], bounds[1:]))
+        self._kernels = {}  # Jądra bajtowe dla wysokości pasów (ostatni pas bywa niższy)
+
+        # Katalog planszy i punkt kontrolny
+        self.temporary = path is None
+        self.path = tempfile.mkdtemp(prefix="life-") if path is None else path
+        os.makedirs(self.path, exist_ok=True)
+        self._finalizer = weakref.finalize(self, _release, self.path, self.temporary)
+        self.meta = {"width": width, "height": height, "packed": packed, "rule": str(self.rule),
+                     "boundary": self.boundary}
+        checkpoint = self._read_checkpoint()
+
+        # Oba pliki stanu - nowe (wypełnione zerami) albo z przerwanych obliczeń
+        mode = "r+" if checkpoint is not None else "w+"
+        self._buffers = [np.memmap(os.path.join(self.path, name), dtype=dtype, mode=mode, shape=shape)
+                         for name in FILES]
+        self._current = checkpoint["current"] if checkpoint is not None else 0
+        self.start_generation = checkpoint["generation"] if checkpoint is not None else 0
+        self.generation = self.start_generation  # Generacja zapisywana w punkcie kontrolnym
+
+        # Liczniki ostatniego kroku (gdy counting), populacja do następnego kroku i zmienione komórki (gdy tracking)
+        self._census = None
+        self._population = None
+        self._changes = None
+        if checkpoint is None:
+            self._write_checkpoint()
+
+    @property
+    def state(self):
+        return self._buffers[self._current]
+
+    # === PUNKT KONTROLNY ===
+
+    def _read_checkpoint(self):
+        """Wczytuje punkt kontrolny z katalogu planszy
+        Returns:
+            dict lub None: Punkt kontrolny (None - katalog bez punktu kontrolnego)
+        """
+        path = os.path.join(self.path, CHECKPOINT)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        saved = {key: checkpoint.get(key) for key in self.meta}
+        if saved != self.meta:
+            raise ValueError(f"Katalog {self.path} zawiera inną planszę: {saved}")
+        return checkpoint
+
+    def _write_checkpoint(self):
+        """Zapisuje punkt kontrolny (zapis do pliku tymczasowego i atomowa podmiana)"""
+        if self.sync:
+            self.state.flush()
+        path = os.path.join(self.path, CHECKPOINT)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(dict(self.meta, current=self._current, generation=self.generation), file)
+        os.replace(path + ".tmp", path)
+
+    # === KROK ===
+
+    def _halo(self, state, y0, y1, r):
+        """Zwraca r wierszy nad i pod pasem y0..y1 - martwe poza planszą albo (torus) z przeciwnej strony"""
+        if self.boundary == "torus":
+            return (state.take(np.arange(y0 - r, y0), axis=0, mode="wrap"),
+                    state.take(np.arange(y1, y1 + r), axis=0, mode="wrap"))
+        return state[max(0, y0 - r):y0], state[y1:y1 + r]
+
+    def _step_bytes(self, state, target, y0, y1, changes):
+        """Liczy pas y0..y1 planszy bajtowej; zwraca (population, survivors) pasa, jeśli counting
+        (zmienione komórki pasa dopisuje do listy changes, jeśli tracking)"""
+        kernel = self._kernels.get(y1 - y0)
+        if kernel is None:
+            kernel = self._kernels[y1 - y0] = RuleKernel(self.rule, y1 - y0, self.width)
+        above, below = self._halo(state, y0, y1, kernel.margin)
+        kernel.step(state[y0:y1], target[y0:y1], above, below, wrap=self.boundary == "torus")
+        if self.tracking:
+            changes.append(kernel.changes(target[y0:y1], state[y0:y1], y0))
+        return kernel.tally(target[y0:y1], state[y0:y1]) if self.counting else None
+
+    def _step_words(self, state, target, y0, y1, padded, changes):
+        """Liczy pas y0..y1 planszy bitowej; zwraca (population, survivors) pasa, jeśli counting
+        (zmienione komórki pasa dopisuje do listy changes, jeśli tracking)"""
+        rows = y1 - y0
+        padded = padded[:rows + 2]
+        above, below = self._halo(state, y0, y1, 1)
+        padded[1:-1] = state[y0:y1]
+        padded[0] = above[0] if len(above) else 0
+        padded[-1] = below[0] if len(below) else 0
+        result = self.kernel.step(padded, wrap=self.boundary == "torus")
+        target[y0:y1] = result
+        if self.tracking:
+            changes.append(word_changes(result, padded[1:-1], self.width, y0))
+        if not self.counting:
+            return None
+        return popcount(result), popcount(np.bitwise_and(result, padded[1:-1], out=result))
+
+    def step(self):
+        state = self._buffers[self._current]
+        target = self._buffers[1 - self._current]
+        # Pasy są liczone, póki są w pamięci podręcznej - zmiany każdego pasa są zbierane od razu
+        changes = []
+        if self.packed:
+            padded = np.zeros((self.bands[0][1] + 2, self.kernel.words), dtype="<u8")
+            results = [self._step_words(state, target, y0, y1, padded, changes) for y0, y1 in self.bands]
+        else:
+            results = [self._step_bytes(state, target, y0, y1, changes) for y0, y1 in self.bands]
+        self._changes = tuple(map(np.concatenate, zip(*changes))) if self.tracking else None
+
+        self._census = None
+        if self.counting:
+            # Populacja sprzed kroku jest znana z poprzedniego kroku, chyba że plansza była zmieniana ręcznie
+            population = sum(result[0] for result in results)
+            survivors = sum(result[1] for result in results)
+            before = self._population if self._population is not None else self.population()
+            self._census = (population, population - survivors, before - survivors)
+        self._population = self._census[0] if self._census is not None else None
+
+        # Dopiero gotowa generacja staje się aktualna
+        self._current = 1 - self._current
+        self.generation += 1
+        self._write_checkpoint()
+
+    def census(self):
+        return self._census
+
+    def changes(self):
+        return self._changes
+
+    def _touch(self):
+        """Unieważnia liczniki po ręcznej zmianie planszy"""
+        self._census = None
+        self._population = None
+        self._changes = None
+
+    # === DOSTĘP DO KOMÓREK ===
+
+    def get(self, x, y):
+        if self.packed:
+            return int(self.state[y, x >> 6] >> np.uint64(x & 63)) & 1
+        return int(self.state[y, x])
+
+    def set(self, x, y, alive):
+        if self.packed:
+            bit = np.uint64(1 << (x & 63))
+            if alive:
+                self.state[y, x >> 6] |= bit
+            else:
+                self.state[y, x >> 6] &= ~bit
+        else:
+            self.state[y, x] = 1 if alive else 0
+        self._touch()
+
+    def set_cells(self, xs, ys):
+        if self.packed:
+            xs = np.asarray(xs, dtype=np.uint64)
+            bits = np.left_shift(np.uint64(1), xs & np.uint64(63))
+            np.bitwise_or.at(self.state, (np.asarray(ys), (xs >> np.uint64(6)).astype(np.intp)), bits)
+        else:
+            self.state[ys, xs] = 1
+        self._touch()
+
+    def window(self, x0, y0, x1, y1):
+        # Z plików wczytywane są tylko wiersze i słowa fragmentu
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if not self.packed:
+            return self.state[y0:y1, x0:x1]
+        words = self.state[y0:y1, x0 >> 6:(x1 + 63) >> 6]
+        bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1, bitorder="little")
+        return bits[:, x0 & 63:(x0 & 63) + x1 - x0]
+
+    def to_array(self):
+        # Plansza bajtowa to sam plik (strony wczytywane przy odczycie); bitowa jest rozpakowywana w całości
+        if not self.packed:
+            return self.state
+        return self.window(0, 0, self.width, self.height)
+
+    def _write_rows(self, y, rows):
+        """Zapisuje wiersze od y do pliku aktualnej generacji (packed - po spakowaniu do słów)"""
+        rows = np.asarray(rows) if self.rule.states > 2 else np.asarray(rows, dtype=bool)
+        if self.packed:
+            packed = np.packbits(rows, axis=1, bitorder="little")
+            buffer = np.zeros((len(rows), self.kernel.words * 8), dtype=np.uint8)
+            buffer[:, :packed.shape[1]] = packed
+            rows = buffer.view("<u8")
+        self.state[y:y + len(rows)] = rows
+
+    def load_array(self, array):
+        array = np.asarray(array)
+        self.load_rows(array[y0:y1] for y0, y1 in self.bands)
+
+    def load_rows(self, chunks):
+        # Każda porcja od razu do pliku - bez tablicy wielkości planszy
+        y = 0
+        for rows in chunks:
+            self._write_rows(y, rows)
+            y += len(rows)
+        self.state[y:] = 0
+        self.generation = 0
+        self._touch()
+        self._write_checkpoint()
+
+    def clear(self):
+        self.state.fill(0)
+        self.generation = 0
+        self._touch()
+        self._write_checkpoint()
+
+    def population(self):
+        # Pasami - bez tymczasowej tablicy wielkości planszy
+        count = popcount if self.packed else (lambda rows: count_alive(rows, self.rule))
+        return sum(count(self.state[y0:y1]) for y0, y1 in self.bands)
+
+    def bounding_box(self):
+        return find_word_box(self.state) if self.packed else super().bounding_box()
+
+    def close(self):
+        """Zapisuje pliki na dysk i zamyka je (katalog tymczasowy jest usuwany)"""
+        if self._buffers and not self.temporary:
+            self.state.flush()
+            self._write_checkpoint()
+        self._buffers = []
+        self._finalizer()
@@ -0,0 +1,154 @@
+# METRYKI GENERACJI
+# Po każdej generacji (albo co every generacji) Grid zapisuje jedną próbkę: populację, narodziny, śmierci,
+# prostokąt zajętych komórek i czas kroku. Narodziny i śmierci silnik liczy w samym kroku (Engine.counting)
+# z buforów, które ma pod ręką, a Engine.census tylko je zwraca. Próbki trafiają do bufora cyklicznego
+# o stałej pojemności (tablica strukturalna numpy), skąd można je zapisać do CSV albo JSON lines.
+
+# Importowanie niezbędnych bibliotek
+import csv          # Eksport do CSV
+import json         # Eksport do JSON lines
+import time         # Pomiar narzutu zbierania metryk
+import numpy as np
+
+# Pola jednej próbki (prostokąt: x1, y1 za ostatnią zajętą komórką; pusta plansza - prostokąt 0, 0, 0, 0)
+SAMPLE = np.dtype([
+    ("generation", np.int64),
+    ("population", np.int64),
+    ("births", np.int64),
+    ("deaths", np.int64),
+    ("x0", np.int64),
+    ("y0", np.int64),
+    ("x1", np.int64),
+    ("y1", np.int64),
+    ("step_time", np.float64),
+])
+FIELDS = SAMPLE.names
+
+UNKNOWN = -1  # Narodziny i śmierci, których silnik nie zna (np. po przeskoku o wiele generacji)
+EVERY = 1     # Domyślnie co tyle generacji zapisywana jest próbka (większy odstęp - silnik liczy rzadziej)
+
+
+# KLASA METRYK - bufor cykliczny próbek
+class Metrics:
+    def __init__(self, capacity=4096, every=EVERY):
+        """Konstruktor metryk
+        Args:
+            capacity (int): Liczba pamiętanych próbek - starsze są nadpisywane
+            every (int): Co ile generacji zapisywać próbkę (1 - po każdej generacji)
+        """
+        if capacity < 1:
+            raise ValueError(f"Pojemność bufora metryk musi być dodatnia: {capacity}")
+        if every < 1:
+            raise ValueError(f"Odstęp próbek metryk musi być dodatni: {every}")
+        self.capacity = capacity
+        self.every = every
+        self._samples = np.zeros(capacity, dtype=SAMPLE)
+        self._count = 0          # Liczba zapisanych próbek (także nadpisanych)
+
+        self.step_time = 0.0     # Łączny czas kroków objętych metrykami (s)
+        self.overhead = 0.0      # Łączny czas zbierania metryk (s)
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def record(self, generation, population, births, deaths, box, step_time):
+        """Zapisuje próbkę w buforze (w miejscu najstarszej, jeśli bufor jest pełny)
+        Args:
+            generation (int): Numer generacji
+            population, births, deaths (int): Liczniki generacji (UNKNOWN - nieznane)
+            box (tuple): Prostokąt zajętych komórek (x0, y0, x1, y1) albo None
+            step_time (float): Czas kroku w sekundach
+        """
+        x0, y0, x1, y1 = box if box is not None else (0, 0, 0, 0)
+        self._samples[self._count % self.capacity] = (generation, population, births, deaths,
+                                                      x0, y0, x1, y1, step_time)
+        self._count += 1
+
+    def due(self, generation):
+        """Czy po generacji o tym numerze zapisywana jest próbka (silnik ma wtedy policzyć liczniki)"""
+        return generation % self.every == 0
+
+    def observe(self, grid, step_time, generations=1):
+        """Pobiera liczniki z silnika siatki tuż po kroku i zapisuje próbkę (po pojedynczym kroku tylko
+        dla generacji due - w pozostałych doliczany jest jedynie czas kroku)
+        Args:
+            grid (Grid): Siatka po kroku
+            step_time (float): Zmierzony czas kroku w sekundach
+            generations (int): O ile generacji przesunęła się siatka (więcej niż 1 - narodziny i śmierci nieznane)
+        """
+        if generations == 1 and not self.due(grid.generation):
+            self.step_time += step_time
+            return
+        start = time.perf_counter()
+        engine = grid.engine
+        census = engine.census() if generations == 1 else None
+        if census is None:
+            census = (engine.population(), UNKNOWN, UNKNOWN)
+        self.record(grid.generation, *census, engine.bounding_box(), step_time)
+        self.step_time += step_time
+        self.overhead += time.perf_counter() - start
+
+    @property
+    def overhead_ratio(self):
+        """Czas zbierania metryk jako część czasu kroków (0.05 = 5%)"""
+        return self.overhead / self.step_time if self.step_time > 0 else 0.0
+
+    def samples(self):
+        """Zwraca kopię próbek od najstarszej do najnowszej (tablica strukturalna SAMPLE)"""
+        if self._count <= self.capacity:
+            return self._samples[:self._count].copy()
+        start = self._count % self.capacity
+        return np.concatenate((self._samples[start:], self._samples[:start]))
+
+    def series(self, field, last=None):
+        """Zwraca wartości jednego pola z kolejnych próbek
+        Args:
+            field (str): Nazwa pola (patrz FIELDS)
+            last (int): Liczba najnowszych próbek (None - wszystkie)
+        Returns:
+            np.ndarray: Wartości od najstarszej do najnowszej
+        """
+        count = len(self)
+        if last is not None:
+            count = min(last, count)
+        # Tylko potrzebne próbki (bez kopii całego bufora) - indeksy liczone modulo pojemność
+        indices = np.arange(self._count - count, self._count) % self.capacity
+        return self._samples[field][indices]
+
+    @property
+    def last(self):
+        """Najnowsza próbka jako słownik albo None"""
+        if self._count == 0:
+            return None
+        sample = self._samples[(self._count - 1) % self.capacity]
+        return dict(zip(FIELDS, sample.tolist()))
+
+    def clear(self):
+        """Usuwa wszystkie próbki i zeruje pomiar narzutu"""
+        self._count = 0
+        self.step_time = 0.0
+        self.overhead = 0.0
+
+    # === EKSPORT ===
+
+    def to_csv(self, path):
+        """Zapisuje próbki do pliku CSV (wiersz nagłówka z nazwami pól)"""
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(FIELDS)
+            writer.writerows(self.samples().tolist())
+
+    def to_jsonl(self, path):
+        """Zapisuje próbki do pliku JSON lines (jeden obiekt na wiersz)"""
+        with open(path, "w", encoding="utf-8") as file:
+            for row in self.samples().tolist():
+                file.write(json.dumps(dict(zip(FIELDS, row))) + "\n")
+
+    def save(self, path):
+        """Zapisuje próbki w formacie wybranym po rozszerzeniu pliku (.csv, .jsonl albo .json)"""
+        if path.lower().endswith(".csv"):
+            self.to_csv(path)
+        elif path.lower().endswith((".jsonl", ".json")):
+            self.to_jsonl(path)
+        else:
+            raise ValueError(f"Nieznany format metryk: {path} (dostępne: .csv, .jsonl)")
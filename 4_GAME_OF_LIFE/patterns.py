@@ -0,0 +1,414 @@
+# WZORCE - wczytywanie i zapisywanie plansz w popularnych formatach
+# - RLE (.rle)           - zakodowane długości serii, format Golly/LifeWiki
+# - plaintext (.cells)   - wiersze z '.' (martwa) i 'O' (żywa)
+# - Life 1.06 (.lif)     - jedna para współrzędnych "x y" na wiersz
+#
+# Pliki są czytane strumieniowo i dekodowane operacjami na tablicach numpy (bez obiektów
+# Pythona na komórkę), a co BATCH_SIZE komórek współrzędne są zapisywane prosto do silnika
+# planszy przez Grid.set_cells. Pamięć nie rośnie więc z rozmiarem pliku.
+
+# Importowanie niezbędnych bibliotek
+import itertools  # Do czytania pliku Life 1.06 porcjami wierszy
+import os         # Do rozpoznawania formatu po rozszerzeniu
+import re         # Do parsowania nagłówka RLE
+import numpy as np
+
+# Liczba komórek zbieranych przed zapisem do silnika
+BATCH_SIZE = 1 << 20
+
+# Rozszerzenie pliku -> nazwa formatu
+FORMATS = {
+    ".rle": "rle",
+    ".cells": "plaintext",
+    ".txt": "plaintext",
+    ".lif": "life106",
+    ".life": "life106",
+}
+
+# Nagłówek RLE, np. "x = 36, y = 9, rule = B3/S23"
+_RLE_HEADER = re.compile(r"x\s*=\s*(-?\d+)\s*,\s*y\s*=\s*(-?\d+)(?:\s*,\s*rule\s*=\s*(\S+))?")
+
+
+class PatternError(Exception):  # Niepoprawny plik wzorca
+    pass
+
+
+def detect_format(path):
+    """Rozpoznaje format pliku po rozszerzeniu
+    Args:
+        path (str): Ścieżka do pliku
+    Returns:
+        str: "rle", "plaintext" albo "life106"
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise PatternError(f"Nieznany format wzorca: {extension} (obsługiwane: {', '.join(FORMATS)})")
+    return FORMATS[extension]
+
+
+def _ascii(text, where):
+    """Koduje dane wzorca do bajtów ASCII
+    Args:
+        text (str): Dane wzorca (bez komentarzy)
+        where (str): Opis miejsca do komunikatu błędu
+    Returns:
+        bytes: Dane jako bajty
+    """
+    try:
+        return text.encode("ascii")
+    except UnicodeEncodeError as e:
+        raise PatternError(f"{where}: niedozwolony znak {text[e.start]!r}") from None
+
+
+# KLASA ZBIERACZA KOMÓREK - bufor współrzędnych opróżniany do siatki porcjami
+class CellSink:
+    def __init__(self, grid, offset_x, offset_y):
+        """Konstruktor zbieracza
+        Args:
+            grid (Grid): Siatka, do której trafiają komórki
+            offset_x, offset_y (int): Przesunięcie wzorca na planszy
+        """
+        self.grid = grid
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.parts = []   # Fragmenty (xs, ys) jako tablice numpy
+        self.pending = 0  # Liczba komórek w fragmentach
+        self.count = 0    # Łączna liczba wczytanych komórek
+
+    def add_arrays(self, xs, ys):
+        """Dodaje komórki podane jako tablice numpy"""
+        if len(xs) == 0:
+            return
+        self.parts.append((xs, ys))
+        self.pending += len(xs)
+        if self.pending >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Zapisuje zebrane komórki do siatki i czyści bufor"""
+        if not self.parts:
+            return
+        xs = np.concatenate([part[0] for part in self.parts]).astype(np.int64) + self.offset_x
+        ys = np.concatenate([part[1] for part in self.parts]).astype(np.int64) + self.offset_y
+        self.grid.set_cells(xs, ys)
+        self.count += len(xs)
+        self.parts = []
+        self.pending = 0
+
+
+# === WCZYTYWANIE ===
+
+# KLASA DEKODERA RLE - zamienia porcje tekstu RLE na współrzędne żywych komórek
+# Cała porcja (CHUNK_SIZE znaków) jest dekodowana operacjami na tablicach - pętla w Pythonie
+# przebiega tylko po porcjach, a nie po seriach czy komórkach
+class RLEDecoder:
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.row = 0        # Wiersz, na którym skończyła się poprzednia porcja
+        self.column = 0     # Kolumna, na której skończyła się poprzednia porcja
+        self.carry = b""    # Cyfry z końca porcji należące do znacznika z następnej
+        self.finished = False
+
+    def feed(self, text):
+        """Dekoduje porcję danych RLE (może zaczynać się i kończyć w dowolnym miejscu)"""
+        if self.finished:
+            return
+        # Wszystko po '!' (np. komentarz z polskimi znakami) jest pomijane jeszcze przed kodowaniem
+        text = "".join(text.split())
+        end = text.find("!")
+        if end >= 0:
+            text = text[:end + 1]
+        data = self.carry + _ascii(text, "RLE")
+        codes = np.frombuffer(data, dtype=np.uint8)
+        is_tag = (codes < ord("0")) | (codes > ord("9"))
+        tag_positions = np.nonzero(is_tag)[0]
+
+        # Cyfry za ostatnim znacznikiem przechodzą do następnej porcji
+        last = tag_positions[-1] + 1 if len(tag_positions) else 0
+        self.carry = data[last:]
+        if len(tag_positions) == 0:
+            return
+
+        # Koniec wzorca - ignorujemy wszystko po '!'
+        ends = np.nonzero(codes[tag_positions] == ord("!"))[0]
+        if len(ends):
+            tag_positions = tag_positions[:ends[0]]
+            self.finished = True
+            if len(tag_positions) == 0:
+                return
+        tags = codes[tag_positions]
+
+        # Liczby powtórzeń: każda cyfra należy do najbliższego znacznika po niej
+        digit_positions = np.nonzero(~is_tag[:last])[0]
+        owners = np.searchsorted(tag_positions, digit_positions)
+        inside = owners < len(tag_positions)
+        digit_positions, owners = digit_positions[inside], owners[inside]
+        powers = tag_positions[owners] - digit_positions - 1
+        values = (codes[digit_positions] - ord("0")).astype(np.int64) * 10 ** powers
+        counts = np.bincount(owners, weights=values, minlength=len(tags)).astype(np.int64)
+        has_digits = np.bincount(owners, minlength=len(tags)) > 0
+        counts = np.where(has_digits, counts, 1)
+
+        # Wiersz i kolumna początku każdej serii
+        newline = tags == ord("$")
+        rows = self.row + np.cumsum(counts * newline) - counts * newline
+        advance = np.where(newline, 0, counts)
+        total = np.cumsum(advance)
+        before = total - advance
+        index = np.arange(len(tags))
+        last_newline = np.maximum.accumulate(np.where(newline, index, -1))
+        columns = np.where(last_newline >= 0,
+                           before - total[np.maximum(last_newline, 0)],
+                           self.column + before)
+
+        # Serie żywych komórek ("o" i litery stanów; "b" i "." to martwe)
+        live = ~newline & (tags != ord("b")) & (tags != ord("."))
+        starts, lengths, run_rows = columns[live], counts[live], rows[live]
+        if len(lengths):
+            offsets = np.cumsum(lengths) - lengths
+            steps = np.arange(lengths.sum()) - np.repeat(offsets, lengths)
+            self.sink.add_arrays(np.repeat(starts, lengths) + steps, np.repeat(run_rows, lengths))
+
+        # Stan na koniec porcji
+        self.row = int(rows[-1] + counts[-1] * newline[-1])
+        if last_newline[-1] >= 0:
+            self.column = int(total[-1] - total[last_newline[-1]])
+        else:
+            self.column = int(self.column + total[-1])
+
+
+def _read_rle(file, grid, x, y):
+    """Wczytuje plik RLE
+    Returns:
+        dict: Informacje z nagłówka (width, height, rule, comments)
+    """
+    info = {"width": None, "height": None, "rule": None, "comments": []}
+
+    # Część nagłówkowa: komentarze i linia "x = ..., y = ..."
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            info["comments"].append(line)
+            if line.startswith(("#P", "#R")) and x is None:
+                parts = line[2:].split()
+                x, y = int(parts[0]), int(parts[1])
+            continue
+        header = _RLE_HEADER.match(line)
+        if header is None:
+            raise PatternError(f"Brak nagłówka RLE: {line[:40]}")
+        info["width"], info["height"] = int(header.group(1)), int(header.group(2))
+        info["rule"] = header.group(3)
+        break
+    else:
+        raise PatternError("Plik RLE nie zawiera nagłówka")
+
+    if x is None:
+        # Bez pozycji w pliku - wyśrodkuj wzorzec na planszy
+        x = (grid.width - info["width"]) // 2
+        y = (grid.height - info["height"]) // 2
+
+    # Dane czytane porcjami
+    sink = CellSink(grid, x, y)
+    decoder = RLEDecoder(sink)
+    while not decoder.finished:
+        text = file.read(RLEDecoder.CHUNK_SIZE)
+        if not text:
+            break
+        decoder.feed(text)
+    sink.flush()
+    return info
+
+
+def _read_plaintext(file, grid, x, y):
+    """Wczytuje plik plaintext (.cells)
+    Returns:
+        dict: Informacje o wzorcu (width, height, comments)
+    """
+    info = {"width": 0, "height": 0, "rule": None, "comments": []}
+
+    # Format nie zapisuje rozmiaru - do wyśrodkowania potrzebne jest wstępne przejrzenie pliku
+    if x is None:
+        start = file.tell()
+        width, height = 0, 0
+        for line in file:
+            if not line.startswith("!"):
+                width = max(width, len(line.rstrip("\r\n")))
+                height += 1
+        file.seek(start)
+        x = (grid.width - width) // 2
+        y = (grid.height - height) // 2
+
+    sink = CellSink(grid, x, y)
+    row = 0
+    for line in file:
+        if line.startswith("!"):
+            info["comments"].append(line.rstrip())
+            continue
+        line = line.rstrip("\r\n")
+        # Cały wiersz sprawdzany naraz jako tablica bajtów
+        codes = np.frombuffer(_ascii(line, f"Plaintext, wiersz {row + 1}"), dtype=np.uint8)
+        columns = np.nonzero((codes == ord("O")) | (codes == ord("*")))[0]
+        if len(columns):
+            sink.add_arrays(columns, np.full(len(columns), row))
+        info["width"] = max(info["width"], len(line))
+        row += 1
+
+    info["height"] = row
+    sink.flush()
+    return info
+
+
+def _read_life106(file, grid, x, y):
+    """Wczytuje plik Life 1.06 (współrzędne względem środka planszy)
+    Returns:
+        dict: Informacje o wzorcu (comments)
+    """
+    info = {"width": None, "height": None, "rule": None, "comments": []}
+    if x is None:
+        x, y = grid.width // 2, grid.height // 2
+    sink = CellSink(grid, x, y)
+
+    while True:
+        lines = list(itertools.islice(file, 65536))
+        if not lines:
+            break
+        data = []
+        for line in lines:
+            if line.startswith("#"):
+                info["comments"].append(line.rstrip())
+            else:
+                data.append(line)
+        values = np.array(" ".join(data).split(), dtype=np.int64)
+        if len(values) % 2:
+            raise PatternError("Life 1.06: nieparzysta liczba współrzędnych")
+        pairs = values.reshape(-1, 2)
+        sink.add_arrays(pairs[:, 0], pairs[:, 1])
+
+    sink.flush()
+    return info
+
+
+_READERS = {
+    "rle": _read_rle,
+    "plaintext": _read_plaintext,
+    "life106": _read_life106,
+}
+
+
+def load_pattern(grid, path, x=None, y=None, clear=True):
+    """Wczytuje wzorzec z pliku na planszę
+    Args:
+        grid (Grid): Siatka docelowa
+        path (str): Ścieżka do pliku (.rle, .cells, .lif)
+        x, y (int): Pozycja lewego górnego rogu wzorca (Life 1.06: pozycja punktu 0,0);
+            None - pozycja z pliku (#P w RLE) albo środek planszy
+        clear (bool): Czy wyczyścić planszę przed wczytaniem
+    Returns:
+        dict: Informacje o wzorcu (width, height, rule, comments)
+    """
+    reader = _READERS[detect_format(path)]
+    if clear:
+        grid.clear()
+    # Komentarze mogą mieć znaki spoza ASCII (niepoprawne bajty UTF-8 są zastępowane), same dane - nie
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        return reader(file, grid, x, y)
+
+
+# === ZAPISYWANIE ===
+
+def _bounding_box(state):
+    """Zwraca (x0, y0, x1, y1) prostokąta z żywymi komórkami albo None dla pustej planszy"""
+    rows = np.nonzero(state.any(axis=1))[0]
+    if len(rows) == 0:
+        return None
+    columns = np.nonzero(state.any(axis=0))[0]
+    return columns[0], rows[0], columns[-1] + 1, rows[-1] + 1
+
+
+def _write_rle(file, grid, state, box):
+    """Zapisuje planszę w formacie RLE (linie do 70 znaków)"""
+    x0, y0, x1, y1 = box if box else (0, 0, 0, 0)
+    file.write(f"#C Generation {grid.generation}\n")
+    file.write(f"#P {x0} {y0}\n")
+    file.write(f"x = {x1 - x0}, y = {y1 - y0}, rule = {grid.rule}\n")
+
+    line = []
+    length = 0
+
+    def emit(count, tag):
+        nonlocal length
+        token = (str(count) if count > 1 else "") + tag
+        if length + len(token) > 70:
+            file.write("".join(line) + "\n")
+            line.clear()
+            length = 0
+        line.append(token)
+        length += len(token)
+
+    empty_rows = 0
+    for y in range(y0, y1):
+        row = state[y, x0:x1]
+        if not row.any():
+            empty_rows += 1
+            continue
+        if y > y0:
+            emit(empty_rows + 1, "$")
+        empty_rows = 0
+
+        # Granice serii wyznaczone wektorowo: miejsca, gdzie stan się zmienia
+        padded = np.concatenate(([0], row, [0])).astype(np.int8)
+        edges = np.nonzero(np.diff(padded))[0]
+        column = 0
+        for start, end in zip(edges[0::2], edges[1::2]):
+            if start > column:
+                emit(start - column, "b")
+            emit(end - start, "o")
+            column = end
+    emit(1, "!")
+    file.write("".join(line) + "\n")
+
+
+def _write_plaintext(file, grid, state, box):
+    """Zapisuje planszę w formacie plaintext (.cells)"""
+    file.write(f"!Generation {grid.generation}\n")
+    if box is None:
+        return
+    x0, y0, x1, y1 = box
+    # Tablica znaków budowana wektorowo i zapisywana wierszami
+    chars = np.where(state[y0:y1, x0:x1] > 0, ord("O"), ord(".")).astype(np.uint8)
+    for row in chars:
+        file.write(row.tobytes().decode("ascii").rstrip(".") + "\n")
+
+
+def _write_life106(file, grid, state, box):
+    """Zapisuje planszę w formacie Life 1.06 (współrzędne względem środka planszy)"""
+    file.write("#Life 1.06\n")
+    ys, xs = np.nonzero(state)
+    coordinates = np.column_stack((xs - grid.width // 2, ys - grid.height // 2))
+    np.savetxt(file, coordinates, fmt="%d")
+
+
+_WRITERS = {
+    "rle": _write_rle,
+    "plaintext": _write_plaintext,
+    "life106": _write_life106,
+}
+
+
+def save_pattern(grid, path):
+    """Zapisuje aktualny stan planszy (widoczne okno width x height) do pliku
+    Args:
+        grid (Grid): Siatka do zapisania
+        path (str): Ścieżka do pliku (.rle, .cells, .lif)
+    """
+    writer = _WRITERS[detect_format(path)]
+    state = grid.state
+    if grid.rule.states > 2:
+        # Formaty dwustanowe - zapisujemy tylko żywe komórki, bez umierających
+        state = (state == 1).view(np.uint8)
+    with open(path, "w", encoding="ascii") as file:
+        writer(file, grid, state, _bounding_box(state))
@@ -0,0 +1,222 @@
+# REGUŁY AUTOMATU KOMÓRKOWEGO
+# Reguła jest wczytywana z zapisu tekstowego (rulestring) i kompilowana raz do tablicy przejść
+# table[stan, liczba_sąsiadów] -> następny stan. Silniki stosują tę tablicę na całej planszy naraz,
+# więc dodanie nowej reguły nie wprowadza żadnych rozgałęzień liczonych dla każdej komórki.
+#
+# Obsługiwane zapisy:
+# - B/S (reguły podobne do Life): B3/S23, B36/S23 (HighLife), B3678/S34678 (Day & Night), B2/S (Seeds),
+#   także w starszej kolejności S/B: 23/3
+# - Generations (wiele stanów): B2/S/C3 (Brian's Brain), 345/2/4 (Star Wars, kolejność S/B/C).
+#   Stan 0 - martwa, 1 - żywa, 2..C-1 - umierająca (liczona jako martwa, co generację przechodzi dalej)
+# - Larger than Life (zasięg r): R5,C0,M1,S34..58,B34..45,NM (Bosco's Rule);
+#   M1 - komórka liczy samą siebie, NM - sąsiedztwo Moore'a (kwadrat), NN - von Neumanna (romb)
+
+# Importowanie niezbędnych bibliotek
+import re           # Parsowanie zapisu reguły
+import numpy as np  # Tablica przejść
+
+
+class RuleError(ValueError):  # Niepoprawny zapis reguły albo reguła nieobsługiwana przez silnik
+    pass
+
+
+# Reguły dostępne po nazwie (wielkość liter, spacje i znaki "&'-_" są pomijane)
+NAMED_RULES = {
+    "life": "B3/S23",
+    "conway": "B3/S23",
+    "highlife": "B36/S23",
+    "daynight": "B3678/S34678",
+    "seeds": "B2/S",
+    "briansbrain": "B2/S/C3",
+    "starwars": "B2/S345/C4",
+    "bosco": "R5,C0,M1,S34..58,B34..45,NM",
+}
+
+_BS = re.compile(r"^B([0-8]*)/S([0-8]*)(?:/C?(\d+))?$", re.IGNORECASE)
+_SB = re.compile(r"^S([0-8]*)/B([0-8]*)(?:/C?(\d+))?$", re.IGNORECASE)
+_NUMERIC = re.compile(r"^([0-8]*)/([0-8]*)(?:/(\d+))?$")  # Stary zapis S/B[/C]
+_RANGE = re.compile(r"^(\d+)(?:(?:\.\.|-)(\d+))?$")       # "34..58", "2-3" albo "5"
+
+MAX_RADIUS = 50    # Większy zasięg to tysiące dodawań na generację
+MAX_STATES = 256   # Stan musi się zmieścić w uint8
+
+
+# KLASA REGUŁY
+class Rule:
+    def __init__(self, birth, survive, states=2, radius=1, neighborhood="M", middle=False):
+        """Konstruktor reguły (zwykle tworzonej przez parse_rule)
+        Args:
+            birth (iterable): Liczby żywych sąsiadów, przy których rodzi się komórka
+            survive (iterable): Liczby żywych sąsiadów, przy których komórka przeżywa
+            states (int): Liczba stanów (2 - zwykła reguła, więcej - Generations)
+            radius (int): Zasięg sąsiedztwa (1 - 8 sąsiadów)
+            neighborhood (str): "M" - Moore (kwadrat), "N" - von Neumann (romb)
+            middle (bool): Czy komórka jest liczona jako własny sąsiad
+        """
+        if not 2 <= states <= MAX_STATES:
+            raise RuleError(f"Liczba stanów musi być w zakresie 2..{MAX_STATES}: {states}")
+        if not 1 <= radius <= MAX_RADIUS:
+            raise RuleError(f"Zasięg musi być w zakresie 1..{MAX_RADIUS}: {radius}")
+        if neighborhood not in ("M", "N"):
+            raise RuleError(f"Nieznane sąsiedztwo: {neighborhood} (dostępne: M, N)")
+
+        self.birth = frozenset(birth)
+        self.survive = frozenset(survive)
+        self.states = states
+        self.radius = radius
+        self.neighborhood = neighborhood
+        self.middle = bool(middle)
+
+        # Przesunięcia (dx, dy) liczonych sąsiadów
+        self.offsets = [(dx, dy)
+                        for dy in range(-radius, radius + 1)
+                        for dx in range(-radius, radius + 1)
+                        if (neighborhood == "M" or abs(dx) + abs(dy) <= radius)
+                        and (middle or dx != 0 or dy != 0)]
+        self.max_count = len(self.offsets)
+
+        wrong = [n for n in self.birth | self.survive if not 0 <= n <= self.max_count]
+        if wrong:
+            raise RuleError(f"Liczba sąsiadów poza zakresem 0..{self.max_count}: {sorted(wrong)}")
+
+        self.table = self._compile()
+        self.flat_table = self.table.ravel()  # Indeks: stan * (max_count + 1) + liczba sąsiadów
+
+        # Reguła dwustanowa z zasięgiem 1: wiersze tablicy spakowane w bity (bit n = table[stan, n]),
+        # co pozwala zastąpić odczyt z tablicy przesunięciem bitowym
+        self.masks = None
+        if states == 2 and not self.ranged:
+            self.masks = tuple(np.uint16(sum(int(v) << n for n, v in enumerate(row))) for row in self.table)
+
+    def _compile(self):
+        """Buduje tablicę przejść table[stan, liczba_sąsiadów] -> następny stan"""
+        counts = np.arange(self.max_count + 1)
+        born = np.isin(counts, list(self.birth))
+        kept = np.isin(counts, list(self.survive))
+
+        table = np.zeros((self.states, self.max_count + 1), dtype=np.uint8)
+        table[0] = born
+        # Żywa komórka, która nie przeżywa, umiera (2 stany) albo zaczyna umierać (Generations)
+        table[1] = np.where(kept, 1, 2 % self.states)
+        for state in range(2, self.states):
+            table[state] = (state + 1) % self.states
+        return table
+
+    @property
+    def ranged(self):
+        """Czy sąsiedztwo różni się od zwykłych 8 sąsiadów (Larger than Life)"""
+        return self.radius > 1 or self.neighborhood != "M" or self.middle
+
+    @property
+    def is_conway(self):
+        """Czy to klasyczna reguła B3/S23"""
+        return (self.states == 2 and not self.ranged
+                and self.birth == {3} and self.survive == {2, 3})
+
+    @property
+    def births_from_nothing(self):
+        """Czy martwa komórka bez sąsiadów ożywa (B0) - niemożliwe na nieograniczonej płaszczyźnie"""
+        return bool(self.table[0, 0])
+
+    def __str__(self):
+        """Kanoniczny zapis reguły (ten sam, który przyjmuje parse_rule)"""
+        if not self.ranged:
+            text = "B" + "".join(map(str, sorted(self.birth))) + "/S" + "".join(map(str, sorted(self.survive)))
+            return text + (f"/C{self.states}" if self.states > 2 else "")
+        return (f"R{self.radius},C{self.states if self.states > 2 else 0},M{int(self.middle)},"
+                f"S{_format_ranges(self.survive)},B{_format_ranges(self.birth)},N{self.neighborhood}")
+
+    def __repr__(self):
+        return f"Rule('{self}')"
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+def _format_ranges(values):
+    """Zapisuje zbiór liczb jako przedziały: {2, 3, 4, 7} -> "2..4,7" """
+    values = sorted(values)
+    parts = []
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1] == values[j] + 1:
+            j += 1
+        parts.append(str(values[i]) if i == j else f"{values[i]}..{values[j]}")
+        i = j + 1
+    return ",".join(parts)
+
+
+def _parse_range(text, rule):
+    """Zamienia "34..58" / "2-3" / "5" na zbiór liczb"""
+    match = _RANGE.match(text)
+    if match is None:
+        raise RuleError(f"Niepoprawny przedział w regule {rule}: {text}")
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) else low
+    return set(range(low, high + 1))
+
+
+def _parse_ltl(text):
+    """Parsuje zapis Larger than Life: R5,C0,M1,S34..58,B34..45,NM"""
+    values = {"R": "1", "C": "0", "M": "0", "N": "M"}
+    counts = {"S": set(), "B": set()}
+    current = None  # Ostatnia lista S/B - kolejne przedziały bez litery należą do niej
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key = item[0].upper()
+        if key in counts and (len(item) == 1 or not item[1].isalpha()):
+            current = key
+            if len(item) > 1:
+                counts[key] |= _parse_range(item[1:], text)
+        elif key in values and len(item) > 1:
+            current = None
+            values[key] = item[1:].upper()
+        elif current is not None:
+            counts[current] |= _parse_range(item, text)
+        else:
+            raise RuleError(f"Niepoprawny element reguły {text}: {item}")
+
+    try:
+        radius, states, middle = int(values["R"]), int(values["C"]), int(values["M"])
+    except ValueError:
+        raise RuleError(f"Niepoprawna reguła Larger than Life: {text}")
+    return Rule(counts["B"], counts["S"], max(states, 2), radius, values["N"], middle == 1)
+
+
+def parse_rule(rule):
+    """Zamienia zapis reguły na obiekt Rule
+    Args:
+        rule (str, Rule lub None): Zapis reguły, nazwa z NAMED_RULES, gotowa reguła albo None (B3/S23)
+    Returns:
+        Rule: Skompilowana reguła
+    """
+    if rule is None:
+        return CONWAY
+    if isinstance(rule, Rule):
+        return rule
+
+    text = rule.strip()
+    name = re.sub(r"[\s&'\-_]", "", text).lower()
+    if name in NAMED_RULES:
+        text = NAMED_RULES[name]
+
+    for pattern, birth_first in ((_BS, True), (_SB, False), (_NUMERIC, False)):
+        match = pattern.match(text)
+        if match:
+            first, second, states = match.groups()
+            birth, survive = (first, second) if birth_first else (second, first)
+            return Rule(map(int, birth), map(int, survive), int(states) if states else 2)
+
+    if text[:1].upper() == "R" and "," in text:
+        return _parse_ltl(text)
+    raise RuleError(f"Nieznany zapis reguły: {rule}")
+
+
+# Reguła domyślna - klasyczna gra w życie
+CONWAY = Rule((3,), (2, 3))
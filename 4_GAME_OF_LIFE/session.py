@@ -0,0 +1,179 @@
+# NAGRYWANIE I ODTWARZANIE SESJI
+# Sesja zapisuje ziarno generatora liczb losowych i wszystkie zdarzenia zmieniające planszę (kliknięcia,
+# losowanie, czyszczenie, wzorce, kolejne generacje), więc ten sam przebieg można odtworzyć krok po kroku.
+# Dodatkowo po każdej zmianie zapisywana jest klatka stanu: co keyframe_interval klatek pełny stan
+# (klatka kluczowa), a pomiędzy nimi XOR z poprzednią klatką. Oba rodzaje są spakowane do bitów
+# (reguły dwustanowe) i skompresowane zlib - XOR kolejnych generacji to prawie same zera.
+#
+# Czas sesji (tick) to liczba generacji policzonych od początku nagrania. Nie zależy od Grid.generation,
+# który wraca do zera przy losowaniu i czyszczeniu. Przejście do dowolnego ticku to odtworzenie najbliższej
+# wcześniejszej klatki kluczowej i nałożenie kolejnych różnic (najwyżej keyframe_interval operacji XOR).
+
+# Importowanie niezbędnych bibliotek
+import base64   # Dane binarne klatek w pliku tekstowym
+import bisect   # Wyszukiwanie klatki po ticku (wyszukiwanie binarne)
+import json     # Format pliku sesji (JSON lines)
+import zlib     # Kompresja klatek
+import numpy as np
+
+from rules import parse_rule  # Liczba stanów reguły (czy klatki można spakować do bitów)
+
+FORMAT = "game-of-life-session"  # Znacznik pierwszego wiersza pliku
+VERSION = 1
+KEYFRAME_INTERVAL = 64           # Co ile klatek zapisywany jest pełny stan planszy
+
+
+class SessionError(Exception):  # Niepoprawny plik sesji albo chwila spoza nagrania
+    pass
+
+
+# KLASA SESJI - dziennik zdarzeń i klatki stanu planszy
+class Session:
+    def __init__(self, width, height, engine="numpy", rule=None, boundary="dead", seed=None,
+                 keyframe_interval=KEYFRAME_INTERVAL):
+        """Konstruktor sesji
+        Args:
+            width, height (int): Rozmiar planszy
+            engine (str): Nazwa silnika, na którym nagrano sesję
+            rule (str lub Rule): Reguła automatu (domyślnie B3/S23)
+            boundary (str): Tryb brzegu planszy (tylko plansze skończone: dead, torus)
+            seed (int): Ziarno generatora liczb losowych siatki (None - losowe, zapisywane w sesji)
+            keyframe_interval (int): Co ile klatek zapisywać pełny stan
+        """
+        self.width = width
+        self.height = height
+        self.engine = engine
+        self.rule = str(parse_rule(rule))
+        self.boundary = boundary
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.keyframe_interval = keyframe_interval
+        self.packed = parse_rule(rule).states == 2  # Klatki pakowane do bitów (tylko stany 0 i 1)
+
+        self.tick = 0        # Liczba generacji policzonych od początku nagrania
+        self.events = []     # Zdarzenia: słowniki z polami tick, generation, kind i danymi zdarzenia
+        self.frames = []     # Klatki: (tick, generation, czy kluczowa, skompresowane dane)
+        self.ticks = []      # Tick każdej klatki (rosnąco) - do wyszukiwania binarnego w seek
+        self._previous = None  # Stan z ostatniej klatki (do liczenia różnic)
+
+    # === NAGRYWANIE ===
+
+    def log(self, kind, generation, **data):
+        """Zapisuje zdarzenie zmieniające planszę
+        Args:
+            kind (str): Rodzaj: "set", "cells", "randomize" albo "clear"
+            generation (int): Grid.generation w chwili zdarzenia
+            **data: Dane potrzebne do powtórzenia zdarzenia (np. x, y, value)
+        """
+        self.events.append(dict(tick=self.tick, generation=generation, kind=kind, **data))
+
+    def advance(self, generations):
+        """Zapisuje policzenie kolejnych generacji (kolejne kroki są łączone w jedno zdarzenie)"""
+        last = self.events[-1] if self.events else None
+        if last is not None and last["kind"] == "advance" and last["tick"] + last["n"] == self.tick:
+            last["n"] += generations
+        else:
+            self.events.append(dict(tick=self.tick, kind="advance", n=generations))
+        self.tick += generations
+
+    def capture(self, state, generation):
+        """Zapisuje klatkę stanu planszy - kluczową albo różnicę z poprzednią
+        Args:
+            state (np.ndarray): Stan planszy (height, width)
+            generation (int): Grid.generation
+        """
+        key = self._previous is None or len(self.frames) % self.keyframe_interval == 0
+        if key:
+            self._previous = state.copy()
+            data = self._pack(state)
+        else:
+            data = self._pack(np.bitwise_xor(state, self._previous))
+            np.copyto(self._previous, state)
+        self.frames.append((self.tick, generation, key, zlib.compress(data, 1)))
+        self.ticks.append(self.tick)
+
+    def _pack(self, array):
+        """Zamienia stan (albo różnicę) na bajty - po bicie na komórkę, jeśli reguła jest dwustanowa"""
+        return np.packbits(array, axis=None).tobytes() if self.packed else array.tobytes()
+
+    def _unpack(self, data):
+        """Odwrotność _pack"""
+        raw = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        if self.packed:
+            raw = np.unpackbits(raw, count=self.width * self.height)
+        return raw.reshape(self.height, self.width)
+
+    # === ODTWARZANIE ===
+
+    def seek(self, tick=None):
+        """Odtwarza stan z ostatniej klatki nie późniejszej niż tick
+        Args:
+            tick (int): Chwila sesji (None - koniec nagrania)
+        Returns:
+            tuple: (stan planszy, tick klatki, Grid.generation klatki) - do podanej chwili
+                brakuje tick - tick_klatki generacji, które trzeba policzyć silnikiem
+        """
+        if tick is None:
+            tick = self.tick
+        if not self.frames or tick < self.frames[0][0]:
+            raise SessionError(f"Brak klatki dla chwili {tick}")
+
+        # Ostatnia klatka nie późniejsza niż tick (po zmianach w tej samej chwili - ostatnia z nich),
+        # potem najbliższa wcześniejsza klatka kluczowa (najwyżej keyframe_interval klatek wstecz)
+        index = bisect.bisect_right(self.ticks, tick) - 1
+        start = index
+        while not self.frames[start][2]:
+            start -= 1
+
+        state = self._unpack(self.frames[start][3]).copy()
+        for frame in self.frames[start + 1:index + 1]:
+            np.bitwise_xor(state, self._unpack(frame[3]), out=state)
+        frame_tick, generation = self.frames[index][:2]
+        return state, frame_tick, generation
+
+    # === PLIK SESJI ===
+
+    def save(self, path):
+        """Zapisuje sesję do pliku JSON lines: nagłówek, potem zdarzenia i klatki w kolejności nagrania"""
+        header = {"format": FORMAT, "version": VERSION, "width": self.width, "height": self.height,
+                  "engine": self.engine, "rule": self.rule, "boundary": self.boundary, "seed": self.seed,
+                  "keyframe_interval": self.keyframe_interval, "tick": self.tick}
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(json.dumps(header) + "\n")
+            for event in self.events:
+                file.write(json.dumps({"event": event}) + "\n")
+            for tick, generation, key, data in self.frames:
+                frame = {"tick": tick, "generation": generation, "key": key,
+                         "data": base64.b64encode(data).decode("ascii")}
+                file.write(json.dumps({"frame": frame}) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        """Wczytuje sesję zapisaną przez save
+        Args:
+            path (str): Ścieżka pliku
+        Returns:
+            Session: Wczytana sesja
+        """
+        with open(path, encoding="utf-8") as file:
+            try:
+                header = json.loads(file.readline())
+            except json.JSONDecodeError:
+                raise SessionError(f"{path}: to nie jest plik sesji")
+            if header.get("format") != FORMAT or header.get("version") != VERSION:
+                raise SessionError(f"{path}: nieobsługiwany format sesji")
+
+            session = cls(header["width"], header["height"], header["engine"], header["rule"],
+                          header["boundary"], header["seed"], header["keyframe_interval"])
+            session.tick = header["tick"]
+            for line in file:
+                item = json.loads(line)
+                if "event" in item:
+                    session.events.append(item["event"])
+                else:
+                    frame = item["frame"]
+                    session.frames.append((frame["tick"], frame["generation"], frame["key"],
+                                           base64.b64decode(frame["data"])))
+                    session.ticks.append(frame["tick"])
+        if session.frames:
+            session._previous = session.seek()[0]
+        return session
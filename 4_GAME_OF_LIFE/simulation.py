@@ -0,0 +1,163 @@
+# SYMULACJA W TLE
+# Wątek liczący kolejne generacje niezależnie od pętli rysowania.
+# Operacje NumPy zwalniają GIL, więc krok silnika numpy naprawdę działa równolegle z rysowaniem.
+
+# Importowanie niezbędnych bibliotek
+import queue      # Kolejka poleceń od wątku głównego (kliknięcia, R, C)
+import threading  # Wątek symulacji i blokada buforów
+import time       # Pomiar tempa i odmierzanie generacji
+import numpy as np
+
+
+# KLASA RAMKI - opublikowany stan jednej generacji
+# Ma te same pola co Grid, których używa Renderer (state, generation, width, height, changed_cells),
+# oraz cykl i metryki z tej samej generacji - wątek główny nie czyta ich z siatki liczonej w tle
+class Frame:
+    def __init__(self, width, height):
+        """Konstruktor ramki
+        Args:
+            width, height (int): Rozmiar planszy
+        """
+        self.width = width
+        self.height = height
+        self.generation = 0
+        self.state = np.zeros((height, width), dtype=np.uint8)
+        self.cycle = None       # Wykryty cykl (Cycle) albo None
+        self.sample = None      # Najnowsza próbka metryk (słownik) albo None
+        self.population = None  # Populacje ostatnich generacji (do wykresu) albo None
+
+    def window(self, x0, y0, x1, y1):
+        """Zwraca fragment migawki [y0:y1, x0:x1] - jak Grid.window, więc renderer rysuje ramkę jak siatkę"""
+        return self.state[max(0, y0):y1, max(0, x0):x1]
+
+    def changed_cells(self, previous):
+        """Zwraca współrzędne (xs, ys) komórek zmienionych względem migawki"""
+        ys, xs = np.nonzero(self.state != previous)
+        return xs, ys
+
+
+# KLASA BUFORA RAMEK - potrójne buforowanie między wątkiem symulacji a rysowaniem
+# Pisarz zawsze pisze do swojego bufora, czytelnik czyta ze swojego, a pod blokadą
+# wymieniają się tylko referencjami przez bufor środkowy - nikt nie czeka na kopiowanie
+class FrameBuffer:
+    def __init__(self, width, height, history=0):
+        """Konstruktor bufora ramek
+        Args:
+            width, height (int): Rozmiar planszy
+            history (int): Liczba ostatnich populacji z metryk publikowanych w ramce (0 - bez historii)
+        """
+        self.history = history
+        self._back = Frame(width, height)    # Bufor zapisywany przez symulację
+        self._middle = Frame(width, height)  # Ostatnia kompletna generacja
+        self._front = Frame(width, height)   # Bufor czytany przez renderer
+        self._fresh = False                  # Czy bufor środkowy jest nowszy niż przedni
+        self._lock = threading.Lock()
+
+    def publish(self, grid):
+        """Kopiuje stan siatki do bufora tylnego i udostępnia go jako najnowszy
+        Args:
+            grid (Grid): Siatka po przeliczeniu generacji
+        """
+        back = self._back
+        np.copyto(back.state, grid.state)
+        back.generation = grid.generation
+        back.cycle = grid.cycle
+        metrics = grid.metrics
+        back.sample = metrics.last if metrics is not None else None
+        back.population = metrics.series("population", last=self.history) \
+            if metrics is not None and self.history else None
+        with self._lock:
+            self._back, self._middle = self._middle, back
+            self._fresh = True
+
+    def latest(self):
+        """Zwraca najnowszą kompletną generację (ważna do następnego wywołania latest)
+        Returns:
+            Frame: Ramka do narysowania
+        """
+        with self._lock:
+            if self._fresh:
+                self._front, self._middle = self._middle, self._front
+                self._fresh = False
+        return self._front
+
+
+# KLASA WĄTKU SYMULACJI
+class SimulationWorker(threading.Thread):
+    def __init__(self, grid, speed=0, history=0):
+        """Konstruktor wątku symulacji
+        Args:
+            grid (Grid): Siatka, którą wątek będzie przeliczał (od teraz tylko przez submit)
+            speed (float): Docelowa liczba generacji na sekundę (0 - bez ograniczenia)
+            history (int): Liczba ostatnich populacji publikowanych w ramce (patrz FrameBuffer)
+        """
+        super().__init__(daemon=True)
+        self.grid = grid
+        self.speed = speed
+        self.paused = True
+        self.frames = FrameBuffer(grid.width, grid.height, history)
+        self.generations_per_second = 0.0
+
+        self._commands = queue.Queue()     # Polecenia do wykonania na siatce
+        self._stop_event = threading.Event()
+
+        self.frames.publish(grid)
+
+    def submit(self, function, *args):
+        """Zleca wywołanie function(*args) w wątku symulacji (np. grid.toggle_cell)"""
+        self._commands.put((function, args))
+
+    def stop(self):
+        """Zatrzymuje wątek i czeka na jego zakończenie"""
+        self._stop_event.set()
+        self._commands.put(None)  # Obudź wątek czekający na polecenia
+        self.join()
+
+    def _run_commands(self, block):
+        """Wykonuje oczekujące polecenia
+        Args:
+            block (bool): Czy czekać na pierwsze polecenie (gdy symulacja stoi)
+        Returns:
+            bool: Czy wykonano jakiekolwiek polecenie
+        """
+        done = False
+        while True:
+            try:
+                command = self._commands.get(block=block and not done, timeout=0.1)
+            except queue.Empty:
+                return done
+            if command is None:
+                return done
+            function, args = command
+            function(*args)
+            done = True
+
+    def run(self):
+        counted = 0
+        window_start = time.perf_counter()
+        next_step = window_start
+
+        while not self._stop_event.is_set():
+            if self._run_commands(block=self.paused):
+                self.frames.publish(self.grid)
+            if self.paused:
+                self.generations_per_second = 0.0
+                continue
+
+            self.grid.update()
+            self.frames.publish(self.grid)
+            counted += 1
+
+            # Pomiar tempa symulacji co około sekundę
+            now = time.perf_counter()
+            if now - window_start >= 1.0:
+                self.generations_per_second = counted / (now - window_start)
+                counted = 0
+                window_start = now
+
+            # Ograniczenie tempa, jeśli ustawiono docelową prędkość
+            if self.speed > 0:
+                next_step = max(next_step + 1.0 / self.speed, now)
+                delay = next_step - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
@@ -0,0 +1,193 @@
+# SILNIK KAFELKOWY (WIELOPROCESOWY)
+# Plansza jest dzielona na poziome pasy, a każdy pas jest liczony w osobnym procesie.
+# Oba bufory planszy (aktualny i następny) leżą w pamięci współdzielonej, więc procesy
+# nie przesyłają sobie stanu - każdy czyta swój pas i ramkę (halo) sąsiadów powyżej i poniżej
+# (tyle wierszy, ile wynosi zasięg reguły), a zapisuje tylko swój pas w buforze następnym.
+
+# Importowanie niezbędnych bibliotek
+import os                                           # Liczba rdzeni
+import weakref                                      # Sprzątanie pamięci współdzielonej
+from concurrent.futures import ProcessPoolExecutor  # Pula procesów liczących pasy
+from multiprocessing import shared_memory    # Bufory planszy widoczne dla wszystkich procesów
+import numpy as np
+
+from engines import Engine, RuleKernel, count_alive
+
+
+# === KOD WYKONYWANY W PROCESACH ROBOCZYCH ===
+
+# Stan procesu roboczego ustawiany raz w _init_worker
+_worker = {}
+
+
+def _init_worker(names, width, height, rule, wrap):
+    """Podłącza proces roboczy do obu buforów pamięci współdzielonej
+    Args:
+        names (tuple): Nazwy dwóch bloków pamięci współdzielonej
+        width, height (int): Rozmiar planszy
+        rule (Rule): Reguła automatu
+        wrap (bool): Czy plansza jest torusem
+    """
+    # Procesy robocze korzystają z resource_tracker procesu głównego, więc samo
+    # podłączenie nie powoduje usunięcia bloków przy ich zakończeniu
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker["blocks"] = blocks
+    _worker["buffers"] = [np.ndarray((height, width), dtype=np.uint8, buffer=block.buf) for block in blocks]
+    _worker["rule"] = rule
+    _worker["wrap"] = wrap
+    _worker["kernels"] = {}
+
+
+def _step_strip(source, y0, y1, tally=False):
+    """Liczy następną generację wierszy y0..y1-1 z bufora source do drugiego bufora
+    Args:
+        source (int): Indeks bufora z aktualną generacją (0 lub 1)
+        y0, y1 (int): Zakres wierszy pasa
+        tally (bool): Czy policzyć od razu liczniki pasa (patrz RuleKernel.tally)
+    Returns:
+        tuple lub None: (population, survivors) pasa, jeśli tally
+    """
+    state = _worker["buffers"][source]
+    target = _worker["buffers"][1 - source]
+    height, width = state.shape
+    rows = y1 - y0
+
+    # Bufory jądra alokowane raz dla danego rozmiaru pasa
+    kernel = _worker["kernels"].get(rows)
+    if kernel is None:
+        kernel = RuleKernel(_worker["rule"], rows, width)
+        _worker["kernels"][rows] = kernel
+
+    # Pas z halo: margin wierszy nad i pod pasem - martwe poza krawędziami planszy
+    # albo (torus) wiersze z przeciwnej strony planszy
+    r = kernel.margin
+    if _worker["wrap"]:
+        above = state.take(np.arange(y0 - r, y0), axis=0, mode="wrap")
+        below = state.take(np.arange(y1, y1 + r), axis=0, mode="wrap")
+    else:
+        above, below = state[max(0, y0 - r):y0], state[y1:y1 + r]
+    kernel.step(state[y0:y1], target[y0:y1], above, below, wrap=_worker["wrap"])
+    if tally:
+        return kernel.tally(target[y0:y1], state[y0:y1])
+    return None
+
+
+# === SILNIK ===
+
+def _release(pool, blocks):
+    """Zamyka pulę procesów i usuwa pamięć współdzieloną"""
+    if pool is not None:
+        pool.shutdown(wait=True)
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            pass  # Ktoś nadal trzyma widok tablicy - pamięć zniknie razem z nim
+        block.unlink()
+
+
+class TiledEngine(Engine):
+    boundaries = ("dead", "torus")
+
+    def __init__(self, width, height, workers=None, strips=None, rule=None, boundary=None):
+        """Konstruktor silnika kafelkowego
+        Args:
+            width, height (int): Rozmiar planszy
+            workers (int): Liczba procesów (domyślnie liczba rdzeni)
+            strips (int): Liczba pasów (domyślnie tyle, ile procesów)
+            rule (str lub Rule): Reguła automatu
+            boundary (str): "dead" albo "torus"
+        """
+        super().__init__(width, height, rule, boundary)
+        if self.boundary == "torus" and self.rule.radius > min(width, height):
+            raise ValueError("Zasięg reguły większy niż plansza - torus nie ma sensu")
+        self.workers = workers or os.cpu_count() or 1
+        strips = max(1, min(strips or self.workers, height))
+
+        # Granice pasów - możliwie równe
+        bounds = np.linspace(0, height, strips + 1).astype(int)
+        self.strips = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+        # Dwa bufory planszy w pamięci współdzielonej
+        size = max(1, width * height)
+        self._blocks = [shared_memory.SharedMemory(create=True, size=size) for _ in range(2)]
+        self._buffers = [np.ndarray((height, width), dtype=np.uint8, buffer=block.buf) for block in self._blocks]
+        for buffer in self._buffers:
+            buffer.fill(0)
+        self._current = 0  # Indeks bufora z aktualną generacją
+
+        # Liczniki ostatniego kroku zbierane przez procesy robocze (gdy counting) i populacja do następnego kroku
+        self._census = None
+        self._population = None
+
+        # Pula procesów tworzona przy pierwszym kroku
+        self._pool = None
+        self._finalizer = weakref.finalize(self, _release, None, self._blocks)
+
+    @property
+    def state(self):
+        return self._buffers[self._current]
+
+    def _start_pool(self):
+        """Uruchamia procesy robocze podłączone do pamięci współdzielonej"""
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(tuple(block.name for block in self._blocks), self.width, self.height, self.rule,
+                      self.boundary == "torus"))
+        self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._blocks)
+
+    def step(self):
+        if self._pool is None:
+            self._start_pool()
+
+        # Każdy pas liczony osobno; czekamy na wszystkie przed zamianą buforów
+        futures = [self._pool.submit(_step_strip, self._current, y0, y1, self.counting) for y0, y1 in self.strips]
+        results = [future.result() for future in futures]
+
+        self._census = None
+        if self.counting:
+            # Pasy liczą populację i komórki, które przeżyły, równolegle z krokiem; brakuje tylko populacji
+            # sprzed kroku - jest znana z poprzedniego kroku, chyba że plansza była zmieniana ręcznie
+            population = sum(result[0] for result in results)
+            survivors = sum(result[1] for result in results)
+            before = self._population if self._population is not None else count_alive(self.state, self.rule)
+            self._census = (population, population - survivors, before - survivors)
+        self._population = self._census[0] if self._census is not None else None
+
+        self._current = 1 - self._current
+
+    def census(self):
+        return self._census
+
+    def get(self, x, y):
+        return int(self.state[y, x])
+
+    def set(self, x, y, alive):
+        self.state[y, x] = 1 if alive else 0
+        self._touch()
+
+    def set_cells(self, xs, ys):
+        self.state[ys, xs] = 1
+        self._touch()
+
+    def _touch(self):
+        """Unieważnia liczniki po ręcznej zmianie planszy"""
+        self._census = None
+        self._population = None
+
+    def to_array(self):
+        return self.state
+
+    def load_array(self, array):
+        self.state[...] = np.asarray(array) if self.rule.states > 2 else np.asarray(array, dtype=bool)
+        self._touch()
+
+    def clear(self):
+        self.state.fill(0)
+        self._touch()
+
+    def close(self):
+        """Zatrzymuje procesy robocze i zwalnia pamięć współdzieloną"""
+        self._buffers = []
+        self._finalizer()